@@ -0,0 +1,130 @@
+import cv2
+
+# Níveis de qualidade, do mais caro para o mais barato: (model_complexity, escala da entrada)
+QUALITY_LEVELS = (
+    (2, 1.0),
+    (1, 1.0),
+    (1, 0.75),
+    (0, 0.75),
+    (0, 0.5),
+)
+
+class AdaptivePoseController:
+    """
+    Ajusta em tempo de execução o model_complexity do Mediapipe e a escala da imagem de entrada
+    para manter o tempo de inferência dentro do orçamento definido por target_fps.
+    Observa o tempo de inferência e a visibilidade média dos landmarks de cada frame.
+    """
+
+    def __init__(self, pose_factory, target_fps=24.0, levels=QUALITY_LEVELS, start_complexity=1,
+                 smoothing=0.2, headroom=0.6, min_visibility=0.6, cooldown_frames=30):
+        self.pose_factory = pose_factory
+        self.levels = levels
+        self.budget = 1.0 / target_fps
+        self.smoothing = smoothing
+        self.headroom = headroom
+        self.min_visibility = min_visibility
+        self.cooldown_frames = cooldown_frames
+
+        # Começa no nível de escala cheia com o model_complexity pedido
+        self.level = next((i for i, (complexity, _) in enumerate(levels) if complexity == start_complexity), 0)
+        self._poses = {}
+        self._frames_since_change = 0
+        self.avg_inference_time = None
+        self.avg_visibility = None
+        self.level_changes = 0
+
+    @property
+    def model_complexity(self):
+        return self.levels[self.level][0]
+
+    @property
+    def scale(self):
+        return self.levels[self.level][1]
+
+    @property
+    def pose(self):
+        """
+        Instância de Pose para o model_complexity atual. As instâncias ficam em cache para que
+        oscilações entre níveis não recarreguem o modelo.
+        """
+        complexity = self.model_complexity
+        if complexity not in self._poses:
+            self._poses[complexity] = self.pose_factory(model_complexity=complexity)
+        return self._poses[complexity]
+
+    def prepare(self, frame_rgb):
+        """
+        Reduz a imagem de entrada conforme a escala atual. Como o Mediapipe retorna
+        landmarks normalizados (0-1), a redução não altera as coordenadas usadas na análise.
+        """
+        if self.scale >= 1.0:
+            return frame_rgb
+        return cv2.resize(frame_rgb, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+
+    def process(self, frame_rgb):
+        """
+        Executa a inferência no nível atual, registra o tempo gasto e ajusta o nível se necessário.
+        """
+        start = cv2.getTickCount()
+        result = self.pose.process(self.prepare(frame_rgb))
+        inference_time = (cv2.getTickCount() - start) / cv2.getTickFrequency()
+        self.record(inference_time, result.pose_landmarks)
+        return result
+
+    def record(self, inference_time, landmarks=None):
+        """
+        Atualiza as médias móveis exponenciais e decide se o nível de qualidade deve mudar.
+        """
+        visibility = 0.0
+        if landmarks is not None:
+            points = landmarks.landmark
+            visibility = sum(point.visibility for point in points) / len(points)
+
+        if self.avg_inference_time is None:
+            self.avg_inference_time = inference_time
+            self.avg_visibility = visibility
+        else:
+            self.avg_inference_time += self.smoothing * (inference_time - self.avg_inference_time)
+            self.avg_visibility += self.smoothing * (visibility - self.avg_visibility)
+
+        self._frames_since_change += 1
+        if self._frames_since_change < self.cooldown_frames:
+            return
+
+        if self.avg_inference_time > self.budget and self.level < len(self.levels) - 1:
+            # Acima do orçamento: reduz a qualidade
+            self._set_level(self.level + 1)
+        elif self.level > 0:
+            # Sobra de tempo: aumenta a qualidade, com mais tolerância quando a visibilidade está baixa
+            limit = self.budget * self.headroom
+            if self.avg_visibility < self.min_visibility:
+                limit = self.budget * 0.9
+            if self.avg_inference_time < limit:
+                self._set_level(self.level - 1)
+
+    def _set_level(self, level):
+        self.level = level
+        self.level_changes += 1
+        self._frames_since_change = 0
+        # O custo muda com o nível; reinicia a média para não reagir a medições antigas
+        self.avg_inference_time = None
+
+    def metrics(self):
+        """
+        Retorna as configurações escolhidas e as médias observadas.
+        """
+        return {
+            "model_complexity": self.model_complexity,
+            "input_scale": self.scale,
+            "level": self.level,
+            "level_changes": self.level_changes,
+            "target_fps": 1.0 / self.budget,
+            "avg_inference_ms": (self.avg_inference_time or 0.0) * 1000,
+            "avg_visibility": self.avg_visibility or 0.0,
+        }
+
+    def close(self):
+        for pose in self._poses.values():
+            pose.close()
+        self._poses.clear()
@@ -0,0 +1,56 @@
+"""
+Execução dos analisadores de exercício sobre landmarks já inferidos, sem depender do Mediapipe.
+Compartilhado pela captura (main), pelos modos com várias pessoas e câmeras e pela reanálise de gravações.
+"""
+from registry import get_analyzer
+
+# Visibilidade mínima para um landmark exigido pelo analisador contar como detectado
+MIN_VISIBILITY = 0.5
+
+
+def process_exercise(exercise_type, landmarks, frame_width, frame_height, prev_angles, prev_time, phase,
+                     world_landmarks=None, thresholds=None, now=None, state=None):
+    """
+    Executa a função de análise do exercício e retorna o feedback e dados de análise.
+    world_landmarks só é repassado quando informado (exercícios no modo de cinemática "world"),
+    assim como thresholds (modo de avaliação das regras de fase, para analisadores que o aceitam)
+    now (relógio da sessão, usado na reanálise de gravações) e state (progresso de uma pessoa,
+    no modo com várias pessoas).
+    """
+    analyzer = get_analyzer(exercise_type)
+    if analyzer is not None:
+        options = {}
+        if world_landmarks is not None:
+            options["world_landmarks"] = world_landmarks
+        if thresholds:
+            options["thresholds"] = thresholds
+        if now is not None:
+            options["now"] = now
+        if state is not None:
+            options["state"] = state
+        return analyzer(landmarks, frame_width, frame_height, prev_angles, prev_time, phase, **options)
+    else:
+        # Retorna um dicionário padrão caso o exercício não seja suportado
+        return {
+            "feedback": "Exercise not supported.",
+            "phase": phase,
+            "elbow_angle": 0,
+            "shoulder_angle": 0,
+            "torso_angle": 0,
+            "symmetry": False,
+            "stability": False,
+            "angular_velocity": 0,
+            "time": prev_time,
+            "total_repetitions": 0
+        }
+
+
+def has_required_landmarks(landmarks, required_landmarks, min_visibility=MIN_VISIBILITY):
+    """
+    Verifica se os landmarks exigidos pelo analisador estão visíveis no frame.
+    Quando o analisador não declara landmarks, considera todos necessários.
+    """
+    if required_landmarks is None:
+        return True
+    points = landmarks.landmark
+    return all(points[index].visibility >= min_visibility for index in required_landmarks)
@@ -0,0 +1,342 @@
+"""
+Benchmarks do caminho crítico de análise do ai_model.
+
+Uso (a partir da pasta ai_model):
+    python -m benchmarks.run_benchmarks                        # compara com a baseline da máquina
+    python -m benchmarks.run_benchmarks --save-baseline        # grava/atualiza a baseline
+    python -m benchmarks.run_benchmarks --video exemplo.mp4    # inclui o loop de captura sem janela
+    python -m benchmarks.run_benchmarks --recordings gravacoes/ --threshold 0.15   # *.json e *.fmrec
+
+As baselines ficam em benchmarks/baselines/<nome>.json. O processo termina com código 1
+se alguma medição piorar além do limite (--threshold) em relação à baseline.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import utils
+import kinematics
+import thresholds
+from recording import SessionRecorder, SessionRecording
+from benchmarks.sequences import (
+    synthetic_shoulder_press, load_recorded_sequence, posture_landmarks, world_landmarks,
+    LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_ELBOW, LEFT_WRIST, LEFT_HIP, RIGHT_HIP, NOSE
+)
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+FRAME_WIDTH, FRAME_HEIGHT = 1280, 720
+
+
+def time_per_frame(function, sequence, repeats=7):
+    """
+    Executa `function(timestamp, landmarks)` sobre toda a sequência `repeats` vezes
+    e retorna estatísticas do custo por frame em microssegundos.
+    """
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for timestamp, landmarks in sequence:
+            function(timestamp, landmarks)
+        samples.append((time.perf_counter_ns() - start) / len(sequence) / 1000)
+    return {
+        "us_per_frame": statistics.median(samples),
+        "us_per_frame_min": min(samples),
+        "frames": len(sequence),
+    }
+
+
+def time_batch(function, frames, repeats=7):
+    """
+    Como time_per_frame, para uma `function()` que processa os `frames` da sequência de uma só vez.
+    """
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        function()
+        samples.append((time.perf_counter_ns() - start) / frames / 1000)
+    return {
+        "us_per_frame": statistics.median(samples),
+        "us_per_frame_min": min(samples),
+        "frames": frames,
+    }
+
+
+def helper_benchmarks(sequence):
+    """
+    Mede cada função geométrica de utils.py isoladamente.
+    """
+    def points(landmarks):
+        return landmarks.landmark
+
+    cases = {
+        "calculate_angle": lambda t, lm: utils.calculate_angle(
+            points(lm)[LEFT_SHOULDER], points(lm)[LEFT_ELBOW], points(lm)[LEFT_WRIST], FRAME_WIDTH, FRAME_HEIGHT),
+        "calculate_distance": lambda t, lm: utils.calculate_distance(
+            points(lm)[LEFT_SHOULDER], points(lm)[RIGHT_SHOULDER], FRAME_WIDTH, FRAME_HEIGHT),
+        "check_symmetry": lambda t, lm: utils.check_symmetry(
+            points(lm)[LEFT_SHOULDER], points(lm)[RIGHT_SHOULDER], FRAME_WIDTH, FRAME_HEIGHT),
+        "check_stability": lambda t, lm: utils.check_stability(90),
+        "calculate_angular_velocity": lambda t, lm: utils.calculate_angular_velocity(90, 120, 0.033),
+        "is_within_amplitude": lambda t, lm: utils.is_within_amplitude(120, 90, 180),
+        "calculate_center_of_mass": lambda t, lm: utils.calculate_center_of_mass(
+            points(lm), [LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP], FRAME_WIDTH, FRAME_HEIGHT),
+        "check_head_alignment": lambda t, lm: utils.check_head_alignment(
+            points(lm)[NOSE], points(lm)[LEFT_SHOULDER]),
+        "calculate_inclination": lambda t, lm: utils.calculate_inclination(
+            points(lm)[LEFT_SHOULDER], points(lm)[LEFT_HIP], FRAME_WIDTH, FRAME_HEIGHT),
+    }
+    results = {f"utils.{name}": time_per_frame(function, sequence) for name, function in cases.items()}
+    results.update(kinematics_benchmarks(sequence))
+    results.update(threshold_benchmarks(sequence))
+    results.update(recording_benchmarks(sequence))
+    return results
+
+
+def kinematics_benchmarks(sequence):
+    """
+    Compara o custo dos três ângulos do desenvolvimento de ombro no modo 2D (calculate_angle)
+    e no modo world (landmarks_to_array + joint_angles_3d), incluindo a conversão dos landmarks.
+    """
+    world = [(timestamp, world_landmarks(landmarks)) for timestamp, landmarks in sequence]
+    indices = (LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST, LEFT_HIP, RIGHT_HIP)
+    joints = ((0, 1, 2), (3, 0, 1), (3, 0, 4))
+
+    def angles_2d(timestamp, landmarks):
+        points = landmarks.landmark
+        utils.calculate_angle(points[LEFT_SHOULDER], points[LEFT_ELBOW], points[LEFT_WRIST], FRAME_WIDTH, FRAME_HEIGHT)
+        utils.calculate_angle(points[LEFT_HIP], points[LEFT_SHOULDER], points[LEFT_ELBOW], FRAME_WIDTH, FRAME_HEIGHT)
+        utils.calculate_angle(points[LEFT_HIP], points[LEFT_SHOULDER], points[RIGHT_HIP], FRAME_WIDTH, FRAME_HEIGHT)
+
+    def angles_world(timestamp, landmarks):
+        kinematics.joint_angles_3d(kinematics.landmarks_to_array(landmarks, indices), joints)
+
+    # Modo world sobre a sequência inteira: uma chamada vetorizada para todos os frames
+    batch = np.stack([kinematics.landmarks_to_array(landmarks, indices) for _, landmarks in world])
+
+    def angles_world_batch():
+        kinematics.joint_angles_3d(batch, joints)
+
+    return {
+        "kinematics.angles_2d": time_per_frame(angles_2d, sequence),
+        "kinematics.angles_world": time_per_frame(angles_world, world),
+        "kinematics.angles_world_batch": time_batch(angles_world_batch, len(world)),
+    }
+
+
+def threshold_benchmarks(sequence):
+    """
+    Compara a decisão das regras de fase do desenvolvimento de ombro com ângulos exatos e com os
+    limites pré-compilados em cossenos, frame a frame e com todos os frames avaliados em uma chamada
+    (equivalente a um frame de cada uma de várias sessões simultâneas).
+    """
+    indices = (LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST, LEFT_HIP, RIGHT_HIP)
+    rules = thresholds.compile_rules({
+        "elbow_flexed": thresholds.AngleRule((0, 1, 2), 0, 100),
+        "elbow_extended": thresholds.AngleRule((0, 1, 2), 160, 180),
+        "shoulder_aligned": thresholds.AngleRule((3, 0, 1), 85, 95),
+        "torso_stable": thresholds.AngleRule((3, 0, 4), 85, 95),
+    })
+
+    def rules_angles(timestamp, landmarks):
+        points = landmarks.landmark
+        elbow = utils.calculate_angle(points[LEFT_SHOULDER], points[LEFT_ELBOW], points[LEFT_WRIST], FRAME_WIDTH, FRAME_HEIGHT)
+        shoulder = utils.calculate_angle(points[LEFT_HIP], points[LEFT_SHOULDER], points[LEFT_ELBOW], FRAME_WIDTH, FRAME_HEIGHT)
+        torso = utils.calculate_angle(points[LEFT_HIP], points[LEFT_SHOULDER], points[RIGHT_HIP], FRAME_WIDTH, FRAME_HEIGHT)
+        return elbow < 100, 160 <= elbow <= 180, 85 <= shoulder <= 95, 85 <= torso <= 95
+
+    def rules_cosine(timestamp, landmarks):
+        thresholds.evaluate_rules_frame(thresholds.landmark_pixels(landmarks, indices, FRAME_WIDTH, FRAME_HEIGHT), rules)
+
+    batch = np.array([
+        thresholds.landmark_pixels(landmarks, indices, FRAME_WIDTH, FRAME_HEIGHT) for _, landmarks in sequence
+    ])
+
+    def rules_cosine_batch():
+        thresholds.evaluate_rules(batch, rules)
+
+    return {
+        "thresholds.rules_angles": time_per_frame(rules_angles, sequence),
+        "thresholds.rules_cosine": time_per_frame(rules_cosine, sequence),
+        "thresholds.rules_cosine_batch": time_batch(rules_cosine_batch, len(sequence)),
+    }
+
+
+def recording_benchmarks(sequence):
+    """
+    Mede a gravação (.fmrec) da sequência, a reconstrução dos landmarks frame a frame para os
+    analisadores e a varredura vetorizada das colunas, que lê direto das views np.memmap.
+    """
+    result = {"phase": "benchmark", "feedback": "", "elbow_angle": 90.0, "total_repetitions": 0}
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sequence.fmrec")
+
+        def write():
+            with SessionRecorder(path, chunk_frames=256) as recorder:
+                for timestamp, landmarks in sequence:
+                    recorder.append(timestamp, landmarks, result)
+
+        write_stats = time_batch(write, len(sequence))
+        recording = SessionRecording(path)
+
+        def replay():
+            for _ in recording.iter_frames():
+                pass
+
+        def scan():
+            for chunk in recording.chunks:
+                chunk.landmarks[:, :, :2].mean(axis=0)
+
+        return {
+            "recording.write": write_stats,
+            "recording.replay": time_batch(replay, len(recording)),
+            "recording.scan": time_batch(scan, len(recording)),
+        }
+
+
+def analyzer_benchmarks(sequence, label):
+    """
+    Mede analyze_posture e analyze_shoulder_press sobre a sequência.
+    """
+    results = {}
+    named = [(timestamp, posture_landmarks(landmarks)) for timestamp, landmarks in sequence]
+    results[f"{label}.analyze_posture"] = time_per_frame(
+        lambda t, lm: utils.analyze_posture(lm, FRAME_WIDTH, FRAME_HEIGHT, {}, t), named)
+
+    try:
+        from exercises import shoulder_press
+    except ImportError as e:
+        print(f"analyze_shoulder_press ignorado: {e}")
+        return results
+
+    state = {"phase": shoulder_press.INITIAL_POSITION, "angles": {}}
+
+    def run(timestamp, landmarks):
+        result = shoulder_press.analyze_shoulder_press(
+            landmarks, FRAME_WIDTH, FRAME_HEIGHT, state["angles"], timestamp, state["phase"])
+        state["phase"] = result["phase"]
+        state["angles"] = {"elbow_angle": result["elbow_angle"]}
+
+    results[f"{label}.analyze_shoulder_press"] = time_per_frame(run, sequence)
+
+    state = {"phase": shoulder_press.INITIAL_POSITION, "angles": {}}
+
+    def run_cosine(timestamp, landmarks):
+        result = shoulder_press.analyze_shoulder_press(
+            landmarks, FRAME_WIDTH, FRAME_HEIGHT, state["angles"], timestamp, state["phase"],
+            thresholds=thresholds.THRESHOLDS_COSINE)
+        state["phase"] = result["phase"]
+        state["angles"] = {"elbow_angle": result["elbow_angle"]}
+
+    results[f"{label}.analyze_shoulder_press_cosine"] = time_per_frame(run_cosine, sequence)
+
+    world = {id(landmarks): world_landmarks(landmarks) for _, landmarks in sequence}
+    state = {"phase": shoulder_press.INITIAL_POSITION, "angles": {}}
+
+    def run_world(timestamp, landmarks):
+        result = shoulder_press.analyze_shoulder_press(
+            landmarks, FRAME_WIDTH, FRAME_HEIGHT, state["angles"], timestamp, state["phase"],
+            world_landmarks=world[id(landmarks)])
+        state["phase"] = result["phase"]
+        state["angles"] = {"elbow_angle": result["elbow_angle"]}
+
+    results[f"{label}.analyze_shoulder_press_world"] = time_per_frame(run_world, sequence)
+    return results
+
+
+def capture_benchmark(video_path, max_frames):
+    """
+    Mede frames/s do loop de captura completo (leitura, conversão, inferência, análise e desenho)
+    sobre um vídeo, sem janela e sem gravar logs.
+    """
+    from main import initialize_pose, capture_video
+
+    pose = initialize_pose(model_complexity=1)
+    try:
+        stats = capture_video(
+            pose, "shoulder_press", feedback_interval=0.0, source=video_path,
+            display=False, log_results=False, max_frames=max_frames)
+    finally:
+        pose.close()
+    return {"capture_loop.fps": {"fps": stats["fps"], "frames": stats["frames"]}}
+
+
+def compare(results, baseline, threshold):
+    """
+    Compara os resultados com a baseline. Tempo maior ou FPS menor que o limite conta como regressão.
+    Para o custo por frame usa o mínimo das repetições, que é menos sensível a ruído do sistema.
+    """
+    regressions = []
+    for name, metrics in sorted(results.items()):
+        reference = baseline.get(name)
+        if not reference:
+            print(f"  {name:<45} (sem baseline)")
+            continue
+        if "fps" in metrics:
+            change = reference["fps"] / metrics["fps"] - 1 if metrics["fps"] else float("inf")
+            current, previous, unit = metrics["fps"], reference["fps"], "fps"
+        else:
+            change = metrics["us_per_frame_min"] / reference["us_per_frame_min"] - 1
+            current, previous, unit = metrics["us_per_frame_min"], reference["us_per_frame_min"], "us/frame"
+        flag = "REGRESSÃO" if change > threshold else ""
+        print(f"  {name:<45} {current:10.2f} {unit} (baseline {previous:.2f}, {change:+.1%}) {flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do ai_model")
+    parser.add_argument("--name", default=platform.node() or "default", help="nome da baseline (padrão: hostname)")
+    parser.add_argument("--frames", type=int, default=600, help="frames da sequência sintética")
+    parser.add_argument("--recordings", help="pasta com sequências gravadas (*.json ou *.fmrec)")
+    parser.add_argument("--video", help="vídeo de exemplo para o benchmark do loop de captura")
+    parser.add_argument("--max-frames", type=int, default=300, help="limite de frames do vídeo")
+    parser.add_argument("--threshold", type=float, default=0.2, help="piora relativa tolerada (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="grava os resultados como baseline")
+    args = parser.parse_args(argv)
+
+    synthetic = synthetic_shoulder_press(frames=args.frames)
+    results = helper_benchmarks(synthetic)
+    results.update(analyzer_benchmarks(synthetic, "synthetic"))
+
+    if args.recordings:
+        paths = glob.glob(os.path.join(args.recordings, "*.json")) + glob.glob(os.path.join(args.recordings, "*.fmrec"))
+        for path in sorted(paths):
+            label = os.path.splitext(os.path.basename(path))[0]
+            results.update(analyzer_benchmarks(load_recorded_sequence(path), f"recorded.{label}"))
+
+    if args.video:
+        results.update(capture_benchmark(args.video, args.max_frames))
+
+    baseline_path = os.path.join(BASELINE_DIR, f"{args.name}.json")
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline gravada em {baseline_path}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    else:
+        print(f"Nenhuma baseline em {baseline_path}; use --save-baseline para criar.")
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regressão(ões) acima de {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+import json
+import math
+
+from recording import SessionRecording
+
+# Índices do Mediapipe Pose usados pelas sequências sintéticas
+NOSE = 0
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+LEFT_ELBOW, RIGHT_ELBOW = 13, 14
+LEFT_WRIST, RIGHT_WRIST = 15, 16
+LEFT_HIP, RIGHT_HIP = 23, 24
+NUM_LANDMARKS = 33
+
+
+class Point:
+    """
+    Landmark com a mesma interface dos landmarks do Mediapipe (x, y, z, visibility).
+    """
+    __slots__ = ("x", "y", "z", "visibility")
+
+    def __init__(self, x, y, z=0.0, visibility=1.0):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.visibility = visibility
+
+
+class LandmarkList:
+    """
+    Equivalente mínimo de NormalizedLandmarkList: expõe a lista em `.landmark`.
+    """
+    __slots__ = ("landmark",)
+
+    def __init__(self, points):
+        self.landmark = points
+
+
+def synthetic_shoulder_press(frames=600, fps=30.0, repetitions=3, aspect=16 / 9, hold=0.25):
+    """
+    Gera uma sequência de desenvolvimento de ombro: cotovelos a 90 graus na posição inicial
+    e braços estendidos no topo. Retorna uma lista de (timestamp, LandmarkList).
+    `aspect` compensa a proporção do frame para que os ângulos em pixels fiquem corretos.
+    Cada repetição fica parada por `hold` do seu ciclo na posição inicial e outro tanto no topo,
+    para que a análise (a cada segundo) veja a extensão completa com o cotovelo parado.
+    """
+    sequence = []
+    upper_arm = 0.12
+    forearm = 0.12
+    for index in range(frames):
+        timestamp = index / fps
+        # Progresso da repetição entre 0 (posição inicial) e 1 (extensão completa), com pausas nos extremos
+        wave = 0.5 - 0.5 * math.cos(2 * math.pi * repetitions * index / frames)
+        progress = min(1.0, max(0.0, (wave - hold) / (1 - 2 * hold)))
+        elbow_angle = math.radians(90 + 85 * progress)
+
+        points = [Point(0.5, 0.5, 0.0, 0.2) for _ in range(NUM_LANDMARKS)]
+        points[NOSE] = Point(0.5, 0.2)
+        for side, sign in ((LEFT_SHOULDER, -1), (RIGHT_SHOULDER, 1)):
+            shoulder_x, shoulder_y = 0.5 + sign * 0.08, 0.35
+            elbow_x, elbow_y = shoulder_x + sign * upper_arm / aspect, shoulder_y
+            # Antebraço gira a partir da direção do braço: vertical a 90 graus, alinhado a 180 graus
+            wrist_x = elbow_x - sign * forearm * math.cos(elbow_angle) / aspect
+            wrist_y = elbow_y - forearm * math.sin(elbow_angle)
+            points[side] = Point(shoulder_x, shoulder_y)
+            points[side + 2] = Point(elbow_x, elbow_y)
+            points[side + 4] = Point(wrist_x, wrist_y)
+        # O analisador mede o tronco pelo ângulo quadril esquerdo - ombro esquerdo - quadril direito
+        # (85 a 95 graus) e o alinhamento do braço contra o quadril esquerdo: o quadril esquerdo fica
+        # abaixo do ombro esquerdo e o direito na altura dele, senão nenhuma repetição é contada
+        points[LEFT_HIP] = Point(points[LEFT_SHOULDER].x, 0.65)
+        points[RIGHT_HIP] = Point(points[RIGHT_SHOULDER].x, points[LEFT_SHOULDER].y)
+        sequence.append((timestamp, LandmarkList(points)))
+    return sequence
+
+
+def world_landmarks(landmarks, aspect=16 / 9, scale=1.8):
+    """
+    Aproxima pose_world_landmarks a partir de landmarks normalizados: coordenadas em metros,
+    centradas no quadril, com o eixo x corrigido pela proporção do frame. Serve para comparar
+    o custo do modo de cinemática "world" com o 2D sobre a mesma sequência.
+    """
+    points = landmarks.landmark
+    hip_x = (points[LEFT_HIP].x + points[RIGHT_HIP].x) / 2
+    hip_y = (points[LEFT_HIP].y + points[RIGHT_HIP].y) / 2
+    return LandmarkList([
+        Point((point.x - hip_x) * aspect * scale, (point.y - hip_y) * scale, point.z * scale, point.visibility)
+        for point in points
+    ])
+
+
+def load_recorded_sequence(path):
+    """
+    Carrega uma sequência gravada em JSON no formato
+    {"fps": 30, "frames": [{"timestamp": 0.0, "landmarks": [[x, y, z, visibility], ...]}, ...]}
+    ou uma sessão gravada pelo ai_model (.fmrec, ver recording.py).
+    """
+    if path.endswith(".fmrec"):
+        return list(SessionRecording(path).iter_frames())
+    with open(path) as f:
+        data = json.load(f)
+    return [
+        (frame["timestamp"], LandmarkList([Point(*values) for values in frame["landmarks"]]))
+        for frame in data["frames"]
+    ]
+
+
+def posture_landmarks(landmarks):
+    """
+    Monta o dicionário de pontos nomeados esperado por utils.analyze_posture.
+    """
+    points = landmarks.landmark
+    left_shoulder, right_shoulder = points[LEFT_SHOULDER], points[RIGHT_SHOULDER]
+    left_hip, right_hip = points[LEFT_HIP], points[RIGHT_HIP]
+    return {
+        "left_shoulder": left_shoulder,
+        "right_shoulder": right_shoulder,
+        "left_elbow": points[LEFT_ELBOW],
+        "left_wrist": points[LEFT_WRIST],
+        "left_hip": left_hip,
+        "right_hip": right_hip,
+        "head": points[NOSE],
+        "torso": Point((left_shoulder.x + right_shoulder.x) / 2, (left_shoulder.y + right_shoulder.y) / 2),
+        "hips": Point((left_hip.x + right_hip.x) / 2, (left_hip.y + right_hip.y) / 2),
+    }
@@ -2,7 +2,11 @@ from utils import (
     calculate_angle, check_symmetry, check_stability, 
     calculate_angular_velocity, is_within_amplitude, calculate_distance
 )
-import mediapipe as mp
+from kinematics import KINEMATICS_2D, landmarks_to_array, joint_angles_3d
+from thresholds import (
+    THRESHOLDS_ANGLES, THRESHOLDS_COSINE, AngleRule, compile_rules, evaluate_rules_frame, landmark_pixels
+)
+from pose_landmarks import PoseLandmark
 import time
 
 # Estados do exercício
@@ -11,58 +15,148 @@ ELEVATION_PHASE = "Movimento de Elevação"
 DESCENT_PHASE = "Descida Controlada"
 COMPLETED_REPETITION = "Repetição Completa"
 
-# Variáveis de progresso e motivação
-total_repetitions = 0
-last_rep_completed = False
+# Landmarks usados pela análise, consultados pelo registro de exercícios
+REQUIRED_LANDMARKS = (
+    PoseLandmark.LEFT_SHOULDER,
+    PoseLandmark.RIGHT_SHOULDER,
+    PoseLandmark.LEFT_ELBOW,
+    PoseLandmark.LEFT_WRIST,
+    PoseLandmark.LEFT_HIP,
+    PoseLandmark.RIGHT_HIP,
+)
+
+# Modo de cinemática padrão; "world" calcula os ângulos a partir de pose_world_landmarks (3D, métrico).
+# No modo "world" a simetria dos ombros continua medida em pixels nos landmarks da imagem e as faixas
+# de ângulo das fases são as mesmas, calibradas com os ângulos 2D
+KINEMATICS = KINEMATICS_2D
+
+# Pontos usados no modo world e nas regras em cosseno, e os trios (a, b, c) sobre eles: cotovelo, ombro e tronco
+WORLD_POINTS = (
+    PoseLandmark.LEFT_SHOULDER,
+    PoseLandmark.LEFT_ELBOW,
+    PoseLandmark.LEFT_WRIST,
+    PoseLandmark.LEFT_HIP,
+    PoseLandmark.RIGHT_HIP,
+)
+WORLD_JOINTS = ((0, 1, 2), (3, 0, 1), (3, 0, 4))
+ELBOW_JOINT, SHOULDER_JOINT, TORSO_JOINT = WORLD_JOINTS
+
+# Limites das transições de fase, pré-compilados em cossenos para o modo de avaliação "cosine"
+PHASE_RULES = compile_rules({
+    "elbow_flexed": AngleRule(ELBOW_JOINT, 0, 100),
+    "elbow_extended": AngleRule(ELBOW_JOINT, 160, 180),
+    "shoulder_aligned": AngleRule(SHOULDER_JOINT, 85, 95),
+    "torso_stable": AngleRule(TORSO_JOINT, 85, 95),
+})
 
 # Configurações de tempo e limites
 MIN_REP_DURATION = 1.5  # Tempo mínimo em segundos para uma repetição ser considerada válida
-previous_time = time.time()
 
-def analyze_shoulder_press(landmarks, frame_width, frame_height, prev_angles=None, prev_time=None, phase=INITIAL_POSITION):
+def new_state(now=None):
+    """
+    Progresso e motivação de uma sessão: repetições, se a última foi concluída e o início da última
+    repetição (no relógio `now`). Cada pessoa analisada mantém o seu estado.
+    """
+    return {
+        "total_repetitions": 0,
+        "last_rep_completed": False,
+        "previous_time": time.time() if now is None else now,
+    }
+
+# Estado usado quando o chamador não informa o seu (uma única pessoa por processo)
+_session_state = new_state()
+
+def reset_state(now=None):
+    """
+    Zera o progresso acumulado entre chamadas (repetições e início da última repetição),
+    para analisar uma nova sessão no mesmo processo. `now` é o relógio da nova sessão.
+    """
+    _session_state.update(new_state(now))
+
+def analyze_shoulder_press(landmarks, frame_width, frame_height, prev_angles=None, prev_time=None, phase=INITIAL_POSITION,
+                           world_landmarks=None, thresholds=THRESHOLDS_ANGLES, now=None,
+                           state=None):
     """
     Analisa o exercício de Desenvolvimento de Ombro em etapas com feedback para cada fase do movimento.
     Inclui progressão, motivação, ajuste postural, indicadores visuais e histórico de repetições.
+    Com world_landmarks (modo "world") os ângulos articulares são calculados em 3D; a simetria e os
+    limites das fases seguem os do modo 2D.
+    Com thresholds="cosine" as transições de fase usam PHASE_RULES e só o ângulo do cotovelo é
+    calculado, nos frames em que a velocidade ou o texto de feedback dependem dele; os demais
+    ângulos retornam None.
+    `now` substitui o relógio (time.time()), para reanalisar gravações com os timestamps originais.
+    `state` (criado por new_state) guarda o progresso da pessoa analisada; sem ele, o estado do módulo é usado.
     """
-    global total_repetitions, last_rep_completed, previous_time
+    if state is None:
+        state = _session_state
 
     if prev_angles is None:
         prev_angles = {}
+    current_time = time.time() if now is None else now
     if prev_time is None:
-        prev_time = time.time()
+        prev_time = current_time
 
     # Pontos principais para o exercício de desenvolvimento de ombro
-    left_shoulder = landmarks.landmark[mp.solutions.pose.PoseLandmark.LEFT_SHOULDER]
-    left_elbow = landmarks.landmark[mp.solutions.pose.PoseLandmark.LEFT_ELBOW]
-    left_wrist = landmarks.landmark[mp.solutions.pose.PoseLandmark.LEFT_WRIST]
-    left_hip = landmarks.landmark[mp.solutions.pose.PoseLandmark.LEFT_HIP]
-    right_hip = landmarks.landmark[mp.solutions.pose.PoseLandmark.RIGHT_HIP]
-    right_shoulder = landmarks.landmark[mp.solutions.pose.PoseLandmark.RIGHT_SHOULDER]
+    left_shoulder = landmarks.landmark[PoseLandmark.LEFT_SHOULDER]
+    left_elbow = landmarks.landmark[PoseLandmark.LEFT_ELBOW]
+    left_wrist = landmarks.landmark[PoseLandmark.LEFT_WRIST]
+    left_hip = landmarks.landmark[PoseLandmark.LEFT_HIP]
+    right_hip = landmarks.landmark[PoseLandmark.RIGHT_HIP]
+    right_shoulder = landmarks.landmark[PoseLandmark.RIGHT_SHOULDER]
 
     # Ângulos articulares
-    elbow_angle = calculate_angle(left_shoulder, left_elbow, left_wrist, frame_width, frame_height)
-    shoulder_angle = calculate_angle(left_hip, left_shoulder, left_elbow, frame_width, frame_height)
-    torso_angle = calculate_angle(left_hip, left_shoulder, right_hip, frame_width, frame_height)
+    if world_landmarks is not None:
+        # Em 3D o movimento fora do plano da câmera não distorce os ângulos
+        points = landmarks_to_array(world_landmarks, WORLD_POINTS)
+        elbow_angle, shoulder_angle, torso_angle = joint_angles_3d(points, WORLD_JOINTS).tolist()
+    elif thresholds == THRESHOLDS_COSINE:
+        points = landmark_pixels(landmarks, WORLD_POINTS, frame_width, frame_height)
+        rules = dict(zip(PHASE_RULES.names, evaluate_rules_frame(points, PHASE_RULES)))
+        shoulder_angle = torso_angle = None
+        at_start = rules["elbow_flexed"] and rules["shoulder_aligned"] and rules["torso_stable"]
+        # A velocidade do cotovelo é consultada na elevação e na descida ainda não concluída; o ângulo
+        # também é guardado no frame que inicia a elevação, base da velocidade no frame seguinte
+        if (phase == ELEVATION_PHASE or (phase == DESCENT_PHASE and not at_start)
+                or (phase == INITIAL_POSITION and at_start)):
+            elbow_angle = calculate_angle(left_shoulder, left_elbow, left_wrist, frame_width, frame_height)
+        else:
+            elbow_angle = None
+    else:
+        elbow_angle = calculate_angle(left_shoulder, left_elbow, left_wrist, frame_width, frame_height)
+        shoulder_angle = calculate_angle(left_hip, left_shoulder, left_elbow, frame_width, frame_height)
+        torso_angle = calculate_angle(left_hip, left_shoulder, right_hip, frame_width, frame_height)
+
+    if torso_angle is not None:
+        stable = check_stability(torso_angle)
+        at_start = elbow_angle < 100 and 85 <= shoulder_angle <= 95 and stable
+        elbow_extended = 160 <= elbow_angle <= 180
+    else:
+        stable = rules["torso_stable"]
+        elbow_extended = rules["elbow_extended"]
 
     # Critérios de análise
     symmetrical = check_symmetry(left_shoulder, right_shoulder, frame_width, frame_height)
-    stable = check_stability(torso_angle)
-    current_time = time.time()
     time_elapsed = current_time - prev_time
-    angular_velocity = calculate_angular_velocity(prev_angles.get("elbow_angle", elbow_angle), elbow_angle, time_elapsed)
+    if elbow_angle is not None:
+        prev_elbow_angle = prev_angles.get("elbow_angle")
+        if prev_elbow_angle is None:
+            prev_elbow_angle = elbow_angle
+        angular_velocity = calculate_angular_velocity(prev_elbow_angle, elbow_angle, time_elapsed)
+    else:
+        angular_velocity = None
 
     # Feedback e ajustes para fases
     feedback = ""
     if phase == INITIAL_POSITION:
-        if elbow_angle < 100 and 85 <= shoulder_angle <= 95 and stable:
+        if at_start:
             feedback = "Posição inicial correta. Prepare-se para a elevação."
             phase = ELEVATION_PHASE
-            last_rep_completed = False
+            state["last_rep_completed"] = False
         else:
             feedback = "Ajuste para a posição inicial: cotovelos a 90 graus e alinhados com os ombros."
 
     elif phase == ELEVATION_PHASE:
-        if 160 <= elbow_angle <= 180 and angular_velocity < 10:
+        if elbow_extended and angular_velocity < 10:
             feedback = "Elevação completa! Agora, desça os halteres de forma controlada."
             phase = DESCENT_PHASE
         elif angular_velocity > 15:
@@ -73,14 +167,14 @@ def analyze_shoulder_press(landmarks, frame_width, frame_height, prev_angles=Non
             feedback = "Mantenha a postura e controle o ritmo."
 
     elif phase == DESCENT_PHASE:
-        if elbow_angle < 100 and 85 <= shoulder_angle <= 95 and stable:
-            if not last_rep_completed:
-                rep_duration = time.time() - previous_time
+        if at_start:
+            if not state["last_rep_completed"]:
+                rep_duration = current_time - state["previous_time"]
                 if rep_duration >= MIN_REP_DURATION:
-                    total_repetitions += 1
-                    last_rep_completed = True
-                    previous_time = time.time()
-                    feedback = f"Repetição {total_repetitions} completa. Excelente! Volte à posição inicial."
+                    state["total_repetitions"] += 1
+                    state["last_rep_completed"] = True
+                    state["previous_time"] = current_time
+                    feedback = f"Repetição {state['total_repetitions']} completa. Excelente! Volte à posição inicial."
                 else:
                     feedback = "Repetição rápida demais. Desça lentamente para maior controle."
             phase = INITIAL_POSITION
@@ -100,8 +194,8 @@ def analyze_shoulder_press(landmarks, frame_width, frame_height, prev_angles=Non
         feedback += " | Ajuste o alinhamento dos ombros para garantir simetria."
 
     # Indicadores visuais para motivação
-    if phase == COMPLETED_REPETITION and total_repetitions > 0:
-        feedback += f" | Excelente trabalho! Total de repetições: {total_repetitions}"
+    if phase == COMPLETED_REPETITION and state["total_repetitions"] > 0:
+        feedback += f" | Excelente trabalho! Total de repetições: {state['total_repetitions']}"
 
     # Retorna feedback e informações de análise detalhada, incluindo a fase atual e repetições
     return {
@@ -113,6 +207,6 @@ def analyze_shoulder_press(landmarks, frame_width, frame_height, prev_angles=Non
         "symmetry": symmetrical,
         "stability": stable,
         "angular_velocity": angular_velocity,
-        "total_repetitions": total_repetitions,
+        "total_repetitions": state["total_repetitions"],
         "time": current_time
     }
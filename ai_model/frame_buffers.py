@@ -0,0 +1,69 @@
+import cv2
+import numpy as np
+
+class FrameRing:
+    """
+    Anel de buffers pré-alocados para captura (BGR) e conversão de cor (RGB).
+    cap.read e cv2.cvtColor escrevem diretamente nos buffers, então em regime permanente
+    o loop de captura não aloca novos frames. O mesmo buffer é compartilhado com as etapas
+    de inferência e renderização; com mais de um slot, o frame anterior continua válido
+    enquanto o próximo é lido.
+    """
+
+    def __init__(self, width, height, size=3):
+        self.slots = [self._allocate(width, height) for _ in range(size)]
+        self.index = 0
+        self.reallocations = 0
+
+    @staticmethod
+    def _allocate(width, height):
+        return (
+            np.empty((height, width, 3), dtype=np.uint8),
+            np.empty((height, width, 3), dtype=np.uint8),
+        )
+
+    def capture(self, cap):
+        """
+        Lê o próximo frame BGR para o slot atual sem converter a cor.
+        Retorna (ret, frame_bgr, buffer_rgb).
+        """
+        bgr, rgb = self.slots[self.index]
+        ret, frame = cap.read(image=bgr)
+        if not ret:
+            return False, None, None
+
+        if not np.may_share_memory(frame, bgr):
+            # A câmera entregou uma resolução diferente da solicitada: adota o novo tamanho
+            bgr = frame
+            rgb = np.empty_like(frame)
+            self.slots[self.index] = (bgr, rgb)
+            self.reallocations += 1
+
+        self.index = (self.index + 1) % len(self.slots)
+        return True, bgr, rgb
+
+    @staticmethod
+    def convert(frame_bgr, frame_rgb):
+        """
+        Converte BGR para RGB escrevendo no buffer pré-alocado.
+        """
+        cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=frame_rgb)
+        return frame_rgb
+
+    def read(self, cap):
+        """
+        Lê o próximo frame para o slot atual. Retorna (ret, frame_bgr, frame_rgb).
+        """
+        ret, bgr, rgb = self.capture(cap)
+        if ret:
+            self.convert(bgr, rgb)
+        return ret, bgr, rgb
+
+    @classmethod
+    def for_capture(cls, cap, size=3):
+        """
+        Cria o anel com a resolução efetivamente configurada na captura.
+        """
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 1280
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 720
+        return cls(width, height, size)
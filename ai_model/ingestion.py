@@ -0,0 +1,365 @@
+"""
+Ingestão de várias câmeras (ou streams RTSP/arquivos) num único processo: uma sala de estações.
+
+- Cada fonte tem uma thread de captura que lê e converte os frames e mantém apenas o mais recente
+  pendente: se a inferência não acompanhar a câmera, os frames antigos daquela fonte são
+  descartados (e contados), sem atrasar as demais.
+- Um pool compartilhado de workers de inferência atende as fontes em rodízio (round-robin): cada
+  worker pega a próxima fonte com frame pendente que não esteja em processamento. Cada fonte tem
+  o seu Pose (o rastreamento do Mediapipe é por stream) e o seu estado de análise, e no máximo um
+  frame em processamento, o que mantém a ordem dos frames por fonte.
+- stats() expõe, por fonte, FPS de captura e de processamento, descartes e latência
+  (da captura ao fim da análise).
+
+Uso (a partir da pasta ai_model):
+    python -m ingestion 0 1 rtsp://camera-3/stream gravacao.mp4 --workers 8
+"""
+import argparse
+import collections
+import os
+import threading
+import time
+from functools import partial
+
+import cv2
+import numpy as np
+
+from analysis import has_required_landmarks, process_exercise
+from registry import get_analyzer
+
+# Janela (em segundos) das estatísticas de FPS e latência
+STATS_WINDOW_SECONDS = 5.0
+
+
+def parse_source(source):
+    """
+    "0" vira o índice da câmera 0; demais valores (caminhos, URLs RTSP/HTTP) são repassados ao OpenCV.
+    """
+    return int(source) if isinstance(source, str) and source.isdigit() else source
+
+
+def is_file_source(source):
+    return isinstance(source, str) and "://" not in source and os.path.isfile(source)
+
+
+class SourceStream:
+    """
+    Estado de uma fonte: buffers de frame, frame pendente, Pose, estado do analisador e estatísticas.
+    Os campos de escalonamento (pending, busy) são protegidos pela condição do escalonador.
+    """
+
+    def __init__(self, name, source, pose, analyzer, realtime=None, buffers=3):
+        self.name = name
+        self.source = parse_source(source)
+        self.pose = pose
+        # Arquivos são lidos no ritmo do vídeo, como uma câmera; sem isso seriam quase todos descartados
+        self.realtime = is_file_source(self.source) if realtime is None else realtime
+        # Buffers (BGR, RGB) reaproveitados: um sendo escrito, um pendente e um em processamento
+        self.free_buffers = collections.deque(maxlen=buffers)
+        self.pending = None
+        self.busy = False
+        self.finished = False
+        self.error = None
+
+        self.phase = analyzer.initial_phase if analyzer else None
+        self.state = analyzer.new_state() if analyzer else None
+        self.previous_angles = {}
+        self.last_feedback_time = time.time()
+        self.landmarks = None
+        self.result = None
+
+        self.captured = 0
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self._started = None
+        self._captures = collections.deque()
+        self._completions = collections.deque()
+
+    def take_buffer(self, width, height):
+        if self.free_buffers:
+            bgr, rgb = self.free_buffers.popleft()
+            if bgr.shape[:2] == (height, width):
+                return bgr, rgb
+        return np.empty((height, width, 3), dtype=np.uint8), np.empty((height, width, 3), dtype=np.uint8)
+
+    def release_buffer(self, buffers):
+        self.free_buffers.append(buffers)
+
+    def record_capture(self, now):
+        self.captured += 1
+        self._captures.append(now)
+        if self._started is None:
+            self._started = now
+
+    def record_completion(self, captured_at, now):
+        self.processed += 1
+        self._completions.append((now, now - captured_at))
+
+    def stats(self, now):
+        """
+        FPS de captura e de processamento e latência média/p95 (ms) na janela STATS_WINDOW_SECONDS
+        (ou desde o primeiro frame, se a fonte começou há menos tempo).
+        """
+        window = min(STATS_WINDOW_SECONDS, now - self._started) if self._started else STATS_WINDOW_SECONDS
+        start = now - window
+        while self._captures and self._captures[0] < start:
+            self._captures.popleft()
+        while self._completions and self._completions[0][0] < start:
+            self._completions.popleft()
+        latencies = np.array([latency for _, latency in self._completions]) * 1000
+        return {
+            "capture_fps": len(self._captures) / window if window > 0 else 0.0,
+            "fps": len(self._completions) / window if window > 0 else 0.0,
+            "latency_ms": float(latencies.mean()) if len(latencies) else None,
+            "latency_p95_ms": float(np.percentile(latencies, 95)) if len(latencies) else None,
+            "captured": self.captured,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "finished": self.finished,
+            "error": self.error,
+        }
+
+
+class IngestionScheduler:
+    """
+    Distribui os frames de várias fontes entre `workers` threads de inferência.
+    `sources` é um dicionário nome -> fonte do OpenCV; `pose_factory()` cria um Pose por fonte.
+    `on_result(nome, landmarks, resultado)` é chamado a cada análise, na thread do worker.
+    Um erro ao processar um frame fica em stats()[nome]["error"] (o último) e ["failed"] (a contagem).
+    """
+
+    def __init__(self, sources, pose_factory, exercise_type="shoulder_press", workers=None,
+                 feedback_interval=1.0, thresholds=None, on_result=None):
+        self.exercise_type = exercise_type
+        self.analyzer = get_analyzer(exercise_type)
+        self.required_landmarks = self.analyzer.required_landmarks if self.analyzer else None
+        self.streams = [
+            SourceStream(name, source, pose_factory(), self.analyzer) for name, source in sources.items()
+        ]
+        self.workers = workers or os.cpu_count() or 1
+        self.feedback_interval = feedback_interval
+        self.thresholds = thresholds
+        self.on_result = on_result
+        self._condition = threading.Condition()
+        self._cursor = 0
+        self._running = False
+        self._threads = []
+
+    def start(self):
+        self._running = True
+        for stream in self.streams:
+            thread = threading.Thread(target=self._capture_loop, args=(stream,), name=f"capture-{stream.name}", daemon=True)
+            self._threads.append(thread)
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"pose-worker-{index}", daemon=True)
+            self._threads.append(thread)
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        for stream in self.streams:
+            close = getattr(stream.pose, "close", None)
+            if close:
+                close()
+
+    def run(self, duration=None, report_interval=None):
+        """
+        Executa até todas as fontes terminarem (arquivos) ou `duration` segundos; com report_interval,
+        imprime as estatísticas periodicamente. Retorna as estatísticas finais.
+        """
+        self.start()
+        started = time.time()
+        last_report = started
+        try:
+            while not all(stream.finished for stream in self.streams):
+                if duration and time.time() - started >= duration:
+                    break
+                time.sleep(0.05)
+                if report_interval and time.time() - last_report >= report_interval:
+                    last_report = time.time()
+                    print(format_stats(self.stats()))
+            if all(stream.finished for stream in self.streams):
+                # Fontes encerradas: espera os frames pendentes serem processados
+                with self._condition:
+                    self._condition.wait_for(
+                        lambda: all(stream.pending is None and not stream.busy for stream in self.streams),
+                        timeout=5.0)
+        finally:
+            self.stop()
+        return self.stats()
+
+    def stats(self):
+        now = time.time()
+        with self._condition:
+            return {stream.name: stream.stats(now) for stream in self.streams}
+
+    def _capture_loop(self, stream):
+        cap = cv2.VideoCapture(stream.source)
+        if not cap.isOpened():
+            with self._condition:
+                stream.error = "Não foi possível abrir a fonte"
+                stream.finished = True
+            return
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 1280
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 720
+        interval = 1.0 / (cap.get(cv2.CAP_PROP_FPS) or 30.0) if stream.realtime else 0.0
+        next_frame = time.time()
+        try:
+            while self._running:
+                with self._condition:
+                    bgr, rgb = stream.take_buffer(width, height)
+                ret, frame = cap.read(image=bgr)
+                if not ret:
+                    break
+                if not np.may_share_memory(frame, bgr):
+                    # Resolução diferente da informada pela fonte: adota o novo tamanho
+                    bgr, rgb = frame, np.empty_like(frame)
+                    height, width = frame.shape[:2]
+                cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=rgb)
+                captured_at = time.time()
+
+                self._offer(stream, (bgr, rgb), captured_at)
+
+                if interval:
+                    next_frame += interval
+                    delay = next_frame - time.time()
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        next_frame = time.time()
+        finally:
+            cap.release()
+            with self._condition:
+                stream.finished = True
+                self._condition.notify_all()
+
+    def _offer(self, stream, buffers, captured_at):
+        """
+        Torna (bgr, rgb) o frame pendente da fonte. Se o worker não pegou o anterior a tempo, ele é
+        descartado (só nesta fonte) e o seu buffer volta a ser reaproveitado.
+        """
+        with self._condition:
+            stream.record_capture(captured_at)
+            if stream.pending is not None:
+                stream.dropped += 1
+                stream.release_buffer(stream.pending[0])
+            stream.pending = (buffers, captured_at)
+            self._condition.notify()
+
+    def _next_stream(self):
+        """
+        Próxima fonte com frame pendente e livre, em rodízio a partir da última atendida.
+        Deve ser chamado com a condição adquirida.
+        """
+        count = len(self.streams)
+        for offset in range(count):
+            index = (self._cursor + offset) % count
+            stream = self.streams[index]
+            if stream.pending is not None and not stream.busy:
+                self._cursor = (index + 1) % count
+                return stream
+        return None
+
+    def _worker_loop(self):
+        while True:
+            with self._condition:
+                stream = None
+                while self._running and (stream := self._next_stream()) is None:
+                    self._condition.wait()
+                if stream is None:
+                    return
+                buffers, captured_at = stream.pending
+                stream.pending = None
+                stream.busy = True
+
+            error = None
+            try:
+                self._process(stream, buffers[1], captured_at)
+            except Exception as exc:
+                # Uma falha (no Pose, no analisador ou em on_result) perde só este frame: o worker
+                # continua atendendo as demais fontes e os próximos frames desta
+                error = f"{type(exc).__name__}: {exc}"
+            finally:
+                with self._condition:
+                    if error is not None:
+                        stream.failed += 1
+                        stream.error = error
+                    stream.record_completion(captured_at, time.time())
+                    stream.release_buffer(buffers)
+                    stream.busy = False
+                    self._condition.notify_all()
+
+    def _process(self, stream, frame_rgb, captured_at):
+        """
+        Inferência e análise de um frame da fonte, no relógio da captura.
+        """
+        frame_height, frame_width = frame_rgb.shape[:2]
+        stream.landmarks = stream.pose.process(frame_rgb).pose_landmarks
+        if (stream.landmarks is None or captured_at - stream.last_feedback_time < self.feedback_interval
+                or not has_required_landmarks(stream.landmarks, self.required_landmarks)):
+            return
+        stream.result = process_exercise(
+            self.exercise_type, stream.landmarks, frame_width, frame_height,
+            prev_angles=stream.previous_angles, prev_time=stream.last_feedback_time, phase=stream.phase,
+            thresholds=self.thresholds, now=captured_at, state=stream.state
+        )
+        stream.phase = stream.result["phase"]
+        stream.previous_angles = {
+            "elbow_angle": stream.result["elbow_angle"],
+            "shoulder_angle": stream.result["shoulder_angle"],
+            "torso_angle": stream.result["torso_angle"]
+        }
+        stream.last_feedback_time = captured_at
+        if self.on_result:
+            self.on_result(stream.name, stream.landmarks, stream.result)
+
+
+def format_stats(stats):
+    lines = []
+    for name, values in stats.items():
+        latency = "-" if values["latency_ms"] is None else f"{values['latency_ms']:.0f} ms (p95 {values['latency_p95_ms']:.0f} ms)"
+        lines.append(
+            f"  {name:<20} captura {values['capture_fps']:5.1f} fps | processamento {values['fps']:5.1f} fps | "
+            f"latência {latency} | descartados {values['dropped']}"
+            + (f" | erro: {values['error']}" if values["error"] else "")
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Análise simultânea de várias câmeras")
+    parser.add_argument("sources", nargs="+", help="índices de câmera, URLs RTSP/HTTP ou arquivos de vídeo")
+    parser.add_argument("--exercise", default="shoulder_press")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="threads de inferência compartilhadas")
+    parser.add_argument("--model-complexity", type=int, default=1)
+    parser.add_argument("--duration", type=float, help="encerra após N segundos")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="intervalo entre relatórios, em segundos")
+    parser.add_argument("--thresholds", help='modo de avaliação das regras de fase ("angles" ou "cosine")')
+    args = parser.parse_args(argv)
+
+    # O Mediapipe só é carregado ao rodar pela linha de comando
+    from main import initialize_pose
+
+    sources = {f"{index}:{source}": source for index, source in enumerate(args.sources)}
+    scheduler = IngestionScheduler(
+        sources,
+        partial(initialize_pose, model_complexity=args.model_complexity),
+        exercise_type=args.exercise,
+        workers=args.workers,
+        thresholds=args.thresholds,
+        on_result=lambda name, landmarks, result: print(f"[{name}] {result['feedback']}")
+    )
+    print(format_stats(scheduler.run(duration=args.duration, report_interval=args.report_interval)))
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import numpy as np
+
+class KeyframeScheduler:
+    """
+    Executa a inferência de pose apenas a cada k frames (keyframes) e extrapola os landmarks
+    nos frames intermediários usando a velocidade estimada entre os dois últimos keyframes.
+    O intervalo k se adapta à magnitude do movimento: em fases lentas (sustentação, descida)
+    k cresce até max_interval; em movimentos rápidos volta a 1.
+    Com `landmarks` (os REQUIRED_LANDMARKS do analisador), só o movimento desses landmarks define k:
+    partes do corpo que a análise não usa não forçam inferências.
+    """
+
+    def __init__(self, max_interval=4, motion_threshold=0.05, damping=0.8, landmarks=None):
+        # motion_threshold: deslocamento máximo tolerado (em coordenadas normalizadas) entre keyframes
+        self.max_interval = max_interval
+        self.motion_threshold = motion_threshold
+        self.damping = damping
+        self.landmarks = None if landmarks is None else np.array([int(index) for index in landmarks], dtype=np.intp)
+
+        self.interval = 1
+        self._frames_since_keyframe = 0
+        self._positions = None
+        self._velocity = None
+        self._timestamp = None
+        self._template = None
+        self._predicted = None
+        self.keyframes = 0
+        self.predicted_frames = 0
+
+    def should_infer(self):
+        """
+        Indica se o frame atual deve passar pela inferência completa.
+        """
+        return self._positions is None or self._frames_since_keyframe + 1 >= self.interval
+
+    def add_keyframe(self, pose_landmarks, timestamp):
+        """
+        Registra o resultado de uma inferência real e recalcula a velocidade e o intervalo k.
+        """
+        self._frames_since_keyframe = 0
+        if pose_landmarks is None:
+            # Sem pessoa detectada: volta a inferir todo frame
+            self._positions = None
+            self._velocity = None
+            self.interval = 1
+            return
+
+        self.keyframes += 1
+        positions = np.array([(point.x, point.y, point.z) for point in pose_landmarks.landmark], dtype=np.float32)
+
+        if self._positions is not None and timestamp > self._timestamp:
+            elapsed = timestamp - self._timestamp
+            self._velocity = (positions - self._positions) / elapsed
+            # Maior deslocamento de um landmark (dos usados pela análise) por keyframe anterior define o próximo k
+            moved = np.abs(positions[:, :2] - self._positions[:, :2])
+            displacement = float((moved if self.landmarks is None else moved[self.landmarks]).max())
+            frames_between = max(self.interval, 1)
+            per_frame = displacement / frames_between
+            if per_frame > 0:
+                self.interval = int(np.clip(self.motion_threshold / per_frame, 1, self.max_interval))
+            else:
+                self.interval = self.max_interval
+        else:
+            self._velocity = np.zeros_like(positions)
+            self.interval = 1
+
+        self._positions = positions
+        self._timestamp = timestamp
+        self._template = pose_landmarks
+
+    def predict(self, timestamp):
+        """
+        Retorna um conjunto de landmarks extrapolado para o instante informado, no mesmo formato
+        do Mediapipe, para que renderização e analisadores recebam landmarks em todo frame.
+        """
+        self._frames_since_keyframe += 1
+        if self._positions is None:
+            return None
+
+        self.predicted_frames += 1
+        elapsed = timestamp - self._timestamp
+        # Amortece a extrapolação para não ultrapassar o movimento real em desacelerações
+        positions = self._positions + self._velocity * (elapsed * self.damping)
+
+        if self._predicted is None:
+            self._predicted = type(self._template)()
+        self._predicted.CopyFrom(self._template)
+        for point, (x, y, z) in zip(self._predicted.landmark, positions.tolist()):
+            point.x = x
+            point.y = y
+            point.z = z
+        return self._predicted
+
+    def metrics(self):
+        total = self.keyframes + self.predicted_frames
+        return {
+            "interval": self.interval,
+            "keyframes": self.keyframes,
+            "predicted_frames": self.predicted_frames,
+            "inference_ratio": self.keyframes / total if total else 1.0,
+        }
@@ -0,0 +1,36 @@
+import numpy as np
+
+# Modos de cinemática que um exercício pode declarar (KINEMATICS no módulo do analisador).
+# O modo "world" é parcial: só os ângulos articulares passam a vir dos world landmarks; critérios
+# medidos em pixels (como a simetria) e as faixas de ângulo das fases continuam os do modo 2D.
+KINEMATICS_2D = "2d"
+KINEMATICS_WORLD = "world"
+KINEMATICS_MODES = (KINEMATICS_2D, KINEMATICS_WORLD)
+
+
+def landmarks_to_array(landmarks, indices=None):
+    """
+    Converte landmarks do Mediapipe (ou apenas os `indices` informados) em um array (n, 3) de x, y, z.
+    Com pose_world_landmarks as coordenadas são métricas, centradas no quadril.
+    """
+    points = landmarks.landmark
+    if indices is not None:
+        points = [points[index] for index in indices]
+    return np.array([(point.x, point.y, point.z) for point in points], dtype=np.float64)
+
+
+def joint_angles_3d(points, joints):
+    """
+    Calcula em graus o ângulo em b de cada trio (a, b, c) de `joints`, a partir de um array (..., n, 3):
+    um frame (n, 3) ou uma sequência inteira (frames, n, 3) de uma vez.
+    Usa atan2(|u x v|, u . v), estável também perto de 0 e 180 graus. O produto vetorial é escrito
+    por componentes porque, com poucos pontos por frame, np.cross custa mais que a própria conta.
+    """
+    joints = np.asarray(joints)
+    first = points[..., joints[:, 0], :] - points[..., joints[:, 1], :]
+    second = points[..., joints[:, 2], :] - points[..., joints[:, 1], :]
+    fx, fy, fz = first[..., 0], first[..., 1], first[..., 2]
+    sx, sy, sz = second[..., 0], second[..., 1], second[..., 2]
+    cross = np.sqrt((fy * sz - fz * sy) ** 2 + (fz * sx - fx * sz) ** 2 + (fx * sy - fy * sx) ** 2)
+    dot = fx * sx + fy * sy + fz * sz
+    return np.degrees(np.arctan2(cross, dot))
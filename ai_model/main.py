@@ -2,10 +2,21 @@ import cv2
 import mediapipe as mp
 import time
 import os
+import sys
 from datetime import datetime
+from functools import partial
 
-# Exercises
-from exercises.shoulder_press import analyze_shoulder_press, INITIAL_POSITION
+from adaptive import AdaptivePoseController
+from roi import RegionOfInterest
+from frame_buffers import FrameRing
+from keyframes import KeyframeScheduler
+from profiling import FrameProfiler
+from kinematics import KINEMATICS_WORLD
+from recording import SessionRecorder, recording_path
+
+# Exercícios (carregados sob demanda pelo registro)
+from registry import get_analyzer
+from analysis import has_required_landmarks, process_exercise
 
 mp_pose = mp.solutions.pose
 
@@ -21,26 +32,23 @@ def initialize_pose(detection_confidence=0.7, tracking_confidence=0.7, enable_se
         min_tracking_confidence=tracking_confidence
     )
 
-def process_exercise(exercise_type, landmarks, frame_width, frame_height, prev_angles, prev_time, phase):
+def infer_pose(pose, frame_rgb, frame_width, frame_height, controller=None, roi=None, with_world=False):
     """
-    Executa a função de análise do exercício e retorna o feedback e dados de análise.
+    Executa a inferência de pose sobre o frame (ou o recorte do atleta) e retorna
+    os landmarks em coordenadas normalizadas do frame inteiro, ou None.
+    Com with_world retorna (landmarks, world_landmarks); os world landmarks são métricos e
+    centrados no quadril, então não dependem do recorte.
     """
-    if exercise_type == "shoulder_press":
-        return analyze_shoulder_press(landmarks, frame_width, frame_height, prev_angles, prev_time, phase)
-    else:
-        # Retorna um dicionário padrão caso o exercício não seja suportado
-        return {
-            "feedback": "Exercise not supported.",
-            "phase": phase,
-            "elbow_angle": 0,
-            "shoulder_angle": 0,
-            "torso_angle": 0,
-            "symmetry": False,
-            "stability": False,
-            "angular_velocity": 0,
-            "time": prev_time,
-            "total_repetitions": 0
-        }
+    box = None
+    if roi:
+        frame_rgb, box = roi.crop(frame_rgb)
+    result = controller.process(frame_rgb) if controller else pose.process(frame_rgb)
+    if roi:
+        # Landmarks voltam para coordenadas do frame inteiro
+        roi.update(result.pose_landmarks, box, frame_width, frame_height)
+    if with_world:
+        return result.pose_landmarks, result.pose_world_landmarks
+    return result.pose_landmarks
 
 def get_log_file_path(exercise_type):
     """
@@ -58,6 +66,12 @@ def get_log_file_path(exercise_type):
     log_file_path = os.path.join(exercise_folder, f"{date_str}.txt")
     return log_file_path
 
+def format_value(value):
+    """
+    Formata um ângulo ou velocidade do resultado; no modo "cosine" os valores não calculados vêm como None.
+    """
+    return "-" if value is None else f"{value:.2f}"
+
 def log_feedback(result, exercise_type):
     """
     Salva o feedback em um arquivo de log específico para o exercício e a data, incluindo detalhes de ângulos.
@@ -67,65 +81,112 @@ def log_feedback(result, exercise_type):
         timestamp = datetime.now().strftime("%H:%M:%S")
         f.write(f"[{timestamp}] Feedback: {result['feedback']}\n")
         f.write(f"   Fase: {result['phase']}\n")
-        f.write(f"   Ângulos - Cotovelo: {result['elbow_angle']:.2f}, Ombro: {result['shoulder_angle']:.2f}, Tronco: {result['torso_angle']:.2f}\n")
+        f.write(f"   Ângulos - Cotovelo: {format_value(result['elbow_angle'])}, Ombro: {format_value(result['shoulder_angle'])}, Tronco: {format_value(result['torso_angle'])}\n")
         f.write(f"   Simetria: {result['symmetry']}, Estabilidade: {result['stability']}\n")
-        f.write(f"   Velocidade Angular: {result['angular_velocity']:.2f}\n")
+        f.write(f"   Velocidade Angular: {format_value(result['angular_velocity'])}\n")
         f.write(f"   Total de Repetições: {result['total_repetitions']}\n")
 
-def capture_video(pose, exercise_type, feedback_interval=1.0):
+def capture_video(pose, exercise_type, feedback_interval=1.0, controller=None, roi=None, keyframes=None,
+                  source=0, display=True, log_results=True, max_frames=None, profiler=None, thresholds=None,
+                  recorder=None):
     """
     Captura vídeo da câmera e processa a pose para o tipo de exercício especificado.
+    Se um AdaptivePoseController for informado, ele escolhe o modelo e a escala de cada inferência.
+    Se um RegionOfInterest for informado, a inferência roda apenas na região do atleta.
+    Se um KeyframeScheduler for informado, a inferência roda só nos keyframes e os demais frames
+    recebem landmarks extrapolados.
+    `source` aceita o índice da câmera ou o caminho de um vídeo; com display=False o loop roda
+    sem janela (usado nos benchmarks). Retorna o total de frames processados e o FPS médio.
+    O profiler (FrameProfiler) padrão é configurado pelas variáveis FITMOTION_PROFILE*.
+    Com um SessionRecorder, todo frame com landmarks é gravado, junto do resultado quando analisado.
     """
-    cap = cv2.VideoCapture(0)
+    if profiler is None:
+        profiler = FrameProfiler.from_env()
+
+    cap = cv2.VideoCapture(source)
     if not cap.isOpened():
         raise RuntimeError("Não foi possível acessar a câmera. Verifique a conexão.")
 
-    # Define resolução para reduzir o "zoom" e obter uma melhor visão do exercício
-    desired_width = 1280
-    desired_height = 720
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, desired_width)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, desired_height)
+    if isinstance(source, int):
+        # Define resolução para reduzir o "zoom" e obter uma melhor visão do exercício
+        desired_width = 1280
+        desired_height = 720
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, desired_width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, desired_height)
+
+    # Buffers reutilizados a cada frame para leitura e conversão de cor
+    frames = FrameRing.for_capture(cap)
+
+    # Resolve o analisador uma única vez; o módulo do exercício é importado aqui
+    analyzer = get_analyzer(exercise_type)
+    required_landmarks = analyzer.required_landmarks if analyzer else None
+    use_world = analyzer is not None and analyzer.kinematics == KINEMATICS_WORLD
+    world_landmarks = None
 
     # Inicializa variáveis de fase e controle de feedback
     mp_drawing = mp.solutions.drawing_utils
     last_feedback_time = time.time()
     previous_angles = None
-    current_phase = INITIAL_POSITION
+    current_phase = analyzer.initial_phase if analyzer else None
     start_time = time.time()  # Usado para calcular o FPS
     frame_count = 0
 
     try:
+        profiler.start()
         while cap.isOpened():
-            ret, frame = cap.read()
+            with profiler.stage("read"):
+                ret, frame, frame_rgb = frames.capture(cap)
             if not ret:
-                print("Erro ao capturar vídeo. Verifique a conexão com a câmera.")
+                if isinstance(source, int):
+                    print("Erro ao capturar vídeo. Verifique a conexão com a câmera.")
                 break
 
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            result = pose.process(frame_rgb)
+            with profiler.stage("convert"):
+                frames.convert(frame, frame_rgb)
+
+            frame_width, frame_height = frame.shape[1], frame.shape[0]
+            with profiler.stage("infer"):
+                if keyframes is None or keyframes.should_infer():
+                    if use_world:
+                        pose_landmarks, world_landmarks = infer_pose(
+                            pose, frame_rgb, frame_width, frame_height, controller, roi, with_world=True)
+                    else:
+                        pose_landmarks = infer_pose(pose, frame_rgb, frame_width, frame_height, controller, roi)
+                    if keyframes:
+                        keyframes.add_keyframe(pose_landmarks, time.time())
+                else:
+                    # A extrapolação cobre só os landmarks da imagem; os world landmarks da última inferência são mantidos
+                    pose_landmarks = keyframes.predict(time.time())
+
+            if pose_landmarks:
+                with profiler.stage("draw"):
+                    mp_drawing.draw_landmarks(frame, pose_landmarks, mp_pose.POSE_CONNECTIONS)
 
-            if result.pose_landmarks:
-                mp_drawing.draw_landmarks(frame, result.pose_landmarks, mp_pose.POSE_CONNECTIONS)
+                result = None
 
                 current_time = time.time()
-                if current_time - last_feedback_time >= feedback_interval:
-                    landmarks = result.pose_landmarks
-                    frame_width, frame_height = frame.shape[1], frame.shape[0]
+                if (current_time - last_feedback_time >= feedback_interval
+                        and has_required_landmarks(pose_landmarks, required_landmarks)):
+                    landmarks = pose_landmarks
 
                     # Processa o exercício e obtém dados de análise, incluindo fase atual
-                    result = process_exercise(
-                        exercise_type,
-                        landmarks,
-                        frame_width,
-                        frame_height,
-                        prev_angles=previous_angles if previous_angles else {},
-                        prev_time=last_feedback_time,
-                        phase=current_phase
-                    )
+                    with profiler.stage("analyze"):
+                        result = process_exercise(
+                            exercise_type,
+                            landmarks,
+                            frame_width,
+                            frame_height,
+                            prev_angles=previous_angles if previous_angles else {},
+                            prev_time=last_feedback_time,
+                            phase=current_phase,
+                            world_landmarks=world_landmarks,
+                            thresholds=thresholds
+                        )
 
                     # Atualiza a fase e o feedback com base no resultado
                     current_phase = result["phase"]
-                    print(result["feedback"])
+                    if log_results:
+                        print(result["feedback"])
 
                     # Atualiza ângulos e tempo para controle
                     previous_angles = {
@@ -142,36 +203,110 @@ def capture_video(pose, exercise_type, feedback_interval=1.0):
                     cv2.putText(frame, f"Repetições: {result['total_repetitions']}", (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1, cv2.LINE_AA)
                     cv2.putText(frame, f"Fase: {result['phase']}", (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1, cv2.LINE_AA)
 
-                    log_feedback(result, exercise_type)
+                    if log_results:
+                        log_feedback(result, exercise_type)
+
+                if recorder:
+                    with profiler.stage("record"):
+                        if not recorder.frames:
+                            recorder.metadata.update(frame_width=frame_width, frame_height=frame_height)
+                        # No relógio da análise, para a reanálise reproduzir a mesma cadência de feedback
+                        recorder.append(current_time, pose_landmarks, result,
+                                        world_landmarks=world_landmarks if use_world else None)
 
             # Calcula e exibe a taxa de quadros (FPS)
             frame_count += 1
             elapsed_time = time.time() - start_time
             fps = frame_count / elapsed_time if elapsed_time > 0 else 0
-            cv2.putText(frame, f"FPS: {fps:.2f}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 1, cv2.LINE_AA)
+            profiler.tick()
+            if max_frames and frame_count >= max_frames:
+                break
 
-            cv2.imshow('FitMotion - Pose Detection with Segmentation', frame)
-            if cv2.waitKey(10) & 0xFF == ord('q'):
+            with profiler.stage("display"):
+                cv2.putText(frame, f"FPS: {fps:.2f}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 1, cv2.LINE_AA)
+                if controller:
+                    metrics = controller.metrics()
+                    cv2.putText(frame, f"Modelo: {metrics['model_complexity']} | Escala: {metrics['input_scale']:.2f} | Inferencia: {metrics['avg_inference_ms']:.1f} ms", (10, 190), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1, cv2.LINE_AA)
+                if display:
+                    cv2.imshow('FitMotion - Pose Detection with Segmentation', frame)
+            if display and cv2.waitKey(10) & 0xFF == ord('q'):
                 break
 
     finally:
+        profiler.stop()
         cap.release()
-        cv2.destroyAllWindows()
+        if display:
+            cv2.destroyAllWindows()
+        if controller and log_results:
+            print(f"Configuração final do modelo: {controller.metrics()}")
+
+    elapsed_time = time.time() - start_time
+    return {
+        "frames": frame_count,
+        "fps": frame_count / elapsed_time if elapsed_time > 0 else 0
+    }
 
-def run_exercise_analysis(exercise_type="shoulder_press", detection_confidence=0.7, tracking_confidence=0.7, feedback_interval=1.0, enable_segmentation=True, model_complexity=1):
+def run_exercise_analysis(exercise_type="shoulder_press", detection_confidence=0.7, tracking_confidence=0.7, feedback_interval=1.0, enable_segmentation=True, model_complexity=1, target_fps=None, use_roi=False, skip_frames=0, profile=False, kinematics=None, thresholds=None, record=False):
     """
     Função de orquestração que inicializa o modelo, configura os parâmetros e inicia a captura de vídeo.
+    Com target_fps definido, o model_complexity e a resolução de entrada passam a ser ajustados em tempo real.
+    Com use_roi, a inferência é feita sobre o recorte do atleta em vez do frame inteiro.
+    Com skip_frames > 0, até skip_frames frames consecutivos usam landmarks extrapolados em vez de inferência;
+    o intervalo é medido pelo movimento dos landmarks que o exercício declara usar.
+    Com profile (ou FITMOTION_PROFILE=1), os primeiros segundos da captura são perfilados.
+    Com kinematics ("2d" ou "world") o modo de cinemática declarado pelo exercício é substituído.
+    Com thresholds="cosine" as regras de fase são avaliadas com limites pré-compilados em cossenos.
+    Com record, os landmarks e a análise de cada frame são gravados em recordings/<exercicio>/ (.fmrec),
+    junto dos world landmarks no modo "world".
     """
-    # Inicializa o modelo de pose com os parâmetros fornecidos
-    pose = initialize_pose(
+    analyzer = get_analyzer(exercise_type)
+    if kinematics and analyzer is not None:
+        analyzer.kinematics = kinematics
+
+    pose_factory = partial(
+        initialize_pose,
         detection_confidence=detection_confidence,
         tracking_confidence=tracking_confidence,
-        enable_segmentation=enable_segmentation,
-        model_complexity=model_complexity
+        enable_segmentation=enable_segmentation
     )
 
+    controller = None
+    if target_fps:
+        controller = AdaptivePoseController(pose_factory, target_fps=target_fps, start_complexity=model_complexity)
+        pose = controller.pose
+    else:
+        # Inicializa o modelo de pose com os parâmetros fornecidos
+        pose = pose_factory(model_complexity=model_complexity)
+
+    recorder = None
+    if record:
+        kinematics = analyzer.kinematics if analyzer else kinematics
+        recorder = SessionRecorder(
+            recording_path(exercise_type, datetime.now()),
+            metadata={"exercise_type": exercise_type, "kinematics": kinematics, "thresholds": thresholds},
+            world=kinematics == KINEMATICS_WORLD
+        )
+
     # Inicia a captura de vídeo e o processamento de feedback para o exercício especificado
-    capture_video(pose=pose, exercise_type=exercise_type, feedback_interval=feedback_interval)
+    try:
+        capture_video(
+            pose=pose,
+            exercise_type=exercise_type,
+            feedback_interval=feedback_interval,
+            controller=controller,
+            roi=RegionOfInterest() if use_roi else None,
+            keyframes=KeyframeScheduler(
+                max_interval=skip_frames + 1, landmarks=analyzer.required_landmarks if analyzer else None
+            ) if skip_frames else None,
+            profiler=FrameProfiler(enabled=True) if profile else None,
+            thresholds=thresholds,
+            recorder=recorder
+        )
+    finally:
+        if controller:
+            controller.close()
+        if recorder:
+            recorder.close()
 
 if __name__ == "__main__":
     run_exercise_analysis(
@@ -180,5 +315,12 @@ if __name__ == "__main__":
         tracking_confidence=0.7,
         feedback_interval=1.0,
         enable_segmentation=False,
-        model_complexity=1
+        model_complexity=1,
+        target_fps=int(os.environ.get("FITMOTION_TARGET_FPS", 0)) or None,
+        use_roi=os.environ.get("FITMOTION_USE_ROI") == "1",
+        skip_frames=int(os.environ.get("FITMOTION_SKIP_FRAMES", 0)),
+        profile="--profile" in sys.argv,
+        kinematics=os.environ.get("FITMOTION_KINEMATICS"),
+        thresholds=os.environ.get("FITMOTION_THRESHOLDS"),
+        record=os.environ.get("FITMOTION_RECORD") == "1"
     )
@@ -0,0 +1,400 @@
+"""
+Análise de várias pessoas no mesmo frame (uma turma diante de uma câmera).
+
+O Pose do Mediapipe rastreia uma única pessoa. Aqui um detector de pessoas localiza os atletas,
+um rastreador por IoU/centroide mantém a identidade de cada um entre frames e cada trilha tem o
+seu Pose (rodando só no recorte da pessoa, via RegionOfInterest) e o seu estado de análise.
+
+Custo por frame:
+- o detector roda a cada `detect_interval` frames, ou antes quando uma trilha é perdida; entre
+  detecções as caixas seguem os landmarks de cada pessoa;
+- as inferências das trilhas de um frame são despachadas juntas para um pool de threads (o grafo
+  do Mediapipe roda fora do GIL), então o tempo de parede cresce menos que o número de pessoas;
+- com skip_frames, cada trilha estável usa landmarks extrapolados (KeyframeScheduler) entre inferências.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import cv2
+import numpy as np
+
+from frame_buffers import FrameRing
+from keyframes import KeyframeScheduler
+from analysis import has_required_landmarks, process_exercise
+from registry import get_analyzer
+from roi import RegionOfInterest
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """
+    IoU entre todas as caixas (x0, y0, x1, y1) de boxes_a (n, 4) e boxes_b (m, 4): array (n, m).
+    """
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+    left = np.maximum(a[:, None, 0], b[None, :, 0])
+    top = np.maximum(a[:, None, 1], b[None, :, 1])
+    right = np.minimum(a[:, None, 2], b[None, :, 2])
+    bottom = np.minimum(a[:, None, 3], b[None, :, 3])
+    intersection = np.clip(right - left, 0, None) * np.clip(bottom - top, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return intersection / np.maximum(union, 1e-9)
+
+
+def suppress_overlaps(boxes, scores, iou_threshold=0.4):
+    """
+    Supressão de não-máximos gulosa: mantém as caixas de maior score que não se sobrepõem.
+    """
+    order = list(np.argsort(scores)[::-1])
+    overlaps = iou_matrix(boxes, boxes)
+    kept = []
+    for index in order:
+        if all(overlaps[index, other] < iou_threshold for other in kept):
+            kept.append(index)
+    return [boxes[index] for index in kept]
+
+
+class PersonDetector:
+    """
+    Detector de pessoas HOG do OpenCV (sem dependências além do opencv-python-headless).
+    Roda sobre o frame reduzido para no máximo `max_side` pixels e retorna caixas em pixels do frame.
+    """
+
+    def __init__(self, max_side=640, min_score=0.5):
+        self.max_side = max_side
+        self.min_score = min_score
+        self._hog = cv2.HOGDescriptor()
+        self._hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
+
+    def detect(self, frame_rgb):
+        height, width = frame_rgb.shape[:2]
+        factor = min(1.0, self.max_side / max(height, width))
+        image = frame_rgb if factor == 1.0 else cv2.resize(
+            frame_rgb, (int(width * factor), int(height * factor)), interpolation=cv2.INTER_AREA)
+        rects, weights = self._hog.detectMultiScale(image, winStride=(8, 8), padding=(8, 8), scale=1.05)
+        boxes, scores = [], []
+        for (x, y, w, h), score in zip(rects, np.ravel(weights)):
+            if score >= self.min_score:
+                boxes.append(tuple(int(round(value / factor)) for value in (x, y, x + w, y + h)))
+                scores.append(float(score))
+        return suppress_overlaps(boxes, scores) if boxes else []
+
+
+class Track:
+    """
+    Uma pessoa rastreada: caixa atual, recorte para a inferência, Pose próprio e estado de análise.
+    """
+
+    def __init__(self, track_id, box, pose, analyzer, now, skip_frames=0):
+        self.track_id = track_id
+        self.box = box
+        self.pose = pose
+        # Numa turma cada pessoa ocupa uma fração pequena do frame: tamanho mínimo e recorte menores
+        self.roi = RegionOfInterest(max_side=256, min_size=0.05)
+        self.roi.box = box
+        self.keyframes = KeyframeScheduler(
+            max_interval=skip_frames + 1, landmarks=analyzer.required_landmarks if analyzer else None
+        ) if skip_frames else None
+        self.missed = 0
+        self.lost = False
+        self.landmarks = None
+        self.result = None
+        # Estado do analisador, independente por pessoa
+        self.phase = analyzer.initial_phase if analyzer else None
+        self.state = analyzer.new_state(now) if analyzer else None
+        self.previous_angles = {}
+        self.last_feedback_time = now
+
+
+class PersonTracker:
+    """
+    Associa detecções a trilhas por IoU (guloso, maior IoU primeiro) e, sem sobreposição, pela
+    distância entre centroides relativa ao tamanho das caixas. Trilhas sem detecção por mais de
+    `max_missed` detecções seguidas são encerradas.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_centroid_distance=0.5, max_missed=2):
+        self.iou_threshold = iou_threshold
+        self.max_centroid_distance = max_centroid_distance
+        self.max_missed = max_missed
+
+    def match(self, tracks, detections):
+        """
+        Retorna (pares (trilha, detecção), detecções sem trilha, trilhas sem detecção).
+        """
+        if not tracks or not detections:
+            return [], list(detections), list(tracks)
+        track_boxes = np.array([track.box for track in tracks], dtype=np.float64)
+        detection_boxes = np.array(detections, dtype=np.float64)
+        scores = iou_matrix(track_boxes, detection_boxes)
+
+        # Com pouca sobreposição (caixas do detector e dos landmarks têm tamanhos diferentes), centroides
+        # próximos, em unidades da maior das duas diagonais, também associam
+        track_centers = (track_boxes[:, :2] + track_boxes[:, 2:]) / 2
+        detection_centers = (detection_boxes[:, :2] + detection_boxes[:, 2:]) / 2
+        diagonals = np.maximum(
+            np.linalg.norm(track_boxes[:, 2:] - track_boxes[:, :2], axis=1)[:, None],
+            np.linalg.norm(detection_boxes[:, 2:] - detection_boxes[:, :2], axis=1)[None, :]
+        )
+        distances = np.linalg.norm(track_centers[:, None] - detection_centers[None], axis=2) / np.maximum(diagonals, 1)
+        fallback = (scores < self.iou_threshold) & (distances <= self.max_centroid_distance)
+        scores = np.where(fallback, self.iou_threshold * (1 - distances / self.max_centroid_distance), scores)
+
+        pairs, used_tracks, used_detections = [], set(), set()
+        for flat in np.argsort(scores, axis=None)[::-1]:
+            track_index, detection_index = np.unravel_index(flat, scores.shape)
+            if scores[track_index, detection_index] <= 0:
+                break
+            if track_index in used_tracks or detection_index in used_detections:
+                continue
+            if scores[track_index, detection_index] < self.iou_threshold and not fallback[track_index, detection_index]:
+                continue
+            used_tracks.add(track_index)
+            used_detections.add(detection_index)
+            pairs.append((tracks[track_index], detections[detection_index]))
+        unmatched_detections = [box for index, box in enumerate(detections) if index not in used_detections]
+        unmatched_tracks = [track for index, track in enumerate(tracks) if index not in used_tracks]
+        return pairs, unmatched_detections, unmatched_tracks
+
+
+class MultiPersonSession:
+    """
+    Analisa até `max_people` pessoas por frame, cada uma com o seu Pose e o seu estado de análise.
+    `pose_factory()` cria um Pose; instâncias de trilhas encerradas são zeradas e reaproveitadas.
+    """
+
+    def __init__(self, pose_factory, exercise_type, detector=None, tracker=None, detect_interval=15,
+                 max_people=8, feedback_interval=1.0, skip_frames=0, workers=None, thresholds=None,
+                 duplicate_iou=0.7):
+        self.pose_factory = pose_factory
+        self.exercise_type = exercise_type
+        self.analyzer = get_analyzer(exercise_type)
+        self.required_landmarks = self.analyzer.required_landmarks if self.analyzer else None
+        self.detector = detector or PersonDetector()
+        self.tracker = tracker or PersonTracker()
+        self.detect_interval = detect_interval
+        self.max_people = max_people
+        self.feedback_interval = feedback_interval
+        self.skip_frames = skip_frames
+        self.thresholds = thresholds
+        self.duplicate_iou = duplicate_iou
+        self.tracks = []
+        self._free_poses = []
+        self._next_id = 1
+        self._frames_since_detection = None
+        self._executor = ThreadPoolExecutor(max_workers=workers or max_people)
+        self.detections = 0
+        self.inferences = 0
+
+    def close(self):
+        self._executor.shutdown()
+        for pose in self._free_poses + [track.pose for track in self.tracks]:
+            close = getattr(pose, "close", None)
+            if close:
+                close()
+        self._free_poses, self.tracks = [], []
+
+    def _acquire_pose(self):
+        """
+        Pose para uma nova trilha: reaproveita o de uma trilha encerrada, zerado com reset() para não
+        rastrear a partir dos landmarks da pessoa anterior, ou cria um novo.
+        """
+        if not self._free_poses:
+            return self.pose_factory()
+        pose = self._free_poses.pop()
+        reset = getattr(pose, "reset", None)
+        if reset:
+            reset()
+        return pose
+
+    def _end_track(self, track):
+        self.tracks.remove(track)
+        self._free_poses.append(track.pose)
+
+    def _merge_duplicates(self):
+        """
+        Quando duas trilhas passam a seguir a mesma pessoa (caixas quase coincidentes), mantém a mais antiga.
+        """
+        if len(self.tracks) < 2:
+            return
+        overlaps = np.triu(iou_matrix([track.box for track in self.tracks], [track.box for track in self.tracks]), 1)
+        duplicates = {self.tracks[index] for index in np.nonzero(overlaps > self.duplicate_iou)[1]}
+        for track in duplicates:
+            self._end_track(track)
+
+    def _detect(self, frame_rgb, now):
+        self.detections += 1
+        self._frames_since_detection = 0
+        detections = self.detector.detect(frame_rgb)
+        pairs, new_boxes, lost = self.tracker.match(self.tracks, detections)
+        for track, box in pairs:
+            track.box = box
+            track.roi.box = box
+            track.missed = 0
+            track.lost = False
+        for track in lost:
+            track.missed += 1
+            if track.missed > self.tracker.max_missed:
+                self._end_track(track)
+        for box in new_boxes[:max(0, self.max_people - len(self.tracks))]:
+            pose = self._acquire_pose()
+            self.tracks.append(Track(self._next_id, box, pose, self.analyzer, now, self.skip_frames))
+            self._next_id += 1
+
+    def _infer(self, track, frame_rgb, frame_width, frame_height):
+        """
+        Inferência no recorte da trilha; os landmarks voltam em coordenadas do frame inteiro.
+        """
+        image, box = track.roi.crop(frame_rgb)
+        landmarks = track.pose.process(image).pose_landmarks
+        track.roi.update(landmarks, box, frame_width, frame_height)
+        return landmarks
+
+    def process(self, frame_rgb, now):
+        """
+        Processa um frame: atualiza as trilhas, infere a pose de cada pessoa e roda o analisador de
+        quem atingiu o intervalo de feedback. Retorna as trilhas ativas (landmarks e último resultado).
+        """
+        frame_height, frame_width = frame_rgb.shape[:2]
+        lost = any(track.lost for track in self.tracks)
+        if (self._frames_since_detection is None or lost or not self.tracks
+                or self._frames_since_detection >= self.detect_interval):
+            self._detect(frame_rgb, now)
+        self._frames_since_detection += 1
+        self._merge_duplicates()
+
+        inferring = [track for track in self.tracks if track.keyframes is None or track.keyframes.should_infer()]
+        # Todas as inferências do frame são despachadas de uma vez e rodam em paralelo
+        futures = [
+            self._executor.submit(self._infer, track, frame_rgb, frame_width, frame_height) for track in inferring
+        ]
+        for track, future in zip(inferring, futures):
+            track.landmarks = future.result()
+            if track.keyframes:
+                track.keyframes.add_keyframe(track.landmarks, now)
+        self.inferences += len(inferring)
+        for track in self.tracks:
+            if track.keyframes and track not in inferring:
+                track.landmarks = track.keyframes.predict(now)
+
+        for track in self.tracks:
+            if track.roi.box is None:
+                # Perdeu a pessoa: mantém a última caixa (e não o frame inteiro, onde há outras pessoas)
+                # e pede uma nova detecção no próximo frame
+                track.roi.box = track.box
+                track.lost = True
+                continue
+            track.box = track.roi.box
+            if (track.landmarks is None or now - track.last_feedback_time < self.feedback_interval
+                    or not has_required_landmarks(track.landmarks, self.required_landmarks)):
+                continue
+            track.result = process_exercise(
+                self.exercise_type, track.landmarks, frame_width, frame_height,
+                prev_angles=track.previous_angles, prev_time=track.last_feedback_time, phase=track.phase,
+                thresholds=self.thresholds, now=now, state=track.state
+            )
+            track.phase = track.result["phase"]
+            track.previous_angles = {
+                "elbow_angle": track.result["elbow_angle"],
+                "shoulder_angle": track.result["shoulder_angle"],
+                "torso_angle": track.result["torso_angle"]
+            }
+            track.last_feedback_time = now
+        return self.tracks
+
+    def metrics(self):
+        return {
+            "tracks": len(self.tracks),
+            "detections": self.detections,
+            "inferences": self.inferences,
+        }
+
+
+def capture_video_multi_person(session, source=0, display=True, log_results=True, max_frames=None):
+    """
+    Loop de captura do modo com várias pessoas: cada trilha é desenhada com o seu número, fase e
+    repetições. Retorna o total de frames processados, o FPS médio e as métricas da sessão.
+    """
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise RuntimeError("Não foi possível acessar a câmera. Verifique a conexão.")
+    if isinstance(source, int):
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+
+    import mediapipe as mp
+
+    frames = FrameRing.for_capture(cap)
+    mp_drawing = mp.solutions.drawing_utils
+    start_time = time.time()
+    frame_count = 0
+    try:
+        while cap.isOpened():
+            ret, frame, frame_rgb = frames.capture(cap)
+            if not ret:
+                break
+            frames.convert(frame, frame_rgb)
+
+            for track in session.process(frame_rgb, time.time()):
+                left, top, right, bottom = track.box
+                cv2.rectangle(frame, (left, top), (right, bottom), (255, 255, 0), 1)
+                if track.landmarks:
+                    mp_drawing.draw_landmarks(frame, track.landmarks, mp.solutions.pose.POSE_CONNECTIONS)
+                if track.result:
+                    label = f"#{track.track_id} {track.result['phase']} | Repetições: {track.result['total_repetitions']}"
+                    cv2.putText(frame, label, (left, max(15, top - 5)), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1, cv2.LINE_AA)
+                    if log_results and track.result["time"] == track.last_feedback_time:
+                        print(f"[#{track.track_id}] {track.result['feedback']}")
+
+            frame_count += 1
+            if max_frames and frame_count >= max_frames:
+                break
+            if display:
+                cv2.imshow('FitMotion - Várias Pessoas', frame)
+                if cv2.waitKey(10) & 0xFF == ord('q'):
+                    break
+    finally:
+        cap.release()
+        if display:
+            cv2.destroyAllWindows()
+
+    elapsed_time = time.time() - start_time
+    return {
+        "frames": frame_count,
+        "fps": frame_count / elapsed_time if elapsed_time > 0 else 0,
+        **session.metrics(),
+    }
+
+
+def run_multi_person_analysis(exercise_type="shoulder_press", max_people=8, detect_interval=15, skip_frames=0,
+                              feedback_interval=1.0, model_complexity=0, thresholds=None, source=0):
+    """
+    Inicializa uma sessão com várias pessoas e inicia a captura. Cada trilha usa um Pose com
+    model_complexity (0 por padrão: o recorte de cada pessoa é pequeno e o custo se multiplica por pessoa).
+    """
+    from main import initialize_pose
+
+    session = MultiPersonSession(
+        partial(initialize_pose, model_complexity=model_complexity),
+        exercise_type,
+        detect_interval=detect_interval,
+        max_people=max_people,
+        feedback_interval=feedback_interval,
+        skip_frames=skip_frames,
+        thresholds=thresholds
+    )
+    try:
+        return capture_video_multi_person(session, source=source)
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    run_multi_person_analysis(
+        max_people=int(os.environ.get("FITMOTION_MAX_PEOPLE", 8)),
+        skip_frames=int(os.environ.get("FITMOTION_SKIP_FRAMES", 0)),
+        thresholds=os.environ.get("FITMOTION_THRESHOLDS")
+    )
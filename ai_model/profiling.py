@@ -0,0 +1,161 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+
+# Limites (ms) dos buckets do histograma de tempo por etapa
+HISTOGRAM_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 33, 50, 100, 200, 500)
+
+_NULL_STAGE = nullcontext()
+
+
+class StackSampler(threading.Thread):
+    """
+    Profiler estatístico: amostra periodicamente a pilha da thread alvo e acumula as pilhas
+    no formato "collapsed" (func;func;func contagem), aceito por flamegraph.pl e speedscope.
+    Cada amostra é atribuída à etapa ativa no momento.
+    """
+
+    def __init__(self, target_thread_id, stage_getter, interval=0.005):
+        super().__init__(daemon=True)
+        self.target_thread_id = target_thread_id
+        self.stage_getter = stage_getter
+        self.interval = interval
+        self.samples = defaultdict(Counter)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.samples[self.stage_getter() or "other"][";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class FrameProfiler:
+    """
+    Modo de profiling opcional do loop de captura. Durante uma janela limitada (window_seconds)
+    executa cProfile e o amostrador de pilhas, e mede o tempo de cada etapa do frame
+    (read, convert, infer, draw, analyze, record, display). Ao final da janela grava em output_dir:
+      - capture.prof: estatísticas do cProfile (pstats / snakeviz)
+      - <etapa>.collapsed: pilhas amostradas por etapa, prontas para flamegraph
+      - timings.json: histograma e percentis do tempo de cada etapa
+    Desabilitado, stage() devolve um contexto nulo e o custo por frame é desprezível.
+    """
+
+    def __init__(self, enabled=False, window_seconds=30.0, output_dir="profiles", sample_interval=0.005):
+        self.enabled = enabled
+        self.window_seconds = window_seconds
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.timings = defaultdict(list)
+        self._current_stage = None
+        self._profile = None
+        self._sampler = None
+        self._started_at = None
+
+    @classmethod
+    def from_env(cls):
+        """
+        Configura pelo ambiente: FITMOTION_PROFILE=1, FITMOTION_PROFILE_SECONDS e FITMOTION_PROFILE_DIR.
+        """
+        return cls(
+            enabled=os.environ.get("FITMOTION_PROFILE") == "1",
+            window_seconds=float(os.environ.get("FITMOTION_PROFILE_SECONDS", 30)),
+            output_dir=os.environ.get("FITMOTION_PROFILE_DIR", "profiles"),
+        )
+
+    def start(self):
+        if not self.enabled or self._started_at is not None:
+            return
+        self._started_at = time.perf_counter()
+        self._profile = cProfile.Profile()
+        self._sampler = StackSampler(threading.get_ident(), lambda: self._current_stage, self.sample_interval)
+        self._sampler.start()
+        self._profile.enable()
+
+    @contextmanager
+    def _timed_stage(self, name):
+        previous = self._current_stage
+        self._current_stage = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name].append((time.perf_counter() - start) * 1000)
+            self._current_stage = previous
+
+    def stage(self, name):
+        """
+        Contexto que mede uma etapa do frame enquanto a janela de profiling está ativa.
+        """
+        if self._profile is None:
+            return _NULL_STAGE
+        return self._timed_stage(name)
+
+    def tick(self):
+        """
+        Chamado uma vez por frame; encerra a janela e grava os resultados quando o tempo acaba.
+        """
+        if self._profile is not None and time.perf_counter() - self._started_at >= self.window_seconds:
+            self.stop()
+
+    def stop(self):
+        if self._profile is None:
+            return
+        self._profile.disable()
+        self._sampler.stop()
+        self._dump()
+        self._profile = None
+        self._sampler = None
+
+    def _dump(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._profile.dump_stats(os.path.join(self.output_dir, "capture.prof"))
+
+        for stage, stacks in self._sampler.samples.items():
+            with open(os.path.join(self.output_dir, f"{stage}.collapsed"), "w") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+        with open(os.path.join(self.output_dir, "timings.json"), "w") as f:
+            json.dump(summarize_timings(self.timings), f, indent=2)
+        print(f"Profiling gravado em {os.path.abspath(self.output_dir)}")
+
+
+def summarize_timings(timings):
+    """
+    Converte as listas de tempos (ms) por etapa em histogramas com percentis.
+    """
+    summary = {}
+    for stage, values in timings.items():
+        ordered = sorted(values)
+        histogram = Counter()
+        for value in ordered:
+            bucket = next((f"<={limit}" for limit in HISTOGRAM_BUCKETS_MS if value <= limit), "inf")
+            histogram[bucket] += 1
+        summary[stage] = {
+            "count": len(ordered),
+            "mean_ms": sum(ordered) / len(ordered),
+            "p50_ms": ordered[len(ordered) // 2],
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            "max_ms": ordered[-1],
+            "histogram_ms": {
+                bucket: histogram[bucket]
+                for bucket in [f"<={limit}" for limit in HISTOGRAM_BUCKETS_MS] + ["inf"]
+            },
+        }
+    return summary
@@ -0,0 +1,332 @@
+"""
+Gravação de sessões em formato colunar (.fmrec), para reanálise sem refazer a inferência de pose.
+
+Layout do arquivo (little-endian):
+    MAGIC (8 bytes)
+    blocos de até `chunk_frames` frames, cada um com as colunas contíguas e alinhadas em 64 bytes:
+        timestamps  float64 (n,)
+        landmarks   float32 (n, 33, 4)   x, y, z, visibility
+        analysis    float32 (n, len(ANALYSIS_COLUMNS))   NaN nos frames sem análise
+        codes       int32   (n, 2)       índice da fase e do feedback nas tabelas do rodapé, -1 sem análise
+        world       float32 (n, 33, 4)   pose_world_landmarks (metros), só em sessões no modo "world";
+                                         NaN nos frames sem world landmarks
+    rodapé JSON com o índice dos blocos (offset de cada coluna), as tabelas de fases e feedbacks
+    e os metadados da sessão, seguido do tamanho do rodapé (uint64) e do MAGIC.
+
+Como cada coluna de cada bloco é um array de largura fixa, a leitura é feita com np.memmap:
+os blocos viram views sobre o arquivo, sem cópia nem parsing.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b"FMREC01\n"
+VERSION = 1
+NUM_LANDMARKS = 33
+LANDMARK_FIELDS = 4
+ALIGNMENT = 64
+
+# Colunas numéricas por frame, extraídas do dicionário retornado pelos analisadores
+ANALYSIS_COLUMNS = (
+    "elbow_angle", "shoulder_angle", "torso_angle", "angular_velocity",
+    "symmetry", "stability", "total_repetitions",
+)
+
+_FOOTER_TAIL = struct.Struct("<Q8s")
+
+
+class RecordedPoint:
+    """
+    Landmark gravado, com a mesma interface dos landmarks do Mediapipe (x, y, z, visibility).
+    """
+    __slots__ = ("x", "y", "z", "visibility")
+
+    def __init__(self, x, y, z, visibility):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.visibility = visibility
+
+
+class RecordedLandmarks:
+    """
+    Equivalente a NormalizedLandmarkList para uma linha (33, 4) da gravação: expõe `.landmark`.
+    """
+    __slots__ = ("landmark",)
+
+    def __init__(self, values):
+        self.landmark = [RecordedPoint(*row) for row in values.tolist()]
+
+
+def _pad(f):
+    """
+    Completa o arquivo com zeros até o próximo múltiplo de ALIGNMENT e retorna o offset.
+    """
+    offset = f.tell()
+    padding = -offset % ALIGNMENT
+    if padding:
+        f.write(b"\0" * padding)
+    return offset + padding
+
+
+class SessionRecorder:
+    """
+    Grava uma sessão frame a frame. Os frames ficam em buffers pré-alocados de `chunk_frames`
+    e cada bloco cheio é escrito de uma vez; close() escreve o último bloco e o rodapé.
+    """
+
+    def __init__(self, path, metadata=None, chunk_frames=1024, world=False):
+        self.path = path
+        self.metadata = dict(metadata or {})
+        self.chunk_frames = chunk_frames
+        self.world = world
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._timestamps = np.empty(chunk_frames, dtype=np.float64)
+        self._landmarks = np.empty((chunk_frames, NUM_LANDMARKS, LANDMARK_FIELDS), dtype=np.float32)
+        self._analysis = np.empty((chunk_frames, len(ANALYSIS_COLUMNS)), dtype=np.float32)
+        self._codes = np.empty((chunk_frames, 2), dtype=np.int32)
+        self._world = np.empty((chunk_frames, NUM_LANDMARKS, LANDMARK_FIELDS), dtype=np.float32) if world else None
+        self._count = 0
+        self._chunks = []
+        self._phases = {}
+        self._feedback = {}
+        self.frames = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _code(self, table, value):
+        if value is None:
+            return -1
+        return table.setdefault(value, len(table))
+
+    def append(self, timestamp, landmarks, result=None, world_landmarks=None):
+        """
+        Registra os landmarks de um frame e, quando houver, o resultado da análise do frame.
+        Em gravações com `world`, registra também os world landmarks usados na análise.
+        """
+        index = self._count
+        self._timestamps[index] = timestamp
+        self._landmarks[index] = [
+            (point.x, point.y, point.z, point.visibility) for point in landmarks.landmark
+        ]
+        if self.world:
+            if world_landmarks is None:
+                self._world[index] = np.nan
+            else:
+                self._world[index] = [
+                    (point.x, point.y, point.z, point.visibility) for point in world_landmarks.landmark
+                ]
+        if result is None:
+            self._analysis[index] = np.nan
+            self._codes[index] = -1
+        else:
+            self._analysis[index] = [
+                np.nan if result.get(column) is None else float(result[column]) for column in ANALYSIS_COLUMNS
+            ]
+            self._codes[index] = (
+                self._code(self._phases, result.get("phase")),
+                self._code(self._feedback, result.get("feedback")),
+            )
+        self._count += 1
+        self.frames += 1
+        if self._count == self.chunk_frames:
+            self._flush()
+
+    def _flush(self):
+        if not self._count:
+            return
+        count, f = self._count, self._file
+        chunk = {"frames": count}
+        for name, column in (("timestamps", self._timestamps), ("landmarks", self._landmarks),
+                             ("analysis", self._analysis), ("codes", self._codes), ("world", self._world)):
+            if column is None:
+                continue
+            chunk[name] = _pad(f)
+            f.write(column[:count].tobytes())
+        self._chunks.append(chunk)
+        self._count = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._flush()
+        footer = json.dumps({
+            "version": VERSION,
+            "landmarks": NUM_LANDMARKS,
+            "world": self.world,
+            "columns": list(ANALYSIS_COLUMNS),
+            "phases": list(self._phases),
+            "feedback": list(self._feedback),
+            "metadata": self.metadata,
+            "chunks": self._chunks,
+        }).encode("utf-8")
+        self._file.write(footer)
+        self._file.write(_FOOTER_TAIL.pack(len(footer), MAGIC))
+        self._file.close()
+
+
+class RecordingChunk:
+    """
+    Views (np.memmap) das colunas de um bloco da gravação.
+    """
+    __slots__ = ("start", "timestamps", "landmarks", "analysis", "codes", "world")
+
+    def __init__(self, start, timestamps, landmarks, analysis, codes, world=None):
+        self.start = start
+        self.timestamps = timestamps
+        self.landmarks = landmarks
+        self.analysis = analysis
+        self.codes = codes
+        self.world = world
+
+    def __len__(self):
+        return len(self.timestamps)
+
+
+class SessionRecording:
+    """
+    Leitura de um arquivo .fmrec. Só o rodapé é lido ao abrir; as colunas são views np.memmap,
+    então percorrer os blocos lê o arquivo sequencialmente e o acesso a um frame é aleatório.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} não é uma gravação FitMotion")
+            f.seek(size - _FOOTER_TAIL.size)
+            footer_size, magic = _FOOTER_TAIL.unpack(f.read(_FOOTER_TAIL.size))
+            if magic != MAGIC:
+                raise ValueError(f"Gravação incompleta (sem rodapé): {path}")
+            f.seek(size - _FOOTER_TAIL.size - footer_size)
+            footer = json.loads(f.read(footer_size))
+        if footer["version"] != VERSION:
+            raise ValueError(f"Versão de gravação não suportada: {footer['version']}")
+
+        self.columns = tuple(footer["columns"])
+        self.phases = footer["phases"]
+        self.feedback = footer["feedback"]
+        self.metadata = footer["metadata"]
+        self._data = np.memmap(path, dtype=np.uint8, mode="r") if footer["chunks"] else None
+        self.num_landmarks = footer["landmarks"]
+        # Gravações anteriores à coluna de world landmarks não têm a chave
+        self.has_world = footer.get("world", False)
+        self.chunks = []
+        start = 0
+        for chunk in footer["chunks"]:
+            count = chunk["frames"]
+            self.chunks.append(RecordingChunk(
+                start,
+                self._view(chunk["timestamps"], np.float64, (count,)),
+                self._view(chunk["landmarks"], np.float32, (count, self.num_landmarks, LANDMARK_FIELDS)),
+                self._view(chunk["analysis"], np.float32, (count, len(self.columns))),
+                self._view(chunk["codes"], np.int32, (count, 2)),
+                self._view(chunk["world"], np.float32, (count, self.num_landmarks, LANDMARK_FIELDS))
+                if self.has_world else None,
+            ))
+            start += count
+        self._starts = [chunk.start for chunk in self.chunks]
+        self.frames = start
+
+    def _view(self, offset, dtype, shape):
+        return np.ndarray(shape, dtype=dtype, buffer=self._data, offset=offset)
+
+    def __len__(self):
+        return self.frames
+
+    def _locate(self, index):
+        if not 0 <= index < self.frames:
+            raise IndexError(index)
+        chunk = self.chunks[np.searchsorted(self._starts, index, side="right") - 1]
+        return chunk, index - chunk.start
+
+    def column(self, name):
+        """
+        Coluna inteira (frames,) de um campo: "timestamps", um nome de ANALYSIS_COLUMNS ou "phase"/"feedback"
+        (códigos). Concatena os blocos, portanto copia; para varrer sem cópia use `chunks`.
+        """
+        if name == "timestamps":
+            parts = [chunk.timestamps for chunk in self.chunks]
+        elif name in ("phase", "feedback"):
+            position = 0 if name == "phase" else 1
+            parts = [chunk.codes[:, position] for chunk in self.chunks]
+        else:
+            position = self.columns.index(name)
+            parts = [chunk.analysis[:, position] for chunk in self.chunks]
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    def landmarks(self, start=0, stop=None):
+        """
+        Landmarks (n, 33, 4) dos frames [start, stop). Dentro de um único bloco retorna a view sem cópia.
+        """
+        stop = self.frames if stop is None else min(stop, self.frames)
+        if start >= stop:
+            return np.empty((0, self.num_landmarks, LANDMARK_FIELDS), dtype=np.float32)
+        chunk, offset = self._locate(start)
+        if offset + (stop - start) <= len(chunk):
+            return chunk.landmarks[offset:offset + stop - start]
+        parts = []
+        for chunk in self.chunks:
+            first, last = max(start, chunk.start), min(stop, chunk.start + len(chunk))
+            if first < last:
+                parts.append(chunk.landmarks[first - chunk.start:last - chunk.start])
+        return np.concatenate(parts)
+
+    def frame(self, index):
+        """
+        (timestamp, RecordedLandmarks) de um frame, para repassar a um analisador.
+        """
+        chunk, offset = self._locate(index)
+        return float(chunk.timestamps[offset]), RecordedLandmarks(chunk.landmarks[offset])
+
+    def world_frame(self, index):
+        """
+        World landmarks (RecordedLandmarks, em metros) gravados para o frame, ou None quando a sessão
+        não grava world landmarks ou o frame não os tinha.
+        """
+        if not self.has_world:
+            return None
+        chunk, offset = self._locate(index)
+        values = chunk.world[offset]
+        return None if np.isnan(values[0, 0]) else RecordedLandmarks(values)
+
+    def result(self, index):
+        """
+        Resultado da análise gravado para o frame, no formato dos analisadores, ou None.
+        """
+        chunk, offset = self._locate(index)
+        phase, feedback = chunk.codes[offset].tolist()
+        if phase < 0 and feedback < 0:
+            return None
+        result = {
+            name: (None if np.isnan(value) else value)
+            for name, value in zip(self.columns, chunk.analysis[offset].tolist())
+        }
+        result["phase"] = self.phases[phase] if phase >= 0 else None
+        result["feedback"] = self.feedback[feedback] if feedback >= 0 else None
+        return result
+
+    def iter_frames(self):
+        """
+        Percorre a sessão em ordem, gerando (timestamp, RecordedLandmarks), como as sequências dos benchmarks.
+        """
+        for chunk in self.chunks:
+            for timestamp, values in zip(chunk.timestamps.tolist(), chunk.landmarks):
+                yield timestamp, RecordedLandmarks(values)
+
+
+def recording_path(exercise_type, started_at):
+    """
+    Caminho da gravação de uma sessão, ao lado dos logs: recordings/<exercicio>/<data>-<hora>.fmrec.
+    """
+    folder = os.path.join("recordings", exercise_type)
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, started_at.strftime("%Y-%m-%d-%H%M%S") + ".fmrec")
@@ -0,0 +1,144 @@
+import importlib
+from importlib.metadata import entry_points
+
+from kinematics import KINEMATICS_2D, KINEMATICS_MODES
+
+# Grupo de entry points usado por pacotes externos para registrar novos exercícios:
+#   [project.entry-points."fitmotion.exercises"]
+#   deadlift = "meu_pacote.deadlift:analyze_deadlift"
+ENTRY_POINT_GROUP = "fitmotion.exercises"
+
+# Exercícios embutidos no formato "modulo:funcao". Os módulos só são importados no primeiro uso.
+BUILTIN_ANALYZERS = {
+    "shoulder_press": "exercises.shoulder_press:analyze_shoulder_press",
+}
+
+
+class ExerciseAnalyzer:
+    """
+    Referência preguiçosa para a função de análise de um exercício.
+    O módulo do analisador só é importado quando a função ou seus metadados são acessados.
+    """
+
+    def __init__(self, exercise_type, target, kinematics=None):
+        self.exercise_type = exercise_type
+        self.target = target
+        self._module = None
+        self._analyze = None
+        self._kinematics = None
+        if kinematics is not None:
+            self.kinematics = kinematics
+
+    def _load(self):
+        if self._analyze is None:
+            module_name, _, attr = self.target.partition(":")
+            self._module = importlib.import_module(module_name)
+            self._analyze = getattr(self._module, attr)
+        return self._analyze
+
+    @property
+    def module(self):
+        self._load()
+        return self._module
+
+    @property
+    def initial_phase(self):
+        """
+        Fase inicial declarada pelo módulo do analisador (INITIAL_POSITION).
+        """
+        return getattr(self.module, "INITIAL_POSITION", None)
+
+    @property
+    def required_landmarks(self):
+        """
+        Landmarks (PoseLandmark) usados pelo analisador, declarados em REQUIRED_LANDMARKS.
+        Retorna None quando o módulo não declara, indicando que todos são necessários.
+        """
+        return getattr(self.module, "REQUIRED_LANDMARKS", None)
+
+    @property
+    def kinematics(self):
+        """
+        Modo de cinemática do exercício: o definido no registro, senão KINEMATICS do módulo, senão "2d".
+        No modo "world" o analisador recebe também world_landmarks, usados nos ângulos articulares.
+        """
+        if self._kinematics is not None:
+            return self._kinematics
+        return getattr(self.module, "KINEMATICS", KINEMATICS_2D)
+
+    @kinematics.setter
+    def kinematics(self, mode):
+        if mode not in KINEMATICS_MODES:
+            raise ValueError(f"Modo de cinemática desconhecido: {mode}")
+        self._kinematics = mode
+
+    def new_state(self, now=None):
+        """
+        Estado independente para analisar mais uma pessoa (new_state(now) do módulo), repassado
+        ao analisador em `state`. None quando o módulo não declara, e então o analisador usa o seu.
+        """
+        new_state = getattr(self.module, "new_state", None)
+        return new_state(now) if new_state is not None else None
+
+    def reset(self, now=None):
+        """
+        Zera o estado entre sessões chamando reset_state(now) do módulo, quando declarado.
+        """
+        reset_state = getattr(self.module, "reset_state", None)
+        if reset_state is not None:
+            reset_state(now)
+
+    @property
+    def is_loaded(self):
+        return self._analyze is not None
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+
+_registry = {name: ExerciseAnalyzer(name, target) for name, target in BUILTIN_ANALYZERS.items()}
+_entry_points_loaded = False
+
+
+def register_analyzer(exercise_type, target, kinematics=None):
+    """
+    Registra (ou substitui) um analisador. `target` pode ser "modulo:funcao" ou a própria função.
+    `kinematics` ("2d" ou "world") substitui o modo declarado pelo módulo.
+    """
+    if callable(target):
+        target = f"{target.__module__}:{target.__name__}"
+    _registry[exercise_type] = ExerciseAnalyzer(exercise_type, target, kinematics)
+    return _registry[exercise_type]
+
+
+def _discover_entry_points():
+    """
+    Descobre analisadores publicados via entry points, sem importar seus módulos.
+    Exercícios embutidos ou registrados manualmente têm prioridade.
+    """
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name not in _registry:
+            _registry[entry_point.name] = ExerciseAnalyzer(entry_point.name, entry_point.value)
+
+
+def get_analyzer(exercise_type):
+    """
+    Retorna o analisador registrado para o exercício ou None se não for suportado.
+    """
+    analyzer = _registry.get(exercise_type)
+    if analyzer is None:
+        _discover_entry_points()
+        analyzer = _registry.get(exercise_type)
+    return analyzer
+
+
+def available_exercises():
+    """
+    Lista os identificadores de todos os exercícios conhecidos (embutidos, registrados e via entry points).
+    """
+    _discover_entry_points()
+    return sorted(_registry)
@@ -0,0 +1,234 @@
+"""
+Reanálise determinística de sessões gravadas, sem câmera e sem janela.
+
+Cada gravação (.fmrec ou .json, ver benchmarks/sequences.py) passa por process_exercise com os
+timestamps originais, na mesma cadência de feedback do loop de captura. A saída é a sequência de
+eventos (timestamp, fase, feedback, repetições) de cada análise, comparada com as saídas de
+referência (golden) em <golden>/<gravação>.json.
+
+Uso (a partir da pasta ai_model):
+    python -m replay gravacoes/ --golden golden/ --update-golden   # grava as referências
+    python -m replay gravacoes/ --golden golden/                   # compara; código 1 se divergir
+    python -m replay gravacoes/ --workers 8 --thresholds cosine
+
+As gravações são distribuídas entre processos (--workers); cada processo reinicia o estado do
+analisador antes de cada gravação, então o resultado não depende da ordem nem do paralelismo.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from benchmarks.sequences import load_recorded_sequence
+from analysis import MIN_VISIBILITY, has_required_landmarks, process_exercise
+from kinematics import KINEMATICS_WORLD
+from recording import RecordedLandmarks, SessionRecording
+from registry import get_analyzer
+
+DEFAULT_EXERCISE = "shoulder_press"
+DEFAULT_FRAME_SIZE = (1280, 720)
+
+
+def load_recording(path):
+    """
+    Retorna (metadados, frames): a SessionRecording de uma .fmrec, lida sob demanda, ou a lista
+    [(timestamp, landmarks), ...] de uma gravação JSON, que não tem metadados.
+    """
+    if path.endswith(".fmrec"):
+        recording = SessionRecording(path)
+        return recording.metadata, recording
+    return {}, load_recorded_sequence(path)
+
+
+def analyzed_frames(frames, feedback_interval, required_landmarks, world=False):
+    """
+    Gera (timestamp, landmarks, world_landmarks) dos frames que o loop de captura analisaria: o primeiro,
+    após cada intervalo de feedback, com os landmarks exigidos visíveis. Numa SessionRecording só a coluna
+    de timestamps é percorrida; a visibilidade e os landmarks são lidos apenas nesses frames.
+    world_landmarks só é lido com `world` (gravações no modo "world"); senão é None.
+    """
+    last_feedback_time = _first_timestamp(frames)
+    if isinstance(frames, SessionRecording):
+        required = None if required_landmarks is None else [int(index) for index in required_landmarks]
+        for chunk in frames.chunks:
+            for offset, timestamp in enumerate(chunk.timestamps.tolist()):
+                if timestamp - last_feedback_time < feedback_interval:
+                    continue
+                values = chunk.landmarks[offset]
+                if required is not None and (values[required, 3] < MIN_VISIBILITY).any():
+                    continue
+                last_feedback_time = timestamp
+                world_landmarks = None
+                if world and not np.isnan(chunk.world[offset, 0, 0]):
+                    world_landmarks = RecordedLandmarks(chunk.world[offset])
+                yield timestamp, RecordedLandmarks(values), world_landmarks
+        return
+    for timestamp, landmarks in frames:
+        if timestamp - last_feedback_time < feedback_interval or not has_required_landmarks(landmarks, required_landmarks):
+            continue
+        last_feedback_time = timestamp
+        yield timestamp, landmarks, None
+
+
+def _first_timestamp(frames):
+    if isinstance(frames, SessionRecording):
+        return float(frames.chunks[0].timestamps[0]) if frames.frames else 0.0
+    return frames[0][0] if frames else 0.0
+
+
+def replay_recording(path, exercise_type=None, feedback_interval=1.0, thresholds=None):
+    """
+    Reanalisa uma gravação e retorna {"recording", "exercise_type", "frames", "analyzed",
+    "seconds", "events"}. `seconds` mede só o tempo gasto nos analisadores.
+    """
+    metadata, frames = load_recording(path)
+    exercise_type = exercise_type or metadata.get("exercise_type") or DEFAULT_EXERCISE
+    frame_width = metadata.get("frame_width", DEFAULT_FRAME_SIZE[0])
+    frame_height = metadata.get("frame_height", DEFAULT_FRAME_SIZE[1])
+    thresholds = thresholds or metadata.get("thresholds")
+
+    analyzer = get_analyzer(exercise_type)
+    if analyzer is None:
+        raise ValueError(f"Exercício não suportado: {exercise_type}")
+    world = (metadata.get("kinematics") or analyzer.kinematics) == KINEMATICS_WORLD
+    if world and not (isinstance(frames, SessionRecording) and frames.has_world):
+        # Reanalisar em 2D uma sessão analisada em 3D daria eventos diferentes dos originais
+        raise ValueError(f"Gravação sem world landmarks para o modo de cinemática \"world\": {path}")
+
+    events = []
+    phase = analyzer.initial_phase
+    previous_angles = {}
+    last_feedback_time = _first_timestamp(frames)
+    analyzer.reset(last_feedback_time)
+    elapsed = 0.0
+    for timestamp, landmarks, world_landmarks in analyzed_frames(
+            frames, feedback_interval, analyzer.required_landmarks, world):
+        start = time.perf_counter()
+        result = process_exercise(
+            exercise_type, landmarks, frame_width, frame_height,
+            prev_angles=previous_angles, prev_time=last_feedback_time, phase=phase,
+            world_landmarks=world_landmarks, thresholds=thresholds, now=timestamp
+        )
+        elapsed += time.perf_counter() - start
+        phase = result["phase"]
+        previous_angles = {
+            "elbow_angle": result["elbow_angle"],
+            "shoulder_angle": result["shoulder_angle"],
+            "torso_angle": result["torso_angle"]
+        }
+        last_feedback_time = timestamp
+        events.append([round(timestamp, 6), result["phase"], result["feedback"], result["total_repetitions"]])
+
+    return {
+        "recording": os.path.splitext(os.path.basename(path))[0],
+        "exercise_type": exercise_type,
+        "frames": len(frames),
+        "analyzed": len(events),
+        "seconds": elapsed,
+        "events": events,
+    }
+
+
+def _replay_task(task):
+    path, options = task
+    return replay_recording(path, **options)
+
+
+def replay_all(paths, workers=1, **options):
+    """
+    Reanalisa as gravações em `workers` processos (1 roda no processo atual), na ordem de `paths`.
+    """
+    tasks = [(path, options) for path in paths]
+    if workers <= 1:
+        return [_replay_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_replay_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+
+def diff_events(expected, actual, limit=5):
+    """
+    Linhas descrevendo as diferenças entre duas listas de eventos (no máximo `limit`).
+    """
+    lines = []
+    for index in range(max(len(expected), len(actual))):
+        old = expected[index] if index < len(expected) else None
+        new = actual[index] if index < len(actual) else None
+        if old != new:
+            lines.append(f"    evento {index}: esperado {old}, obtido {new}")
+            if len(lines) == limit:
+                lines.append("    ...")
+                break
+    return lines
+
+
+def find_recordings(folder):
+    return sorted(glob.glob(os.path.join(folder, "*.fmrec")) + glob.glob(os.path.join(folder, "*.json")))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reanálise de sessões gravadas com comparação às saídas de referência")
+    parser.add_argument("recordings", help="pasta com gravações (*.fmrec ou *.json)")
+    parser.add_argument("--golden", help="pasta com as saídas de referência (<gravação>.json)")
+    parser.add_argument("--update-golden", action="store_true", help="grava as saídas atuais como referência")
+    parser.add_argument("--exercise", help="exercício (padrão: o dos metadados da gravação)")
+    parser.add_argument("--feedback-interval", type=float, default=1.0, help="intervalo entre análises, em segundos")
+    parser.add_argument("--thresholds", help='modo de avaliação das regras de fase ("angles" ou "cosine")')
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processos paralelos")
+    args = parser.parse_args(argv)
+
+    paths = find_recordings(args.recordings)
+    if not paths:
+        print(f"Nenhuma gravação em {args.recordings}")
+        return 1
+
+    start = time.perf_counter()
+    results = replay_all(
+        paths, workers=args.workers, exercise_type=args.exercise,
+        feedback_interval=args.feedback_interval, thresholds=args.thresholds
+    )
+    wall = time.perf_counter() - start
+
+    frames = sum(result["frames"] for result in results)
+    analyzed = sum(result["analyzed"] for result in results)
+    analyzer_seconds = sum(result["seconds"] for result in results)
+    print(f"{len(results)} gravações, {frames} frames, {analyzed} análises em {wall:.2f} s "
+          f"({frames / wall:.0f} frames/s; analisadores: "
+          f"{analyzed / analyzer_seconds if analyzer_seconds else 0:.0f} análises/s por processo)")
+
+    if not args.golden:
+        return 0
+    os.makedirs(args.golden, exist_ok=True)
+    mismatches = 0
+    for result in results:
+        golden_path = os.path.join(args.golden, f"{result['recording']}.json")
+        if args.update_golden:
+            with open(golden_path, "w") as f:
+                json.dump({"exercise_type": result["exercise_type"], "events": result["events"]},
+                          f, indent=1, ensure_ascii=False)
+            continue
+        if not os.path.exists(golden_path):
+            print(f"  {result['recording']}: sem referência em {golden_path}")
+            mismatches += 1
+            continue
+        with open(golden_path) as f:
+            expected = json.load(f)["events"]
+        lines = diff_events(expected, result["events"])
+        if lines:
+            mismatches += 1
+            print(f"  {result['recording']}: DIVERGENTE")
+            print("\n".join(lines))
+
+    if args.update_golden:
+        print(f"Referências gravadas em {args.golden}")
+        return 0
+    print(f"{len(results) - mismatches}/{len(results)} gravações iguais à referência")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import cv2
+import numpy as np
+
+class RegionOfInterest:
+    """
+    Recorta a região do atleta antes da inferência, usando a caixa delimitadora dos landmarks
+    do frame anterior com uma margem. Quando o rastreamento é perdido, volta a usar o frame inteiro.
+    """
+
+    def __init__(self, margin=0.25, max_side=384, min_visibility=0.5, min_size=0.2):
+        self.margin = margin
+        self.max_side = max_side
+        self.min_visibility = min_visibility
+        self.min_size = min_size
+        self.box = None
+
+    def crop(self, frame_rgb):
+        """
+        Retorna (imagem para inferência, caixa usada). A caixa é None quando o frame inteiro é usado.
+        Apenas a região recortada (menor que o frame) é copiada ou reduzida.
+        """
+        box = self.box
+        image = frame_rgb if box is None else frame_rgb[box[1]:box[3], box[0]:box[2]]
+
+        height, width = image.shape[:2]
+        longest = max(height, width)
+        if box is not None and longest > self.max_side:
+            factor = self.max_side / longest
+            image = cv2.resize(image, (int(width * factor), int(height * factor)), interpolation=cv2.INTER_AREA)
+        elif box is not None:
+            # O Mediapipe exige um array contíguo
+            image = np.ascontiguousarray(image)
+        return image, box
+
+    def update(self, pose_landmarks, box, frame_width, frame_height):
+        """
+        Converte os landmarks do recorte para coordenadas normalizadas do frame inteiro (in place),
+        de modo que normalize_coordinates e os analisadores não precisem saber do recorte,
+        e calcula a caixa para o próximo frame.
+        """
+        if pose_landmarks is None:
+            self.box = None
+            return None
+
+        points = pose_landmarks.landmark
+        if box is not None:
+            x0, y0, x1, y1 = box
+            crop_width, crop_height = x1 - x0, y1 - y0
+            for point in points:
+                point.x = (x0 + point.x * crop_width) / frame_width
+                point.y = (y0 + point.y * crop_height) / frame_height
+                # z segue a mesma escala de x no Mediapipe
+                point.z = point.z * crop_width / frame_width
+
+        visible = [point for point in points if point.visibility >= self.min_visibility]
+        if len(visible) < 4:
+            # Rastreamento perdido: próxima inferência usa o frame inteiro
+            self.box = None
+            return pose_landmarks
+
+        min_x = min(point.x for point in visible)
+        max_x = max(point.x for point in visible)
+        min_y = min(point.y for point in visible)
+        max_y = max(point.y for point in visible)
+
+        # Margem proporcional ao tamanho do corpo e tamanho mínimo para evitar recortes degenerados
+        box_width = max(max_x - min_x, self.min_size) * (1 + 2 * self.margin)
+        box_height = max(max_y - min_y, self.min_size) * (1 + 2 * self.margin)
+        center_x, center_y = (min_x + max_x) / 2, (min_y + max_y) / 2
+
+        left = max(0, int((center_x - box_width / 2) * frame_width))
+        top = max(0, int((center_y - box_height / 2) * frame_height))
+        right = min(frame_width, int((center_x + box_width / 2) * frame_width))
+        bottom = min(frame_height, int((center_y + box_height / 2) * frame_height))
+
+        if right - left < 2 or bottom - top < 2:
+            self.box = None
+        else:
+            self.box = (left, top, right, bottom)
+        return pose_landmarks
+
+    def reset(self):
+        self.box = None
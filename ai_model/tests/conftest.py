@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os módulos do ai_model são importados pelo nome, como ao rodar a partir da pasta ai_model
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,132 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from ingestion import IngestionScheduler
+
+
+class StubPose:
+    """
+    Pose sem Mediapipe: devolve landmarks fixos e, opcionalmente, falha nos frames indicados.
+    """
+
+    def __init__(self, fail_on=()):
+        self.calls = 0
+        self.fail_on = set(fail_on)
+        self.closed = False
+
+    def process(self, frame_rgb):
+        self.calls += 1
+        if self.calls in self.fail_on:
+            raise RuntimeError("falha na inferência")
+        return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=[]))
+
+    def close(self):
+        self.closed = True
+
+
+def _frame():
+    return np.zeros((4, 4, 3), dtype=np.uint8), np.zeros((4, 4, 3), dtype=np.uint8)
+
+
+def _scheduler(names, poses=None, workers=1, on_result=None):
+    poses = iter(poses or [StubPose() for _ in names])
+    return IngestionScheduler(
+        {name: name for name in names}, lambda: next(poses), exercise_type="nao_registrado",
+        workers=workers, feedback_interval=0.0, on_result=on_result
+    )
+
+
+def _start_workers(scheduler):
+    # Só os workers: os frames são entregues pelo teste no lugar das threads de captura
+    scheduler._running = True
+    for index in range(scheduler.workers):
+        thread = threading.Thread(target=scheduler._worker_loop, daemon=True)
+        scheduler._threads.append(thread)
+        thread.start()
+
+
+def _wait_idle(scheduler):
+    with scheduler._condition:
+        assert scheduler._condition.wait_for(
+            lambda: all(stream.pending is None and not stream.busy for stream in scheduler.streams), timeout=5.0)
+
+
+def test_streams_are_served_round_robin_and_busy_streams_are_skipped():
+    scheduler = _scheduler(["a", "b", "c"])
+    for stream in scheduler.streams:
+        scheduler._offer(stream, _frame(), 1.0)
+
+    with scheduler._condition:
+        first = scheduler._next_stream()
+        first.busy = True
+        second = scheduler._next_stream()
+        second.busy = True
+        third = scheduler._next_stream()
+        third.busy = True
+        assert [first.name, second.name, third.name] == ["a", "b", "c"]
+        assert scheduler._next_stream() is None
+
+        # "a" segue ocupada com frame pendente: o rodízio passa para a próxima livre
+        first.pending = (_frame(), 2.0)
+        third.busy = False
+        third.pending = (_frame(), 2.0)
+        assert scheduler._next_stream() is third
+
+
+def test_pending_frame_is_dropped_when_a_newer_one_arrives():
+    scheduler = _scheduler(["a", "b"])
+    stream, other = scheduler.streams
+    old_buffers, new_buffers = _frame(), _frame()
+
+    scheduler._offer(stream, old_buffers, 1.0)
+    scheduler._offer(other, _frame(), 1.0)
+    scheduler._offer(stream, new_buffers, 2.0)
+
+    assert stream.dropped == 1 and other.dropped == 0
+    assert stream.pending == (new_buffers, 2.0)
+    # O buffer descartado volta para ser reaproveitado pela captura
+    assert stream.free_buffers[0] is old_buffers
+    assert stream.stats(2.0)["captured"] == 2
+
+
+def test_every_stream_is_processed_with_a_shared_worker():
+    results = []
+    scheduler = _scheduler(["a", "b", "c"], on_result=lambda name, landmarks, result: results.append(name))
+    _start_workers(scheduler)
+    try:
+        for round_index in range(4):
+            for stream in scheduler.streams:
+                scheduler._offer(stream, _frame(), time.time())
+            _wait_idle(scheduler)
+    finally:
+        scheduler.stop()
+
+    stats = scheduler.stats()
+    assert all(stats[name]["processed"] + stats[name]["dropped"] == 4 for name in "abc")
+    assert all(stats[name]["processed"] >= 1 for name in "abc")
+    assert sorted(set(results)) == ["a", "b", "c"]
+    assert all(stream.pose.closed for stream in scheduler.streams)
+
+
+def test_worker_survives_a_failing_frame_and_records_the_error():
+    failing, healthy = StubPose(fail_on={1}), StubPose()
+    results = []
+    scheduler = _scheduler(["a", "b"], poses=[failing, healthy],
+                           on_result=lambda name, landmarks, result: results.append(name))
+    _start_workers(scheduler)
+    try:
+        for round_index in range(2):
+            for stream in scheduler.streams:
+                scheduler._offer(stream, _frame(), time.time())
+                _wait_idle(scheduler)
+    finally:
+        scheduler.stop()
+
+    stats = scheduler.stats()
+    assert stats["a"]["failed"] == 1 and stats["a"]["error"] == "RuntimeError: falha na inferência"
+    assert stats["a"]["processed"] == 2 and stats["b"]["failed"] == 0 and stats["b"]["error"] is None
+    # O worker continuou vivo: o frame seguinte da fonte com falha também foi analisado
+    assert results == ["b", "a", "b"]
@@ -0,0 +1,29 @@
+from benchmarks.sequences import LandmarkList, Point, LEFT_SHOULDER, LEFT_WRIST, NUM_LANDMARKS
+from keyframes import KeyframeScheduler
+from pose_landmarks import PoseLandmark
+
+
+def _pose(wrist_y, ankle_y):
+    points = [Point(0.5, 0.5) for _ in range(NUM_LANDMARKS)]
+    points[LEFT_WRIST] = Point(0.4, wrist_y)
+    points[PoseLandmark.LEFT_ANKLE] = Point(0.45, ankle_y)
+    return LandmarkList(points)
+
+
+def _interval(scheduler):
+    # Braço parado e tornozelo oscilando 0.1 por keyframe
+    for index in range(4):
+        scheduler.add_keyframe(_pose(0.3, 0.9 + 0.1 * (index % 2)), index / 30)
+    return scheduler.interval
+
+
+def test_motion_of_unused_landmarks_does_not_force_inference():
+    assert _interval(KeyframeScheduler(max_interval=4)) == 1
+    assert _interval(KeyframeScheduler(max_interval=4, landmarks=(LEFT_SHOULDER, PoseLandmark.LEFT_WRIST))) == 4
+
+
+def test_motion_of_required_landmarks_still_shortens_the_interval():
+    scheduler = KeyframeScheduler(max_interval=4, landmarks=(LEFT_SHOULDER, LEFT_WRIST))
+    for index in range(4):
+        scheduler.add_keyframe(_pose(0.3 + 0.1 * (index % 2), 0.9), index / 30)
+    assert scheduler.interval == 1
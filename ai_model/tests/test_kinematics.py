@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from benchmarks.sequences import Point, LandmarkList
+from kinematics import joint_angles_3d, landmarks_to_array
+
+JOINT = ((0, 1, 2),)
+
+
+def _angle(first, second):
+    return joint_angles_3d(np.array([first, (0.0, 0.0, 0.0), second], dtype=np.float64), JOINT)[0]
+
+
+@pytest.mark.parametrize("degrees", [0.0, 1e-4, 0.01, 45.0, 90.0, 135.0, 179.99, 180.0 - 1e-4, 180.0])
+def test_joint_angles_3d_is_accurate_across_the_range(degrees):
+    radians = np.radians(degrees)
+    # Vetores de tamanhos diferentes, fora dos planos dos eixos
+    first = np.array([1.0, 0.0, 0.0])
+    second = 0.3 * np.array([np.cos(radians), np.sin(radians) / np.sqrt(2), np.sin(radians) / np.sqrt(2)])
+    assert _angle(first, second) == pytest.approx(degrees, abs=1e-9)
+
+
+def test_joint_angles_3d_near_collinear_points_beats_arccos():
+    # Com 1e-9 rad o cosseno arredonda para 1 e arccos devolve 0; atan2 mantém o ângulo
+    tiny = 1e-9
+    first, second = np.array([1.0, 0.0, 0.0]), np.array([np.cos(tiny), np.sin(tiny), 0.0])
+    assert np.degrees(np.arccos(np.dot(first, second))) == 0.0
+    assert _angle(first, second) == pytest.approx(np.degrees(tiny), rel=1e-6)
+    assert _angle(first, -second) == pytest.approx(180.0 - np.degrees(tiny), abs=1e-12)
+
+
+def test_joint_angles_3d_accepts_a_batch_of_frames():
+    frames = np.array([
+        [(1, 0, 0), (0, 0, 0), (0, 1, 0), (0, 0, 1)],
+        [(1, 0, 0), (0, 0, 0), (-1, 0, 0), (1, 1, 0)],
+    ], dtype=np.float64)
+    angles = joint_angles_3d(frames, ((0, 1, 2), (0, 1, 3), (2, 1, 3)))
+    assert angles.shape == (2, 3)
+    np.testing.assert_allclose(angles, [[90, 90, 90], [180, 45, 135]])
+
+
+def test_landmarks_to_array_selects_indices():
+    landmarks = LandmarkList([Point(index, index + 0.5, -index) for index in range(5)])
+    assert landmarks_to_array(landmarks).shape == (5, 3)
+    assert landmarks_to_array(landmarks, (3, 1)).tolist() == [[3, 3.5, -3], [1, 1.5, -1]]
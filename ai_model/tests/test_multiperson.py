@@ -0,0 +1,112 @@
+import numpy as np
+
+from multiperson import MultiPersonSession, PersonTracker, Track
+
+
+class StubPose:
+    def __init__(self):
+        self.resets = 0
+        self.closed = False
+
+    def reset(self):
+        self.resets += 1
+
+    def close(self):
+        self.closed = True
+
+
+class ScriptedDetector:
+    """
+    Devolve, a cada chamada, a próxima lista de caixas do roteiro.
+    """
+
+    def __init__(self, script):
+        self.script = list(script)
+
+    def detect(self, frame_rgb):
+        return self.script.pop(0)
+
+
+def _track(track_id, box):
+    return Track(track_id, box, StubPose(), None, now=0.0)
+
+
+def _session(script, **options):
+    created = []
+
+    def pose_factory():
+        created.append(StubPose())
+        return created[-1]
+
+    session = MultiPersonSession(pose_factory, "nao_registrado", detector=ScriptedDetector(script), **options)
+    return session, created
+
+
+FRAME = np.zeros((10, 10, 3), dtype=np.uint8)
+
+
+def test_match_pairs_by_iou_and_reports_unmatched():
+    tracker = PersonTracker()
+    left, right = _track(1, (0, 0, 100, 200)), _track(2, (300, 0, 400, 200))
+    detections = [(305, 5, 405, 205), (0, 0, 98, 198), (700, 0, 800, 200)]
+
+    pairs, new_boxes, lost = tracker.match([left, right], detections)
+
+    assert [(track.track_id, box) for track, box in pairs] == [(1, (0, 0, 98, 198)), (2, (305, 5, 405, 205))]
+    assert new_boxes == [(700, 0, 800, 200)]
+    assert lost == []
+
+
+def test_match_falls_back_to_centroid_distance_without_overlap():
+    tracker = PersonTracker()
+    # Caixa dos landmarks (justa) dentro da caixa do detector (folgada): IoU abaixo do limite
+    track = _track(1, (140, 40, 160, 160))
+    near, far = (100, 0, 200, 200), (600, 0, 700, 200)
+
+    pairs, new_boxes, lost = tracker.match([track], [far, near])
+
+    assert [(paired.track_id, box) for paired, box in pairs] == [(1, near)]
+    assert new_boxes == [far] and lost == []
+
+
+def test_match_leaves_distant_tracks_unmatched():
+    tracker = PersonTracker()
+    track = _track(1, (0, 0, 100, 200))
+
+    pairs, new_boxes, lost = tracker.match([track], [(500, 0, 600, 200)])
+
+    assert pairs == [] and new_boxes == [(500, 0, 600, 200)] and lost == [track]
+    assert tracker.match([], [(0, 0, 1, 1)]) == ([], [(0, 0, 1, 1)], [])
+
+
+def test_merge_duplicates_keeps_the_oldest_track():
+    session, created = _session([[(0, 0, 100, 200), (2, 2, 101, 201), (300, 0, 400, 200)]])
+    try:
+        session._detect(FRAME, now=0.0)
+        assert [track.track_id for track in session.tracks] == [1, 2, 3]
+
+        session._merge_duplicates()
+
+        assert [track.track_id for track in session.tracks] == [1, 3]
+        assert session._free_poses == [created[1]]
+    finally:
+        session.close()
+
+
+def test_pooled_pose_is_reset_before_serving_a_new_track():
+    session, created = _session(
+        [[(0, 0, 100, 200)], [], [], [(500, 0, 600, 200)]], tracker=PersonTracker(max_missed=1))
+    try:
+        session._detect(FRAME, now=0.0)
+        session._detect(FRAME, now=1.0)
+        session._detect(FRAME, now=2.0)
+        assert session.tracks == [] and session._free_poses == created
+
+        session._detect(FRAME, now=3.0)
+
+        [track] = session.tracks
+        assert track.track_id == 2 and track.pose is created[0]
+        assert len(created) == 1 and created[0].resets == 1
+    finally:
+        session.close()
+    assert created[0].closed
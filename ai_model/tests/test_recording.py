@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+import replay
+from benchmarks.sequences import synthetic_shoulder_press, world_landmarks
+from recording import ANALYSIS_COLUMNS, SessionRecorder, SessionRecording
+
+
+def _result(index):
+    return {
+        "feedback": f"feedback {index % 2}", "phase": "Fase A" if index % 3 else "Fase B",
+        "elbow_angle": 90.0 + index, "shoulder_angle": None, "torso_angle": 90.0,
+        "angular_velocity": 1.5, "symmetry": True, "stability": index % 2 == 0, "total_repetitions": index // 4,
+    }
+
+
+def test_round_trip_across_chunks(tmp_path):
+    sequence = synthetic_shoulder_press(frames=10)
+    path = str(tmp_path / "sessao.fmrec")
+    with SessionRecorder(path, metadata={"exercise_type": "shoulder_press"}, chunk_frames=4) as recorder:
+        for index, (timestamp, landmarks) in enumerate(sequence):
+            recorder.append(timestamp, landmarks, _result(index) if index % 2 else None)
+
+    recording = SessionRecording(path)
+    assert len(recording) == 10 and [len(chunk) for chunk in recording.chunks] == [4, 4, 2]
+    assert recording.metadata == {"exercise_type": "shoulder_press"} and not recording.has_world
+
+    for index, (timestamp, landmarks) in enumerate(sequence):
+        recorded_time, recorded = recording.frame(index)
+        assert recorded_time == timestamp
+        expected = np.array([(p.x, p.y, p.z, p.visibility) for p in landmarks.landmark], dtype=np.float32)
+        assert np.array_equal(recording.landmarks(index, index + 1)[0], expected)
+        assert [point.y for point in recorded.landmark] == pytest.approx(expected[:, 1].tolist())
+        assert recording.world_frame(index) is None
+
+        result = recording.result(index)
+        if index % 2 == 0:
+            assert result is None
+            continue
+        original = _result(index)
+        assert result["phase"] == original["phase"] and result["feedback"] == original["feedback"]
+        assert result["shoulder_angle"] is None
+        assert result["elbow_angle"] == pytest.approx(original["elbow_angle"])
+        assert result["stability"] == float(original["stability"])
+
+    # Landmarks de blocos diferentes são concatenados
+    assert recording.landmarks(2, 7).shape == (5, 33, 4)
+    assert np.isnan(recording.column("elbow_angle")[0]) and recording.column("phase")[0] == -1
+    assert recording.column("timestamps").tolist() == [timestamp for timestamp, _ in sequence]
+    assert len(ANALYSIS_COLUMNS) == recording.chunks[0].analysis.shape[1]
+
+
+def test_world_landmarks_round_trip(tmp_path):
+    sequence = synthetic_shoulder_press(frames=6)
+    path = str(tmp_path / "world.fmrec")
+    with SessionRecorder(path, world=True, chunk_frames=4) as recorder:
+        for index, (timestamp, landmarks) in enumerate(sequence):
+            recorder.append(timestamp, landmarks, world_landmarks=world_landmarks(landmarks) if index != 3 else None)
+
+    recording = SessionRecording(path)
+    assert recording.has_world
+    assert recording.world_frame(3) is None
+    expected = world_landmarks(sequence[5][1]).landmark
+    assert [point.x for point in recording.world_frame(5).landmark] == pytest.approx(
+        [point.x for point in expected], abs=1e-6)
+
+
+def test_replay_of_world_sessions_uses_the_recorded_world_landmarks(tmp_path):
+    sequence = synthetic_shoulder_press()
+    metadata = {"exercise_type": "shoulder_press", "kinematics": "world", "frame_width": 1280, "frame_height": 720}
+    world_path = str(tmp_path / "world.fmrec")
+    with SessionRecorder(world_path, metadata=metadata, world=True) as recorder:
+        for timestamp, landmarks in sequence:
+            recorder.append(timestamp, landmarks, world_landmarks=world_landmarks(landmarks))
+    # World landmarks parados na posição inicial: só a análise em 3D deixa de contar repetições
+    still_path = str(tmp_path / "world_parado.fmrec")
+    with SessionRecorder(still_path, metadata=metadata, world=True) as recorder:
+        for timestamp, landmarks in sequence:
+            recorder.append(timestamp, landmarks, world_landmarks=world_landmarks(sequence[0][1]))
+    flat_path = str(tmp_path / "sem_world.fmrec")
+    with SessionRecorder(flat_path, metadata=metadata) as recorder:
+        for timestamp, landmarks in sequence:
+            recorder.append(timestamp, landmarks)
+
+    result = replay.replay_recording(world_path)
+    assert result["events"][-1][3] == 3
+    assert replay.replay_recording(still_path)["events"][-1][3] == 0
+    with pytest.raises(ValueError, match="world"):
+        replay.replay_recording(flat_path)
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+import replay
+from benchmarks.sequences import synthetic_shoulder_press
+from recording import SessionRecorder
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+
+
+def _record(path, sequence, exercise_type="shoulder_press"):
+    metadata = {"exercise_type": exercise_type, "frame_width": 1280, "frame_height": 720}
+    with SessionRecorder(str(path), metadata=metadata, chunk_frames=256) as recorder:
+        for timestamp, landmarks in sequence:
+            recorder.append(timestamp, landmarks)
+    return str(path)
+
+
+@pytest.fixture
+def recordings(tmp_path):
+    _record(tmp_path / "synthetic_shoulder_press.fmrec", synthetic_shoulder_press())
+    return tmp_path
+
+
+def test_synthetic_session_matches_golden(recordings, capsys):
+    assert replay.main([str(recordings), "--golden", GOLDEN_DIR, "--workers", "1"]) == 0
+    assert "1/1 gravações iguais à referência" in capsys.readouterr().out
+
+
+def test_synthetic_session_completes_every_repetition(recordings):
+    result = replay.replay_recording(str(recordings / "synthetic_shoulder_press.fmrec"))
+
+    assert result["frames"] == 600
+    assert [event[3] for event in result["events"]][-1] == 3
+    assert sum(event[2].startswith("Repetição") for event in result["events"]) == 3
+
+
+@pytest.mark.parametrize("feedback_interval", [0.0, 1 / 30, 1.0])
+def test_cosine_thresholds_give_the_same_events_as_angles(recordings, feedback_interval):
+    path = str(recordings / "synthetic_shoulder_press.fmrec")
+    angles = replay.replay_recording(path, feedback_interval=feedback_interval, thresholds="angles")
+    cosine = replay.replay_recording(path, feedback_interval=feedback_interval, thresholds="cosine")
+
+    assert angles["events"][-1][3] == 3
+    assert cosine["events"] == angles["events"]
+
+
+def test_only_analyzed_frames_are_materialized(tmp_path, monkeypatch):
+    sequence = synthetic_shoulder_press(frames=90)
+    # Cotovelo esquerdo oculto no segundo 1: a análise passa para o primeiro frame visível seguinte
+    for _, landmarks in sequence[30:33]:
+        landmarks.landmark[13].visibility = 0.1
+    path = _record(tmp_path / "oculto.fmrec", sequence)
+
+    built = []
+    original = replay.RecordedLandmarks
+    monkeypatch.setattr(replay, "RecordedLandmarks", lambda values: built.append(1) or original(values))
+    result = replay.replay_recording(path)
+
+    assert [event[0] for event in result["events"]] == [pytest.approx(1.1), pytest.approx(2.1)]
+    assert len(built) == result["analyzed"] == 2
+
+
+def test_diff_events_reports_changed_and_missing_events():
+    expected = [[1.0, "A", "ok", 0], [2.0, "B", "ok", 1]]
+    actual = [[1.0, "A", "ok", 0], [2.0, "B", "outro", 1], [3.0, "A", "ok", 1]]
+
+    assert replay.diff_events(expected, expected) == []
+    assert replay.diff_events(expected, actual) == [
+        "    evento 1: esperado [2.0, 'B', 'ok', 1], obtido [2.0, 'B', 'outro', 1]",
+        "    evento 2: esperado None, obtido [3.0, 'A', 'ok', 1]",
+    ]
+    assert replay.diff_events([], actual, limit=2)[-1] == "    ..."
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from benchmarks.sequences import Point, LandmarkList, synthetic_shoulder_press
+from exercises.shoulder_press import PHASE_RULES, WORLD_POINTS
+from thresholds import AngleRule, compile_rules, evaluate_rules, evaluate_rules_frame, landmark_pixels
+from utils import calculate_angle
+
+RULES = {
+    "flexed": AngleRule((0, 1, 2), 0, 100),
+    "extended": AngleRule((0, 1, 2), 160, 180),
+    "aligned": AngleRule((3, 0, 1), 85, 95),
+    "stable": AngleRule((3, 0, 4), 85, 95),
+}
+
+
+def _expected(points):
+    """
+    Decisão das regras com os ângulos de utils.calculate_angle, que podem passar de 180 graus.
+    """
+    landmarks = [Point(x, y) for x, y in points]
+    decisions = []
+    for rule in RULES.values():
+        a, b, c = (landmarks[index] for index in rule.joint)
+        decisions.append(rule.lower <= calculate_angle(a, b, c) <= rule.upper)
+    return tuple(decisions)
+
+
+def test_compile_rules_rejects_invalid_ranges():
+    with pytest.raises(ValueError):
+        compile_rules({"invalida": AngleRule((0, 1, 2), 100, 90)})
+    with pytest.raises(ValueError):
+        compile_rules({"invalida": AngleRule((0, 1, 2), 0, 190)})
+    assert compile_rules(RULES).names == tuple(RULES)
+
+
+def test_cosine_rules_match_the_angle_convention_on_random_points():
+    rules = compile_rules(RULES)
+    rng = np.random.default_rng(7)
+    frames = rng.uniform(0, 1000, size=(2000, 5, 2))
+
+    batch = evaluate_rules(frames, rules)
+
+    assert batch.shape == (2000, len(RULES))
+    for points, decisions in zip(frames.tolist(), batch.tolist()):
+        expected = _expected(points)
+        assert tuple(decisions) == expected
+        assert evaluate_rules_frame(points, rules) == expected
+
+
+@pytest.mark.parametrize("degrees", [84.9, 85.1, 94.9, 95.1, 99.9, 100.1, 159.9, 160.1, 179.9])
+def test_cosine_rules_at_the_range_bounds(degrees):
+    rules = compile_rules(RULES)
+    radians = np.radians(degrees)
+    # Cotovelo em 1 com o ombro em 0; o ângulo vai no sentido que calculate_angle mede até 180 graus
+    points = [(0.0, 0.0), (100.0, 0.0), (100.0 - 80 * np.cos(radians), 80 * np.sin(radians)), (0.0, 50.0), (60.0, 0.0)]
+    expected = _expected(points)
+    assert evaluate_rules_frame(points, rules) == expected
+    assert tuple(evaluate_rules(np.array(points), rules).tolist()) == expected
+
+
+def test_angles_past_half_turn_do_not_pass():
+    # Vetores a ~90.6 graus, mas calculate_angle mede ~269.4 (atan2 dá a volta): a regra não passa
+    points = [(0.0, 0.0), (1.0, 0.0), (2.0, 0.0), (0.0, 100.0), (-100.0, -1.0)]
+    assert calculate_angle(Point(0, 100), Point(0, 0), Point(-100, -1)) == pytest.approx(269.43, abs=0.01)
+    rules = compile_rules(RULES)
+    stable = rules.names.index("stable")
+    assert not evaluate_rules_frame(points, rules)[stable]
+    assert not evaluate_rules(np.array(points), rules)[stable]
+
+    # Espelhado na horizontal, sem dar a volta, o ângulo medido é ~90.6 e a regra passa
+    points[4] = (100.0, -1.0)
+    assert evaluate_rules_frame(points, rules)[stable]
+    assert evaluate_rules(np.array(points), rules)[stable]
+
+
+def test_landmark_pixels_scales_by_frame_size():
+    landmarks = LandmarkList([Point(0.5, 0.25), Point(1.0, 1.0)])
+    assert landmark_pixels(landmarks, (1, 0), 1280, 720) == [(1280, 720), (640, 180)]
+    assert landmark_pixels(landmarks, (0,), None, None) == [(0.5, 0.25)]
+
+
+def test_shoulder_press_phase_rules_batch_matches_each_frame():
+    # Lote montado como no benchmark: landmark_pixels de cada frame empilhados com np.array
+    sequence = synthetic_shoulder_press(frames=120)
+    frames = [landmark_pixels(landmarks, WORLD_POINTS, 1280, 720) for _, landmarks in sequence]
+
+    batch = evaluate_rules(np.array(frames), PHASE_RULES)
+
+    assert batch.shape == (len(frames), len(PHASE_RULES.names))
+    assert [tuple(row) for row in batch.tolist()] == [evaluate_rules_frame(points, PHASE_RULES) for points in frames]
+    # A sequência passa pelas duas extremidades do cotovelo
+    elbow_flexed = PHASE_RULES.names.index("elbow_flexed")
+    elbow_extended = PHASE_RULES.names.index("elbow_extended")
+    assert batch[:, elbow_flexed].any() and batch[:, elbow_extended].any()
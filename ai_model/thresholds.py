@@ -0,0 +1,122 @@
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+# Modos de avaliação das regras de fase: ângulos exatos (atan2) ou limites pré-compilados em cossenos
+THRESHOLDS_ANGLES = "angles"
+THRESHOLDS_COSINE = "cosine"
+THRESHOLDS_MODES = (THRESHOLDS_ANGLES, THRESHOLDS_COSINE)
+
+
+class AngleRule(NamedTuple):
+    """
+    Regra "o ângulo em b do trio (a, b, c) está entre lower e upper graus", com 0 <= lower <= upper <= 180.
+    a, b e c são posições no array de pontos avaliado, não índices do Mediapipe.
+    """
+    joint: tuple
+    lower: float
+    upper: float
+
+
+class CompiledRules(NamedTuple):
+    """
+    Regras pré-compiladas: índices dos trios e limites do cosseno de cada regra, na ordem de `names`.
+    """
+    names: tuple
+    first: np.ndarray
+    vertex: np.ndarray
+    last: np.ndarray
+    cos_min: np.ndarray
+    cos_max: np.ndarray
+    frame_rules: tuple  # (a, b, c, cos_min, cos_max) em tipos Python, para evaluate_rules_frame
+
+
+def compile_rules(rules):
+    """
+    Compila um dicionário nome -> AngleRule. Como o cosseno é decrescente em [0, 180] graus,
+    a faixa [lower, upper] vira cos(upper) <= cos <= cos(lower); as funções trigonométricas
+    só são chamadas aqui, uma vez por regra.
+    """
+    for name, rule in rules.items():
+        if not 0 <= rule.lower <= rule.upper <= 180:
+            raise ValueError(f"Faixa de ângulo inválida na regra {name}: {rule.lower}-{rule.upper}")
+    joints = np.array([rule.joint for rule in rules.values()], dtype=np.intp).reshape(len(rules), 3)
+    cos_min = [math.cos(math.radians(rule.upper)) for rule in rules.values()]
+    cos_max = [math.cos(math.radians(rule.lower)) for rule in rules.values()]
+    return CompiledRules(
+        names=tuple(rules),
+        first=joints[:, 0],
+        vertex=joints[:, 1],
+        last=joints[:, 2],
+        cos_min=np.array(cos_min),
+        cos_max=np.array(cos_max),
+        frame_rules=tuple(
+            (*map(int, rule.joint), low, high) for rule, low, high in zip(rules.values(), cos_min, cos_max)
+        ),
+    )
+
+
+def _pseudo_angle(x, y):
+    """
+    Substituto monotônico de atan2(y, x) em [-2, 2], sem funções trigonométricas.
+    """
+    ratio = x / np.maximum(np.abs(x) + np.abs(y), 1e-12)
+    return np.copysign(1 - ratio, y)
+
+
+def evaluate_rules(points, rules):
+    """
+    Avalia as regras compiladas sobre pontos em pixels (..., n, 2): um frame (n, 2) ou vários frames
+    ou sessões (sessões, n, 2) em uma única chamada. Retorna um array booleano (..., regras).
+
+    Segue a convenção de utils.calculate_angle, que devolve |atan2(c - b) - atan2(a - b)| e pode
+    passar de 180 graus: a regra exige cos dentro dos limites e que esse valor não passe de 180,
+    o que se decide pelo sinal do produto vetorial e pela ordem dos pseudo-ângulos dos vetores.
+    """
+    first = points[..., rules.first, :] - points[..., rules.vertex, :]
+    second = points[..., rules.last, :] - points[..., rules.vertex, :]
+    fx, fy, sx, sy = first[..., 0], first[..., 1], second[..., 0], second[..., 1]
+    dot = fx * sx + fy * sy
+    cross = fx * sy - fy * sx
+    norms = np.sqrt((fx * fx + fy * fy) * (sx * sx + sy * sy))
+    # sen da diferença de ângulos com o sinal de (atan2(segundo) - atan2(primeiro))
+    turn = np.sign(_pseudo_angle(sx, sy) - _pseudo_angle(fx, fy))
+    within_half_turn = turn * cross >= 0
+    return within_half_turn & (dot >= rules.cos_min * norms) & (dot <= rules.cos_max * norms)
+
+
+def evaluate_rules_frame(points, rules):
+    """
+    Mesma decisão de evaluate_rules para um único frame, com `points` uma sequência de (x, y).
+    Em Python puro: para um frame só, o custo fixo das chamadas do NumPy supera o da conta.
+    Retorna uma tupla de booleanos na ordem de rules.names.
+    """
+    results = []
+    for first, vertex, last, cos_min, cos_max in rules.frame_rules:
+        bx, by = points[vertex]
+        fx, fy = points[first][0] - bx, points[first][1] - by
+        sx, sy = points[last][0] - bx, points[last][1] - by
+        dot = fx * sx + fy * sy
+        cross = fx * sy - fy * sx
+        norms = math.sqrt((fx * fx + fy * fy) * (sx * sx + sy * sy))
+        turn = _pseudo_angle_scalar(sx, sy) - _pseudo_angle_scalar(fx, fy)
+        within_half_turn = cross == 0 or (turn > 0) == (cross > 0) or turn == 0
+        results.append(within_half_turn and cos_min * norms <= dot <= cos_max * norms)
+    return tuple(results)
+
+
+def _pseudo_angle_scalar(x, y):
+    return math.copysign(1 - x / max(abs(x) + abs(y), 1e-12), y)
+
+
+def landmark_pixels(landmarks, indices, frame_width, frame_height):
+    """
+    Lista de tuplas (x, y) com as coordenadas dos landmarks `indices`, em pixels quando as dimensões do
+    frame são informadas (como em utils.normalize_coordinates), para evaluate_rules_frame. Para
+    evaluate_rules, empilhe as listas de vários frames com np.array.
+    """
+    points = landmarks.landmark
+    if not (frame_width and frame_height):
+        frame_width = frame_height = 1
+    return [(points[index].x * frame_width, points[index].y * frame_height) for index in indices]
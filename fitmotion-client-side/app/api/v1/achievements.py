@@ -7,13 +7,14 @@ from app.schemas.achievement import (
 )
 from app.services.achievement_service import AchievementService
 from app.core.middleware.auth import firebase_auth
+from app.core.container import get_achievement_service
 
 router = APIRouter(prefix="/achievements", tags=["Achievements"])
-achievement_service = AchievementService()
 
 @router.get("/check", response_model=List[Achievement])
 async def check_achievements(
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    achievement_service: AchievementService = Depends(get_achievement_service)
 ):
     """
     Check and unlock new achievements for the user.
@@ -22,7 +23,8 @@ async def check_achievements(
 
 @router.get("/progress", response_model=UserAchievementProgress)
 async def get_achievement_progress(
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    achievement_service: AchievementService = Depends(get_achievement_service)
 ):
     """
     Get user's achievement progress.
@@ -32,7 +34,8 @@ async def get_achievement_progress(
 @router.get("/leaderboard")
 async def get_leaderboard(
     limit: int = 10,
-    _: dict = Depends(firebase_auth)
+    _: dict = Depends(firebase_auth),
+    achievement_service: AchievementService = Depends(get_achievement_service)
 ):
     """
     Get achievement leaderboard.
@@ -42,7 +45,8 @@ async def get_leaderboard(
 @router.get("/available", response_model=List[Achievement])
 async def get_available_achievements(
     type: Optional[str] = None,
-    _: dict = Depends(firebase_auth)
+    _: dict = Depends(firebase_auth),
+    achievement_service: AchievementService = Depends(get_achievement_service)
 ):
     """
     Get list of available achievements.
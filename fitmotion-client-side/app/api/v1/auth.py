@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from firebase_admin import auth
+from app.core.config.firebase import get_auth_client
 from app.schemas.auth import (
     UserCreate,
     UserLogin,
@@ -9,12 +9,12 @@ from app.schemas.auth import (
 )
 from app.services.auth_service import AuthService
 from app.core.middleware.auth import firebase_auth
+from app.core.container import get_auth_service
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
-auth_service = AuthService()
 
 @router.post("/register", response_model=FirebaseAuthResponse)
-async def register(user_data: UserCreate):
+async def register(user_data: UserCreate, auth_service: AuthService = Depends(get_auth_service)):
     """
     Register a new user with email and password.
     Returns Firebase authentication tokens.
@@ -22,7 +22,7 @@ async def register(user_data: UserCreate):
     return await auth_service.create_user(user_data)
 
 @router.post("/login", response_model=FirebaseAuthResponse)
-async def login(credentials: UserLogin):
+async def login(credentials: UserLogin, auth_service: AuthService = Depends(get_auth_service)):
     """
     Login with email and password.
     Returns Firebase authentication tokens.
@@ -30,7 +30,7 @@ async def login(credentials: UserLogin):
     return await auth_service.login_user(credentials)
 
 @router.post("/reset-password")
-async def reset_password(reset_data: PasswordReset):
+async def reset_password(reset_data: PasswordReset, auth_service: AuthService = Depends(get_auth_service)):
     """
     Send password reset email.
     """
@@ -43,7 +43,7 @@ async def get_current_user(user_data: dict = Depends(firebase_auth)):
     Requires Firebase ID token in Authorization header.
     """
     try:
-        user = auth.get_user(user_data['uid'])
+        user = get_auth_client().get_user(user_data['uid'])
         return UserResponse(
             uid=user.uid,
             email=user.email,
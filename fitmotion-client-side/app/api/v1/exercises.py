@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from typing import List, Optional
+from pydantic import TypeAdapter
 from app.schemas.exercise import (
     ExerciseCreate,
     ExerciseUpdate,
@@ -7,14 +8,18 @@ from app.schemas.exercise import (
 )
 from app.services.exercise_service import ExerciseService
 from app.core.middleware.auth import firebase_auth
+from app.core.container import get_exercise_service
+from app.core.http_cache import conditional_response
 
 router = APIRouter(prefix="/exercises", tags=["Exercises"])
-exercise_service = ExerciseService()
+exercise_adapter = TypeAdapter(ExerciseResponse)
+exercise_list_adapter = TypeAdapter(List[ExerciseResponse])
 
 @router.post("/", response_model=ExerciseResponse)
 async def create_exercise(
     exercise: ExerciseCreate,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    exercise_service: ExerciseService = Depends(get_exercise_service)
 ):
     """
     Create a new exercise.
@@ -29,37 +34,46 @@ async def create_exercise(
 
 @router.get("/", response_model=List[ExerciseResponse])
 async def list_exercises(
+    request: Request,
     muscle_group: Optional[str] = None,
     difficulty: Optional[str] = None,
     limit: int = 10,
     offset: int = 0,
-    _: dict = Depends(firebase_auth)
+    _: dict = Depends(firebase_auth),
+    exercise_service: ExerciseService = Depends(get_exercise_service)
 ):
     """
     List exercises with optional filters.
+    Supports If-None-Match: returns 304 when the list has not changed.
     """
-    return await exercise_service.list_exercises(
+    exercises = await exercise_service.list_exercises(
         muscle_group=muscle_group,
         difficulty=difficulty,
         limit=limit,
         offset=offset
     )
+    return conditional_response(request, exercises, exercise_list_adapter)
 
 @router.get("/{exercise_id}", response_model=ExerciseResponse)
 async def get_exercise(
+    request: Request,
     exercise_id: str,
-    _: dict = Depends(firebase_auth)
+    _: dict = Depends(firebase_auth),
+    exercise_service: ExerciseService = Depends(get_exercise_service)
 ):
     """
     Get exercise by ID.
+    Supports If-None-Match: returns 304 when the exercise has not changed.
     """
-    return await exercise_service.get_exercise(exercise_id)
+    exercise = await exercise_service.get_exercise(exercise_id)
+    return conditional_response(request, exercise, exercise_adapter)
 
 @router.put("/{exercise_id}", response_model=ExerciseResponse)
 async def update_exercise(
     exercise_id: str,
     exercise: ExerciseUpdate,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    exercise_service: ExerciseService = Depends(get_exercise_service)
 ):
     """
     Update exercise by ID.
@@ -75,7 +89,8 @@ async def update_exercise(
 @router.delete("/{exercise_id}")
 async def delete_exercise(
     exercise_id: str,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    exercise_service: ExerciseService = Depends(get_exercise_service)
 ):
     """
     Delete exercise by ID.
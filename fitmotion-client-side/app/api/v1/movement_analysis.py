@@ -5,16 +5,16 @@ from app.schemas.movement_analysis import (
     MovementAnalysis,
     ExerciseMetrics
 )
-from app.services.movement_analysis_service import MovementAnalysisService
 from app.core.middleware.auth import firebase_auth
+from app.core.container import get_movement_analysis_service
 
 router = APIRouter(prefix="/movement-analysis", tags=["Movement Analysis"])
-analysis_service = MovementAnalysisService()
 
 @router.post("/analyze", response_model=MovementAnalysis)
 async def analyze_movement(
     request: AnalysisRequest,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    analysis_service = Depends(get_movement_analysis_service)
 ):
     """
     Analyze movement in real-time and provide feedback.
@@ -27,7 +27,8 @@ async def calculate_metrics(
     exercise_id: str,
     duration: float,
     form_analysis: dict,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    analysis_service = Depends(get_movement_analysis_service)
 ):
     """
     Calculate exercise metrics based on the movement analysis.
@@ -37,4 +38,14 @@ async def calculate_metrics(
         exercise_id=exercise_id,
         duration=duration,
         form_analysis=form_analysis
-    )
\ No newline at end of file
+    )
+
+@router.get("/pose-settings")
+async def get_pose_settings(
+    _: dict = Depends(firebase_auth),
+    analysis_service = Depends(get_movement_analysis_service)
+):
+    """
+    Get the pose model complexity and input scale currently chosen by the adaptive controller.
+    """
+    return analysis_service.get_pose_metrics()
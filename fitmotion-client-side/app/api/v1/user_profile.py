@@ -7,12 +7,12 @@ from app.schemas.user_profile import (
 )
 from app.services.user_profile_service import UserProfileService
 from app.core.middleware.auth import firebase_auth
+from app.core.container import get_user_profile_service
 
 router = APIRouter(prefix="/profile", tags=["User Profile"])
-profile_service = UserProfileService()
 
 @router.get("/", response_model=UserProfileResponse)
-async def get_profile(user_data: dict = Depends(firebase_auth)):
+async def get_profile(user_data: dict = Depends(firebase_auth), profile_service: UserProfileService = Depends(get_user_profile_service)):
     """
     Get current user's profile.
     """
@@ -21,7 +21,8 @@ async def get_profile(user_data: dict = Depends(firebase_auth)):
 @router.put("/", response_model=UserProfileResponse)
 async def update_profile(
     profile_data: UserProfileUpdate,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    profile_service: UserProfileService = Depends(get_user_profile_service)
 ):
     """
     Update user's profile information.
@@ -34,7 +35,8 @@ async def update_profile(
 @router.put("/preferences", response_model=UserProfileResponse)
 async def update_preferences(
     preferences: UserPreferences,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    profile_service: UserProfileService = Depends(get_user_profile_service)
 ):
     """
     Update user's preferences.
@@ -47,7 +49,8 @@ async def update_preferences(
 @router.put("/physical-info", response_model=UserProfileResponse)
 async def update_physical_info(
     physical_info: UserPhysicalInfo,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    profile_service: UserProfileService = Depends(get_user_profile_service)
 ):
     """
     Update user's physical information.
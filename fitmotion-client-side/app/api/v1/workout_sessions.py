@@ -10,14 +10,15 @@ from app.schemas.workout_session import (
 )
 from app.services.workout_session_service import WorkoutSessionService
 from app.core.middleware.auth import firebase_auth
+from app.core.container import get_workout_session_service
 
 router = APIRouter(prefix="/workout-sessions", tags=["Workout Sessions"])
-session_service = WorkoutSessionService()
 
 @router.post("/", response_model=WorkoutSessionResponse)
 async def create_session(
     session_data: WorkoutSessionCreate,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    session_service: WorkoutSessionService = Depends(get_workout_session_service)
 ):
     """
     Create a new workout session.
@@ -27,7 +28,8 @@ async def create_session(
 @router.post("/{session_id}/start", response_model=WorkoutSessionResponse)
 async def start_session(
     session_id: str,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    session_service: WorkoutSessionService = Depends(get_workout_session_service)
 ):
     """
     Start a workout session.
@@ -39,7 +41,8 @@ async def complete_exercise(
     session_id: str,
     exercise_id: str,
     set_data: ExerciseSet,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    session_service: WorkoutSessionService = Depends(get_workout_session_service)
 ):
     """
     Record completed exercise set in a session.
@@ -54,7 +57,8 @@ async def complete_exercise(
 @router.post("/{session_id}/complete", response_model=WorkoutSessionResponse)
 async def complete_session(
     session_id: str,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    session_service: WorkoutSessionService = Depends(get_workout_session_service)
 ):
     """
     Complete a workout session.
@@ -63,7 +67,8 @@ async def complete_session(
 
 @router.get("/progress", response_model=dict)
 async def get_user_progress(
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    session_service: WorkoutSessionService = Depends(get_workout_session_service)
 ):
     """
     Get user's overall workout progress.
@@ -77,7 +82,8 @@ async def get_session_history(
     status: Optional[SessionStatus] = None,
     limit: int = 10,
     offset: int = 0,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    session_service: WorkoutSessionService = Depends(get_workout_session_service)
 ):
     """
     Get user's workout session history with optional filters.
@@ -94,7 +100,8 @@ async def get_session_history(
 @router.get("/{session_id}", response_model=WorkoutSessionResponse)
 async def get_session(
     session_id: str,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    session_service: WorkoutSessionService = Depends(get_workout_session_service)
 ):
     """
     Get details of a specific workout session.
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from typing import List, Optional
+from pydantic import TypeAdapter
 from app.schemas.workout import (
     WorkoutCreate,
     WorkoutUpdate,
@@ -7,14 +8,17 @@ from app.schemas.workout import (
 )
 from app.services.workout_service import WorkoutService
 from app.core.middleware.auth import firebase_auth
+from app.core.container import get_workout_service
+from app.core.http_cache import conditional_response
 
 router = APIRouter(prefix="/workouts", tags=["Workouts"])
-workout_service = WorkoutService()
+workout_list_adapter = TypeAdapter(List[WorkoutResponse])
 
 @router.post("/", response_model=WorkoutResponse)
 async def create_workout(
     workout: WorkoutCreate,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    workout_service: WorkoutService = Depends(get_workout_service)
 ):
     """
     Create a new workout.
@@ -29,7 +33,8 @@ async def list_workouts(
     is_public: Optional[bool] = None,
     limit: int = 10,
     offset: int = 0,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    workout_service: WorkoutService = Depends(get_workout_service)
 ):
     """
     List workouts with optional filters.
@@ -46,34 +51,43 @@ async def list_workouts(
 
 @router.get("/featured", response_model=List[WorkoutResponse])
 async def get_featured_workouts(
+    request: Request,
     limit: int = 5,
-    _: dict = Depends(firebase_auth)
+    _: dict = Depends(firebase_auth),
+    workout_service: WorkoutService = Depends(get_workout_service)
 ):
     """
     Get featured workouts.
+    Supports If-None-Match: returns 304 when the list has not changed.
     """
-    return await workout_service.get_featured_workouts(limit)
+    workouts = await workout_service.get_featured_workouts(limit)
+    return conditional_response(request, workouts, workout_list_adapter)
 
 @router.get("/body-area/{body_area}", response_model=List[WorkoutResponse])
 async def get_workouts_by_body_area(
+    request: Request,
     body_area: str,
     difficulty: Optional[str] = None,
     limit: int = 10,
-    _: dict = Depends(firebase_auth)
+    _: dict = Depends(firebase_auth),
+    workout_service: WorkoutService = Depends(get_workout_service)
 ):
     """
     Get workouts by body area.
+    Supports If-None-Match: returns 304 when the list has not changed.
     """
-    return await workout_service.get_workouts_by_body_area(
+    workouts = await workout_service.get_workouts_by_body_area(
         body_area=body_area,
         difficulty=difficulty,
         limit=limit
     )
+    return conditional_response(request, workouts, workout_list_adapter)
 
 @router.get("/{workout_id}", response_model=WorkoutResponse)
 async def get_workout(
     workout_id: str,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    workout_service: WorkoutService = Depends(get_workout_service)
 ):
     """
     Get workout by ID.
@@ -84,7 +98,8 @@ async def get_workout(
 async def update_workout(
     workout_id: str,
     workout: WorkoutUpdate,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    workout_service: WorkoutService = Depends(get_workout_service)
 ):
     """
     Update workout by ID.
@@ -99,7 +114,8 @@ async def update_workout(
 @router.delete("/{workout_id}")
 async def delete_workout(
     workout_id: str,
-    user_data: dict = Depends(firebase_auth)
+    user_data: dict = Depends(firebase_auth),
+    workout_service: WorkoutService = Depends(get_workout_service)
 ):
     """
     Delete workout by ID.
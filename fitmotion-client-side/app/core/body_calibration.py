@@ -0,0 +1,117 @@
+"""
+Proporções corporais do usuário (tronco e membros), medidas nos primeiros segundos de uma sessão e válidas
+enquanto o physical_info do perfil não muda. Com elas os landmarks ficam em unidades de tronco.
+"""
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional
+import numpy as np
+from app.core.pose_landmarks import TORSO_LANDMARKS, torso_length, torso_normalize
+
+# Tronco em unidades da imagem com o corpo inteiro no quadro; usado até o usuário ser calibrado
+TYPICAL_TORSO = 0.3
+
+SEGMENTS = {
+    'shoulder_width': (11, 12),
+    'hip_width': (23, 24),
+    'left_upper_arm': (11, 13),
+    'right_upper_arm': (12, 14),
+    'left_forearm': (13, 15),
+    'right_forearm': (14, 16),
+    'left_thigh': (23, 25),
+    'right_thigh': (24, 26),
+    'left_shin': (25, 27),
+    'right_shin': (26, 28),
+}
+# Landmarks que acompanham a ponta de cada segmento redimensionado; SEGMENTS lista braços e coxas
+# antes de antebraços e canelas, então o ajuste vai do tronco para fora
+DISTAL_LANDMARKS = {
+    13: [13, 15, 17, 19, 21], 15: [15, 17, 19, 21],
+    14: [14, 16, 18, 20, 22], 16: [16, 18, 20, 22],
+    25: [25, 27, 29, 31], 27: [27, 29, 31],
+    26: [26, 28, 30, 32], 28: [28, 30, 32],
+}
+
+def physical_info_key(physical_info: Optional[dict]) -> str:
+    """Impressão estável de user_profiles.physical_info"""
+    encoded = json.dumps(physical_info or {}, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode()).hexdigest()
+
+@dataclass
+class BodyCalibration:
+    torso: float  # centro dos ombros ao centro do quadril, em unidades da imagem
+    segments: Dict[str, float] = field(default_factory=dict)  # comprimentos em troncos
+    frames: int = 0
+    physical_info_key: str = ''
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BodyCalibration':
+        return cls(
+            torso=float(data['torso']),
+            segments={name: float(length) for name, length in (data.get('segments') or {}).items()},
+            frames=int(data.get('frames', 0)),
+            physical_info_key=data.get('physical_info_key', '')
+        )
+
+    def normalize(self, landmarks: np.ndarray) -> np.ndarray:
+        """Landmarks (n, 33, 4) -> mesmo formato, com x/y/z relativos ao quadril em unidades de tronco"""
+        normalized = np.array(landmarks, dtype=np.float32)
+        normalized[:, :, :3] = torso_normalize(normalized[:, :, :3], self.torso)
+        return normalized
+
+    def retarget(self, reference: np.ndarray) -> np.ndarray:
+        """
+        Poses de referência (..., 33, 3) em troncos -> as mesmas poses com cada membro no comprimento do
+        usuário, mantendo a direção, para que proporções diferentes do modelo não contem como erro de forma.
+        O comprimento do modelo é a mediana entre as poses (ex.: os keyframes de um exercício)
+        """
+        retargeted = np.array(reference, dtype=np.float32)
+        poses = retargeted.reshape(-1, *retargeted.shape[-2:])
+        for name, (start, end) in SEGMENTS.items():
+            if name not in self.segments or end not in DISTAL_LANDMARKS:
+                continue
+            vector = poses[:, end] - poses[:, start]
+            model_length = float(np.median(np.linalg.norm(vector[:, :2], axis=1)))
+            if model_length <= 1e-6:
+                continue
+            poses[:, DISTAL_LANDMARKS[end]] += (vector * (self.segments[name] / model_length - 1))[:, None, :]
+        return poses.reshape(retargeted.shape)
+
+def normalize_reference(points: np.ndarray) -> np.ndarray:
+    """Pose de referência (33, 3) (ex.: keyframe de exercício) nos próprios troncos, centrada no quadril"""
+    return torso_normalize(points)
+
+def calibrate(
+    landmarks: np.ndarray,
+    physical_info: Optional[dict] = None,
+    min_visibility: float = 0.5,
+    min_frames: int = 10
+) -> Optional[BodyCalibration]:
+    """Calibração a partir de landmarks (n, 33, 4), ou None com o tronco visível em menos de min_frames"""
+    landmarks = np.asarray(landmarks, dtype=np.float64)
+    points, visibility = landmarks[:, :, :2], landmarks[:, :, 3] >= min_visibility
+
+    torso_visible = visibility[:, list(TORSO_LANDMARKS)].all(axis=1)
+    if torso_visible.sum() < min_frames:
+        return None
+    torso = float(np.median(torso_length(points)[torso_visible]))
+    if torso <= 1e-6:
+        return None
+
+    segments = {}
+    for name, (start, end) in SEGMENTS.items():
+        visible = visibility[:, start] & visibility[:, end]
+        if visible.sum() >= min_frames:
+            lengths = np.linalg.norm(points[visible, start] - points[visible, end], axis=1)
+            segments[name] = float(np.median(lengths) / torso)
+
+    return BodyCalibration(
+        torso=torso,
+        segments=segments,
+        frames=int(torso_visible.sum()),
+        physical_info_key=physical_info_key(physical_info)
+    )
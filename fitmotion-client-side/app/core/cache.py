@@ -0,0 +1,85 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from app.core.metrics import CACHE_REQUESTS
+
+def cache_key(name: str, **params) -> Tuple:
+    """Key for a read query: parameter order does not matter and None filters are dropped"""
+    return (name,) + tuple(sorted((key, value) for key, value in params.items() if value is not None))
+
+class CoalescingCache:
+    """
+    Short-TTL read cache with single-flight loading.
+    Concurrent misses for the same key await one shared load instead of each querying Firestore,
+    and the result is reused until it is ttl_seconds old. Failed loads are not cached.
+    Cached values are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float = 5.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._generation = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and self.clock() < entry[0]:
+            self._entries.move_to_end(key)
+            CACHE_REQUESTS.labels(cache=self.name, result='hit').inc()
+            return entry[1]
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            CACHE_REQUESTS.labels(cache=self.name, result='coalesced').inc()
+        else:
+            CACHE_REQUESTS.labels(cache=self.name, result='miss').inc()
+            # Runs as its own task so a cancelled request does not cancel the load for the others
+            task = asyncio.ensure_future(loader())
+            self._in_flight[key] = task
+            generation = self._generation
+            task.add_done_callback(lambda done: self._finish(key, done, generation))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task, generation: int) -> None:
+        current = self._in_flight.get(key) is task
+        if current:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None or self.ttl <= 0:
+            return
+        if generation != self._generation or not current:
+            # Started before an invalidation or a set/discard of the key: the result may predate the write
+            return
+        self._entries[key] = (self.clock() + self.ttl, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value just written, so the next read does not load it back"""
+        self._in_flight.pop(key, None)
+        if self.ttl > 0:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        """Drop one key after a write that affects only it"""
+        self._entries.pop(key, None)
+        self._in_flight.pop(key, None)
+
+    def invalidate(self) -> None:
+        """Drop cached results after a write; later requests do not join loads started before it"""
+        self._generation += 1
+        self._entries.clear()
+        self._in_flight.clear()
@@ -1,13 +1,20 @@
 import firebase_admin
-from firebase_admin import credentials, firestore
+from firebase_admin import credentials, firestore, auth
 from app.core.config.settings import settings
 import json
 
 _firebase_app = None
+_memory_firestore = None
+_memory_auth = None
+
+def use_memory_backend() -> bool:
+    return settings.FIRESTORE_BACKEND == "memory"
 
 def initialize_firebase():
     """Initialize Firebase Admin SDK"""
     global _firebase_app
+    if use_memory_backend():
+        return None
     try:
         # Check if already initialized
         _firebase_app = firebase_admin.get_app()
@@ -20,14 +27,33 @@ def initialize_firebase():
 def get_firebase_app():
     """Get Firebase App instance"""
     global _firebase_app
+    if use_memory_backend():
+        return None
     if not _firebase_app:
         _firebase_app = initialize_firebase()
     return _firebase_app
 
 def get_firestore_client():
     """Get Firestore client instance"""
+    global _memory_firestore
+    if use_memory_backend():
+        if _memory_firestore is None:
+            from app.core.memory_firestore import InMemoryFirestore
+            _memory_firestore = InMemoryFirestore(latency_ms=settings.MEMORY_BACKEND_LATENCY_MS)
+        return _memory_firestore
+
     app = get_firebase_app()
     try:
         return firestore.client(app)
     except Exception as e:
-        raise Exception(f"Failed to get Firestore client: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Failed to get Firestore client: {str(e)}")
+
+def get_auth_client():
+    """Get Firebase Auth module (or the in-memory stand-in)"""
+    global _memory_auth
+    if use_memory_backend():
+        if _memory_auth is None:
+            from app.core.memory_firestore import InMemoryAuth
+            _memory_auth = InMemoryAuth()
+        return _memory_auth
+    return auth
\ No newline at end of file
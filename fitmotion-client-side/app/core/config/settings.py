@@ -13,6 +13,44 @@ class Settings(BaseSettings):
     FIREBASE_API_KEY: str
     FIREBASE_AUTH_DOMAIN: str
     FIREBASE_PROJECT_ID: str
+    # "firebase" uses Google endpoints; "memory" uses the in-process stand-in (load tests, offline runs)
+    FIRESTORE_BACKEND: str = "firebase"
+    MEMORY_BACKEND_LATENCY_MS: float = 0.0
+
+    # Pose inference
+    POSE_MODEL_COMPLEXITY: int = 2
+    POSE_TARGET_LATENCY_MS: float = 50.0
+    # Load MediaPipe in the background at startup; when False it loads on the first analysis request
+    POSE_PRELOAD_MODELS: bool = True
+    # Unix socket of the inference worker (python -m inference.worker); empty runs inference in-process
+    INFERENCE_SOCKET_PATH: str = ""
+    INFERENCE_TIMEOUT_SECONDS: float = 30.0
+
+    # Rep segmentation: range of rep durations searched and the DTW cost (z-normalized, per template step) to accept
+    REP_MIN_SECONDS: float = 0.8
+    REP_MAX_SECONDS: float = 8.0
+    REP_MAX_ALIGNMENT_COST: float = 0.5
+    # Minimum peak-to-peak motion of a rep, in torso lengths once the user is calibrated
+    REP_MIN_RANGE: float = 0.25
+    # The keyframe index is rebuilt after exercise writes in this process and at least this often
+    KEYFRAME_INDEX_TTL_SECONDS: float = 300.0
+    # Body calibration: seconds of a session used to measure the user's proportions, and how long it stays cached
+    BODY_CALIBRATION_SECONDS: float = 3.0
+    BODY_CALIBRATION_TTL_SECONDS: float = 600.0
+    # Exercise recognition when a request has no exercise_id: sliding window, step and accepted distance
+    RECOGNITION_WINDOW_SECONDS: float = 2.0
+    RECOGNITION_STRIDE_SECONDS: float = 0.5
+    RECOGNITION_MAX_DISTANCE: float = 0.25
+
+    # Profiling (opt-in): profiles analyze_movement for a bounded window after startup
+    PROFILING_ENABLED: bool = False
+    PROFILING_WINDOW_SECONDS: float = 60.0
+    PROFILING_OUTPUT_DIR: str = "profiles"
+
+    # Read cache for shared catalog queries (featured/body-area workouts, exercise lists); 0 only coalesces
+    READ_CACHE_TTL_SECONDS: float = 5.0
+    # Client cache lifetime (Cache-Control max-age) for catalog responses; revalidated with ETags after it
+    CATALOG_CACHE_MAX_AGE_SECONDS: int = 60
 
     # Server
     HOST: str = "0.0.0.0"
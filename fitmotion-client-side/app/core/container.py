@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from typing import Optional
+import httpx
+from fastapi import HTTPException, Request, status
+from app.core.config.settings import settings
+from app.core.inference_client import InferenceClient
+from app.services.firebase_service import FirebaseService
+from app.services.exercise_service import ExerciseService
+from app.services.workout_service import WorkoutService
+from app.services.workout_session_service import WorkoutSessionService
+from app.services.achievement_service import AchievementService
+from app.services.user_profile_service import UserProfileService
+from app.services.auth_service import AuthService
+
+logger = logging.getLogger('fitmotion.container')
+
+class ServiceContainer:
+    """
+    Process-wide services built once in the application lifespan.
+    All services share one FirebaseService and one pooled HTTP client. MovementAnalysisService
+    (MediaPipe + TensorFlow) is built in a worker thread by warm_up() so startup does not block on it;
+    without a warm-up it is built on the first analysis request. With INFERENCE_SOCKET_PATH set,
+    inference runs in the separate worker process and no models are loaded in the API.
+    """
+
+    def __init__(self):
+        self.http_client = httpx.AsyncClient(timeout=30)
+        self.firebase = FirebaseService()
+        self.exercise_service = ExerciseService(firebase=self.firebase)
+        self.workout_service = WorkoutService(firebase=self.firebase, exercise_service=self.exercise_service)
+        self.workout_session_service = WorkoutSessionService(
+            firebase=self.firebase,
+            workout_service=self.workout_service
+        )
+        self.achievement_service = AchievementService(firebase=self.firebase)
+        self.user_profile_service = UserProfileService(firebase=self.firebase)
+        self.auth_service = AuthService(firebase=self.firebase, http_client=self.http_client)
+        self._analysis_task: Optional[asyncio.Task] = None
+
+    def _build_movement_analysis_service(self):
+        from app.services.movement_analysis_service import MovementAnalysisService
+
+        if settings.INFERENCE_SOCKET_PATH:
+            return MovementAnalysisService(
+                exercise_service=self.exercise_service,
+                user_profile_service=self.user_profile_service,
+                inference_client=InferenceClient(
+                    settings.INFERENCE_SOCKET_PATH,
+                    timeout=settings.INFERENCE_TIMEOUT_SECONDS
+                )
+            )
+
+        service = MovementAnalysisService(
+            exercise_service=self.exercise_service,
+            user_profile_service=self.user_profile_service
+        )
+        # Loads the starting pose model now instead of on the first request
+        service.pose_detector
+        return service
+
+    def warm_up(self) -> asyncio.Task:
+        """Start loading the analysis models in the background (idempotent; retried after a failure)"""
+        failed = (
+            self._analysis_task is not None and self._analysis_task.done()
+            and (self._analysis_task.cancelled() or self._analysis_task.exception() is not None)
+        )
+        if self._analysis_task is None or failed:
+            self._analysis_task = asyncio.create_task(asyncio.to_thread(self._build_movement_analysis_service))
+            self._analysis_task.add_done_callback(self._log_warm_up)
+        return self._analysis_task
+
+    @staticmethod
+    def _log_warm_up(task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.error('Movement analysis warm-up failed: %s', task.exception())
+        else:
+            logger.info('Movement analysis models loaded')
+
+    async def movement_analysis_service(self):
+        """Wait for the warm-up started at startup and return the shared analysis service"""
+        try:
+            return await asyncio.shield(self.warm_up())
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Movement analysis is unavailable: {str(e)}"
+            )
+
+    async def close(self) -> None:
+        if self._analysis_task is not None and not self._analysis_task.done():
+            self._analysis_task.cancel()
+        await self.http_client.aclose()
+
+def get_container(request: Request) -> ServiceContainer:
+    return request.app.state.services
+
+def get_exercise_service(request: Request) -> ExerciseService:
+    return get_container(request).exercise_service
+
+def get_workout_service(request: Request) -> WorkoutService:
+    return get_container(request).workout_service
+
+def get_workout_session_service(request: Request) -> WorkoutSessionService:
+    return get_container(request).workout_session_service
+
+def get_achievement_service(request: Request) -> AchievementService:
+    return get_container(request).achievement_service
+
+def get_user_profile_service(request: Request) -> UserProfileService:
+    return get_container(request).user_profile_service
+
+def get_auth_service(request: Request) -> AuthService:
+    return get_container(request).auth_service
+
+async def get_movement_analysis_service(request: Request):
+    return await get_container(request).movement_analysis_service()
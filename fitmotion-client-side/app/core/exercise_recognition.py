@@ -0,0 +1,133 @@
+"""
+Reconhecimento do exercício do catálogo pelos movimentos: cada janela de frames é descrita pela média
+e pelo desvio padrão de oito ângulos articulares e vota no exercício de centróide mais próximo.
+"""
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+import numpy as np
+from app.core.pose_landmarks import POSE_LANDMARKS
+from app.core.rep_segmentation import resample
+
+TEMPLATE_SAMPLES = 64
+MIN_VISIBILITY = 0.5
+# Fração mínima dos frames da janela em que a articulação precisa estar visível para entrar no descritor
+MIN_JOINT_COVERAGE = 0.5
+
+# (a, b, c): ângulo em b entre b->a e b->c, índices do MediaPipe Pose
+JOINTS = (
+    (11, 13, 15), (12, 14, 16),  # cotovelos
+    (13, 11, 23), (14, 12, 24),  # ombros
+    (11, 23, 25), (12, 24, 26),  # quadris
+    (23, 25, 27), (24, 26, 28),  # joelhos
+)
+_A, _B, _C = (np.array(indices) for indices in zip(*JOINTS))
+
+def joint_angles(poses: np.ndarray) -> np.ndarray:
+    """
+    Landmarks (n, 33, >=2) -> ângulos (n, 8) em [0, 1] (radianos / pi), a partir de x/y.
+    Com a coluna de visibility, articulações com algum ponto abaixo de MIN_VISIBILITY ficam NaN
+    """
+    poses = np.asarray(poses, dtype=np.float32)
+    points = poses[:, :, :2]
+    first = points[:, _A] - points[:, _B]
+    second = points[:, _C] - points[:, _B]
+    dot = (first * second).sum(axis=2)
+    norms = np.linalg.norm(first, axis=2) * np.linalg.norm(second, axis=2)
+    cosine = np.clip(dot / np.maximum(norms, 1e-9), -1.0, 1.0)
+    angles = np.arccos(cosine) / np.pi
+    if poses.shape[2] > 3:
+        visible = poses[:, :, 3] >= MIN_VISIBILITY
+        angles[~(visible[:, _A] & visible[:, _B] & visible[:, _C])] = np.nan
+    return angles
+
+def window_descriptors(angles: np.ndarray, window: int, stride: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Média e desvio padrão de cada janela deslizante, por somas acumuladas: (inícios, descritores (janelas, 16)).
+    Ângulos NaN são ignorados; a articulação visível em menos de MIN_JOINT_COVERAGE da janela fica NaN
+    """
+    window = min(window, len(angles))
+    visible = ~np.isnan(angles)
+    values = np.where(visible, angles, 0.0)
+    zeros = np.zeros((1, angles.shape[1]), dtype=np.float64)
+    sums = np.cumsum(np.vstack([zeros, values]), axis=0)
+    squares = np.cumsum(np.vstack([zeros, values ** 2]), axis=0)
+    counts = np.cumsum(np.vstack([zeros, visible]), axis=0)
+    starts = np.arange(0, len(angles) - window + 1, stride)
+    count = counts[starts + window] - counts[starts]
+    covered = count >= max(1, MIN_JOINT_COVERAGE * window)
+    count = np.maximum(count, 1)
+    mean = (sums[starts + window] - sums[starts]) / count
+    variance = (squares[starts + window] - squares[starts]) / count - mean ** 2
+    std = np.sqrt(np.maximum(variance, 0))
+    return starts, np.hstack([np.where(covered, mean, np.nan), np.where(covered, std, np.nan)])
+
+def _poses(correct_positions: dict) -> List[List[List[float]]]:
+    sequence = (
+        [correct_positions.get('startPosition')]
+        + list(correct_positions.get('keyFrames') or [])
+        + [correct_positions.get('endPosition')]
+    )
+    return [
+        [[point['x'], point['y']] for point in position['landmarks']]
+        for position in sequence
+        if position and position.get('landmarks') and len(position['landmarks']) == POSE_LANDMARKS
+    ]
+
+class Recognition(NamedTuple):
+    exercise_id: str
+    confidence: float  # fração das janelas que votaram no exercício
+    distance: float  # distância mediana dessas janelas ao centróide
+
+class ExerciseRecognizer:
+    def __init__(self, exercises: Iterable[dict], min_keyframes: int = 2, max_distance: float = 0.25):
+        self.exercise_ids = []
+        centroids = []
+        for exercise in exercises:
+            poses = _poses(exercise.get('correctPositions') or {})
+            if len(poses) < min_keyframes:
+                continue
+            # Os keyframes amostram uma repetição; interpolados, aproximam o movimento contínuo
+            angles = resample(joint_angles(np.array(poses)), TEMPLATE_SAMPLES)
+            _, descriptor = window_descriptors(angles, TEMPLATE_SAMPLES, 1)
+            self.exercise_ids.append(exercise['id'])
+            centroids.append(descriptor[0])
+        self.centroids = np.array(centroids).reshape(len(centroids), len(JOINTS) * 2)
+        self._centroid_squares = self.centroids ** 2
+        self.max_distance = max_distance
+
+    def __len__(self) -> int:
+        return len(self.exercise_ids)
+
+    def classify(self, descriptors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Centróide mais próximo de cada descritor: (índices, distâncias euclidianas).
+        Só as dimensões não NaN contam, reescaladas para as 16; sem nenhuma, a distância é infinita
+        """
+        mask = ~np.isnan(descriptors)
+        values = np.where(mask, descriptors, 0.0)
+        squared = (
+            (values ** 2).sum(axis=1)[:, None]
+            + mask @ self._centroid_squares.T
+            - 2 * values @ self.centroids.T
+        )
+        dims = mask.sum(axis=1)[:, None]
+        squared = np.where(dims > 0, np.maximum(squared, 0) * descriptors.shape[1] / np.maximum(dims, 1), np.inf)
+        nearest = squared.argmin(axis=1)
+        return nearest, np.sqrt(squared[np.arange(len(nearest)), nearest])
+
+    def recognize(self, poses: np.ndarray, window: int = 60, stride: int = 15) -> Optional[Recognition]:
+        """Exercício executado nas poses (n, 33, >=2), ou None quando nenhuma janela fica perto de um exercício"""
+        if not len(self) or not len(poses):
+            return None
+        _, descriptors = window_descriptors(joint_angles(poses), window, stride)
+        nearest, distances = self.classify(descriptors)
+        accepted = distances <= self.max_distance
+        if not accepted.any():
+            return None
+
+        votes = np.bincount(nearest[accepted], minlength=len(self))
+        winner = int(votes.argmax())
+        return Recognition(
+            exercise_id=self.exercise_ids[winner],
+            confidence=float(votes[winner] / len(nearest)),
+            distance=float(np.median(distances[accepted & (nearest == winner)]))
+        )
@@ -0,0 +1,57 @@
+import hashlib
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from app.core.config.settings import settings
+
+# Serialized bodies of recently returned objects, keyed by identity. Catalog reads come from the
+# read cache, so every request within its TTL returns the same object and skips serialization.
+# The object itself is kept in the entry so its id cannot be reused while cached.
+_MAX_SERIALIZED = 256
+_serialized: "OrderedDict[Tuple[int, Any], Tuple[Any, bytes, str]]" = OrderedDict()
+
+def _serialize(content: Any, adapter: TypeAdapter) -> Tuple[bytes, str]:
+    key = (id(content), adapter)
+    entry = _serialized.get(key)
+    if entry is not None and entry[0] is content:
+        _serialized.move_to_end(key)
+        return entry[1], entry[2]
+
+    body = adapter.dump_json(adapter.validate_python(content), by_alias=True)
+    etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+    _serialized[key] = (content, body, etag)
+    while len(_serialized) > _MAX_SERIALIZED:
+        _serialized.popitem(last=False)
+    return body, etag
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match header (list of tags or *)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == opaque for tag in if_none_match.split(','))
+
+def conditional_response(
+    request: Request,
+    content: Any,
+    adapter: TypeAdapter,
+    max_age: Optional[int] = None
+) -> Response:
+    """
+    JSON response validated with the route's response model, tagged with a content-hash ETag.
+    Returns 304 without a body when the client already has this version.
+    Catalog routes require authentication, so the response is only cacheable by the client (private).
+    """
+    body, etag = _serialize(content, adapter)
+    max_age = settings.CATALOG_CACHE_MAX_AGE_SECONDS if max_age is None else max_age
+    headers = {
+        'ETag': etag,
+        'Cache-Control': f'private, max-age={max_age}',
+        'Vary': 'Authorization'
+    }
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type='application/json', headers=headers)
@@ -0,0 +1,52 @@
+import asyncio
+from typing import List, Tuple
+import numpy as np
+from fastapi import HTTPException, status
+from app.core.inference_protocol import read_message, write_message
+
+class InferenceClient:
+    """Sends frames to the inference worker (python -m inference.worker) over its Unix socket"""
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.last_pose_metrics: dict = {}
+
+    async def infer(self, images: List[np.ndarray]) -> Tuple[List[int], np.ndarray]:
+        """Indices of the frames with a detected pose and their landmarks, shape (detected, 33, 4)"""
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_unix_connection(self.socket_path),
+                self.timeout
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Inference worker unavailable: {str(e)}"
+            )
+
+        try:
+            await write_message(writer, {'type': 'infer'}, images)
+            header, arrays = await asyncio.wait_for(read_message(reader), self.timeout)
+        except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Inference worker did not answer: {str(e)}"
+            )
+        finally:
+            writer.close()
+
+        if header['status'] == 'busy':
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Inference worker is busy",
+                headers={'Retry-After': '1'}
+            )
+        if header['status'] != 'ok':
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Inference failed: {header.get('error')}"
+            )
+
+        self.last_pose_metrics = header['pose_metrics']
+        return header['detected'], arrays[0]
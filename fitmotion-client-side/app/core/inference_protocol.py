@@ -0,0 +1,46 @@
+"""Wire format between the API and the inference worker (python -m inference.worker).
+
+Each message is a 4-byte big-endian header length, a JSON header and then the raw
+bytes of every array described in header["arrays"] (shape + dtype), in order.
+Images travel as uint8 buffers and landmarks as float32, so nothing is pickled.
+"""
+import asyncio
+import json
+import math
+import struct
+from typing import List, Sequence, Tuple
+import numpy as np
+
+HEADER_LENGTH = struct.Struct('!I')
+MAX_HEADER_BYTES = 1 << 20
+MAX_ARRAY_BYTES = 64 << 20
+ALLOWED_DTYPES = {np.dtype(np.uint8).str, np.dtype(np.float32).str}
+
+async def write_message(writer: asyncio.StreamWriter, header: dict, arrays: Sequence[np.ndarray] = ()) -> None:
+    arrays = [np.ascontiguousarray(array) for array in arrays]
+    header = dict(header, arrays=[{'shape': list(array.shape), 'dtype': array.dtype.str} for array in arrays])
+    encoded = json.dumps(header).encode()
+    writer.write(HEADER_LENGTH.pack(len(encoded)) + encoded)
+    for array in arrays:
+        if array.size:
+            writer.write(memoryview(array).cast('B'))
+    await writer.drain()
+
+async def read_message(reader: asyncio.StreamReader) -> Tuple[dict, List[np.ndarray]]:
+    """Read one message; raises asyncio.IncompleteReadError when the peer closes the connection"""
+    (length,) = HEADER_LENGTH.unpack(await reader.readexactly(HEADER_LENGTH.size))
+    if length > MAX_HEADER_BYTES:
+        raise ValueError(f"Header too large: {length} bytes")
+    header = json.loads(await reader.readexactly(length))
+
+    arrays = []
+    for spec in header.pop('arrays', []):
+        if spec['dtype'] not in ALLOWED_DTYPES:
+            raise ValueError(f"Unsupported dtype: {spec['dtype']}")
+        dtype = np.dtype(spec['dtype'])
+        shape = tuple(int(dim) for dim in spec['shape'])
+        size = dtype.itemsize * math.prod(shape)
+        if size > MAX_ARRAY_BYTES:
+            raise ValueError(f"Array too large: {size} bytes")
+        arrays.append(np.frombuffer(await reader.readexactly(size), dtype=dtype).reshape(shape))
+    return header, arrays
@@ -0,0 +1,119 @@
+"""
+Índice dos keyframes com pose completa de todo o catálogo, em unidades de tronco. A distância entre um frame
+e um keyframe é o RMS dos landmarks visíveis, calculado para todos os pares com produtos de matrizes.
+"""
+from typing import Iterable, List, NamedTuple, Optional
+import numpy as np
+from app.core.body_calibration import BodyCalibration
+from app.core.pose_landmarks import POSE_LANDMARKS, torso_normalize
+
+MIN_VISIBILITY = 0.5
+
+def normalize_poses(poses: np.ndarray) -> np.ndarray:
+    """Landmarks (n, 33, >=3) -> poses (n, 33, 3) float32 em unidades de tronco"""
+    return torso_normalize(np.asarray(poses, dtype=np.float32)[:, :, :3])
+
+def _pose(position: dict) -> Optional[List[List[float]]]:
+    landmarks = position.get('landmarks') if position else None
+    if not landmarks or len(landmarks) != POSE_LANDMARKS:
+        return None
+    return [[point['x'], point['y'], point['z']] for point in landmarks]
+
+class KeyframeMatches(NamedTuple):
+    exercise_ids: List[str]
+    keyframes: np.ndarray  # posição em startPosition, *keyFrames, endPosition
+    phases: List[str]
+    similarities: np.ndarray  # 1 / (1 + distância RMS dos landmarks em troncos), em (0, 1]
+
+class KeyframeIndex:
+    def __init__(self, exercises: Iterable[dict]):
+        poses, self.exercise_ids, self.positions, self.phases = [], [], [], []
+        self.ranges = {}
+        for exercise in exercises:
+            correct_positions = exercise.get('correctPositions') or {}
+            sequence = (
+                [(correct_positions.get('startPosition'), 'preparation')]
+                + [(position, 'execution') for position in correct_positions.get('keyFrames') or []]
+                + [(correct_positions.get('endPosition'), 'completion')]
+            )
+            start = len(poses)
+            for position_index, (position, phase) in enumerate(sequence):
+                pose = _pose(position)
+                if pose is None:
+                    continue
+                poses.append(pose)
+                self.exercise_ids.append(exercise['id'])
+                self.positions.append(position_index)
+                self.phases.append(phase)
+            if len(poses) > start:
+                self.ranges[exercise['id']] = (start, len(poses))
+
+        self.positions = np.array(self.positions, dtype=np.int32)
+        self.matrix = (
+            np.ascontiguousarray(normalize_poses(np.array(poses)).reshape(len(poses), -1))
+            if poses else np.zeros((0, POSE_LANDMARKS * 3), dtype=np.float32)
+        )
+        # Norma ao quadrado de cada landmark de cada keyframe, (keyframes, 33)
+        self._squares = (self.matrix.reshape(len(self.matrix), POSE_LANDMARKS, 3) ** 2).sum(axis=2)
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def __contains__(self, exercise_id: str) -> bool:
+        return exercise_id in self.ranges
+
+    def similarities(
+        self,
+        poses: np.ndarray,
+        exercise_id: Optional[str] = None,
+        calibration: Optional[BodyCalibration] = None
+    ) -> np.ndarray:
+        """
+        Similaridades (n, keyframes) das poses (n, 33, >=3), só com os keyframes do exercício quando informado.
+        Com a coluna de visibility contam só os landmarks visíveis (frame sem nenhum: 0); com calibração,
+        os keyframes do exercício são ajustados às proporções do usuário
+        """
+        start, stop = self.ranges[exercise_id] if exercise_id is not None else (0, len(self.matrix))
+        keyframes, squares = self.matrix[start:stop], self._squares[start:stop]
+        if calibration is not None and calibration.segments and exercise_id is not None:
+            retargeted = calibration.retarget(keyframes.reshape(len(keyframes), POSE_LANDMARKS, 3))
+            keyframes, squares = retargeted.reshape(len(keyframes), -1), (retargeted ** 2).sum(axis=2)
+        poses = np.asarray(poses, dtype=np.float32)
+        points = normalize_poses(poses)
+        mask = (
+            (poses[:, :, 3] >= MIN_VISIBILITY) if poses.shape[2] > 3
+            else np.ones(poses.shape[:2], dtype=bool)
+        ).astype(np.float32)
+        points = points * mask[:, :, None]
+
+        # soma sobre os landmarks visíveis de |p - k|^2 = |p|^2 - 2 p.k + |k|^2
+        squared = (
+            (points ** 2).sum(axis=(1, 2))[:, None]
+            - 2 * points.reshape(len(points), -1) @ keyframes.T
+            + mask @ squares.T
+        )
+        visible = mask.sum(axis=1)[:, None]
+        distance = np.sqrt(np.maximum(squared, 0) / np.maximum(visible, 1))
+        return np.where(visible > 0, 1 / (1 + distance), 0.0)
+
+    def nearest(
+        self,
+        poses: np.ndarray,
+        exercise_id: Optional[str] = None,
+        calibration: Optional[BodyCalibration] = None
+    ) -> KeyframeMatches:
+        """Keyframe mais próximo de cada pose (n, 33, >=3)"""
+        if exercise_id is not None and exercise_id not in self.ranges:
+            raise KeyError(exercise_id)
+        if not len(self.matrix):
+            raise ValueError('The keyframe index is empty')
+        offset = self.ranges[exercise_id][0] if exercise_id is not None else 0
+        scores = self.similarities(poses, exercise_id, calibration)
+        best = scores.argmax(axis=1)
+        rows = best + offset
+        return KeyframeMatches(
+            exercise_ids=[self.exercise_ids[row] for row in rows],
+            keyframes=self.positions[rows],
+            phases=[self.phases[row] for row in rows],
+            similarities=scores[np.arange(len(best)), best]
+        )
@@ -0,0 +1,336 @@
+"""In-process stand-in for the Firestore client and Firebase Auth used for load tests and offline runs.
+
+Only the subset of the Firestore/Auth API used by the services is implemented.
+Enable it with FIRESTORE_BACKEND=memory.
+"""
+import copy
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+def _resolve_value(value: Any, current: Any = None) -> Any:
+    """Apply Firestore sentinels and transforms (SERVER_TIMESTAMP, Increment, ArrayUnion)"""
+    type_name = type(value).__name__
+    if type_name == 'Sentinel' and 'server timestamp' in repr(value):
+        return datetime.now(timezone.utc)
+    if type_name == 'Increment':
+        return (current or 0) + value.value
+    if type_name == 'ArrayUnion':
+        result = list(current or [])
+        for item in value.values:
+            if item not in result:
+                result.append(item)
+        return result
+    if type_name == 'ArrayRemove':
+        return [item for item in (current or []) if item not in value.values]
+    if isinstance(value, dict):
+        return {key: _resolve_value(item) for key, item in value.items()}
+    return copy.deepcopy(value)
+
+
+def _get_path(data: dict, path: str) -> Any:
+    for part in path.split('.'):
+        if not isinstance(data, dict) or part not in data:
+            return None
+        data = data[part]
+    return data
+
+
+def _set_path(data: dict, path: str, value: Any) -> None:
+    parts = path.split('.')
+    for part in parts[:-1]:
+        data = data.setdefault(part, {})
+    data[parts[-1]] = _resolve_value(value, data.get(parts[-1]))
+
+
+def _matches(value: Any, op: str, expected: Any) -> bool:
+    if op == '==':
+        return value == expected
+    if op == '!=':
+        return value is not None and value != expected
+    if op == 'in':
+        return value in expected
+    if op == 'not-in':
+        return value is not None and value not in expected
+    if op in ('array_contains', 'array-contains'):
+        return isinstance(value, list) and expected in value
+    if op in ('array_contains_any', 'array-contains-any'):
+        return isinstance(value, list) and any(item in value for item in expected)
+    if value is None:
+        return False
+    try:
+        if op == '<':
+            return value < expected
+        if op == '<=':
+            return value <= expected
+        if op == '>':
+            return value > expected
+        if op == '>=':
+            return value >= expected
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported operator: {op}")
+
+
+class DocumentSnapshot:
+    def __init__(self, reference: 'DocumentReference', data: Optional[dict]):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[dict]:
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field: str) -> Any:
+        return _get_path(self._data or {}, field)
+
+
+class DocumentReference:
+    def __init__(self, client: 'InMemoryFirestore', collection: str, document_id: str):
+        self._client = client
+        self._collection = collection
+        self.id = document_id
+
+    def get(self) -> DocumentSnapshot:
+        self._client._round_trip()
+        with self._client._lock:
+            data = self._client._store.get(self._collection, {}).get(self.id)
+            return DocumentSnapshot(self, copy.deepcopy(data))
+
+    def set(self, data: dict, merge: bool = False) -> None:
+        self._client._round_trip()
+        self._client._set(self._collection, self.id, data, merge)
+
+    def update(self, data: dict) -> None:
+        self._client._round_trip()
+        self._client._update(self._collection, self.id, data)
+
+    def delete(self) -> None:
+        self._client._round_trip()
+        with self._client._lock:
+            self._client._store.get(self._collection, {}).pop(self.id, None)
+
+
+class Query:
+    def __init__(self, client: 'InMemoryFirestore', collection: str):
+        self._client = client
+        self._collection = collection
+        self._filters: List[tuple] = []
+        self._orders: List[tuple] = []
+        self._limit: Optional[int] = None
+        self._start_after: Optional[DocumentSnapshot] = None
+
+    def _copy(self) -> 'Query':
+        query = copy.copy(self)
+        query._filters = list(self._filters)
+        query._orders = list(self._orders)
+        return query
+
+    def where(self, field: str = None, op: str = None, value: Any = None, filter=None) -> 'Query':
+        if filter is not None:
+            field, op, value = filter.field_path, filter.op_string, filter.value
+        query = self._copy()
+        query._filters.append((field, op, value))
+        return query
+
+    def order_by(self, field: str, direction: str = 'ASCENDING') -> 'Query':
+        query = self._copy()
+        query._orders.append((field, str(direction).upper().endswith('DESCENDING')))
+        return query
+
+    def limit(self, count: int) -> 'Query':
+        query = self._copy()
+        query._limit = count
+        return query
+
+    def start_after(self, snapshot: DocumentSnapshot) -> 'Query':
+        query = self._copy()
+        query._start_after = snapshot
+        return query
+
+    def stream(self):
+        self._client._round_trip()
+        with self._client._lock:
+            items = list(self._client._store.get(self._collection, {}).items())
+
+        results = [
+            (doc_id, data) for doc_id, data in items
+            if all(_matches(_get_path(data, field), op, value) for field, op, value in self._filters)
+        ]
+        # Stable multi-key sort, applied from the least significant key; missing fields sort first
+        for field, descending in reversed(self._orders):
+            results.sort(
+                key=lambda item: (_get_path(item[1], field) is not None, _get_path(item[1], field)),
+                reverse=descending
+            )
+
+        if self._start_after is not None:
+            ids = [doc_id for doc_id, _ in results]
+            if self._start_after.id in ids:
+                results = results[ids.index(self._start_after.id) + 1:]
+
+        if self._limit is not None:
+            results = results[:self._limit]
+
+        for doc_id, data in results:
+            reference = DocumentReference(self._client, self._collection, doc_id)
+            yield DocumentSnapshot(reference, copy.deepcopy(data))
+
+    def get(self) -> List[DocumentSnapshot]:
+        return list(self.stream())
+
+
+class CollectionReference(Query):
+    def __init__(self, client: 'InMemoryFirestore', collection: str):
+        super().__init__(client, collection)
+        self.id = collection
+
+    def document(self, document_id: Optional[str] = None) -> DocumentReference:
+        return DocumentReference(self._client, self._collection, document_id or uuid.uuid4().hex[:20])
+
+    def add(self, data: dict):
+        reference = self.document()
+        reference.set(data)
+        return datetime.now(timezone.utc), reference
+
+
+class WriteBatch:
+    def __init__(self, client: 'InMemoryFirestore'):
+        self._client = client
+        self._operations: List[tuple] = []
+
+    def set(self, reference: DocumentReference, data: dict, merge: bool = False) -> None:
+        self._operations.append(('set', reference, data, merge))
+
+    def update(self, reference: DocumentReference, data: dict) -> None:
+        self._operations.append(('update', reference, data, False))
+
+    def delete(self, reference: DocumentReference) -> None:
+        self._operations.append(('delete', reference, None, False))
+
+    def commit(self) -> None:
+        self._client._round_trip()
+        for op, reference, data, merge in self._operations:
+            if op == 'set':
+                self._client._set(reference._collection, reference.id, data, merge)
+            elif op == 'update':
+                self._client._update(reference._collection, reference.id, data)
+            else:
+                with self._client._lock:
+                    self._client._store.get(reference._collection, {}).pop(reference.id, None)
+        self._operations = []
+
+
+class InMemoryFirestore:
+    """Thread-safe dict-backed Firestore client with optional simulated round-trip latency"""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self._store: Dict[str, Dict[str, dict]] = {}
+        self._lock = threading.RLock()
+
+    def _round_trip(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _set(self, collection: str, document_id: str, data: dict, merge: bool) -> None:
+        with self._lock:
+            documents = self._store.setdefault(collection, {})
+            if merge and document_id in documents:
+                for key, value in data.items():
+                    _set_path(documents[document_id], key, value)
+            else:
+                documents[document_id] = {}
+                for key, value in data.items():
+                    documents[document_id][key] = _resolve_value(value)
+
+    def _update(self, collection: str, document_id: str, data: dict) -> None:
+        with self._lock:
+            documents = self._store.setdefault(collection, {})
+            if document_id not in documents:
+                raise KeyError(f"No document to update: {collection}/{document_id}")
+            for key, value in data.items():
+                _set_path(documents[document_id], key, value)
+
+    def collection(self, name: str) -> CollectionReference:
+        return CollectionReference(self, name)
+
+    def batch(self) -> WriteBatch:
+        return WriteBatch(self)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._store.clear()
+
+
+class UserNotFoundError(Exception):
+    pass
+
+
+class InMemoryUser:
+    def __init__(self, uid: str, email: Optional[str] = None, display_name: Optional[str] = None):
+        self.uid = uid
+        self.email = email
+        self.display_name = display_name
+        self.photo_url = None
+        self.email_verified = True
+
+
+class InMemoryAuth:
+    """Firebase Auth stand-in. ID tokens have the form "test:<uid>" or "test:<uid>:admin"."""
+
+    UserNotFoundError = UserNotFoundError
+
+    def __init__(self):
+        self._users: Dict[str, InMemoryUser] = {}
+        self._lock = threading.Lock()
+
+    def verify_id_token(self, id_token: str) -> dict:
+        parts = id_token.split(':')
+        if len(parts) < 2 or parts[0] != 'test':
+            raise ValueError("Invalid test token")
+        uid = parts[1]
+        self._ensure_user(uid)
+        return {'uid': uid, 'admin': 'admin' in parts[2:]}
+
+    def _ensure_user(self, uid: str) -> InMemoryUser:
+        with self._lock:
+            if uid not in self._users:
+                self._users[uid] = InMemoryUser(uid, email=f"{uid}@example.com", display_name=uid)
+            return self._users[uid]
+
+    def create_user(self, uid: Optional[str] = None, email: Optional[str] = None,
+                    display_name: Optional[str] = None, **_) -> InMemoryUser:
+        user = InMemoryUser(uid or uuid.uuid4().hex[:28], email, display_name)
+        with self._lock:
+            self._users[user.uid] = user
+        return user
+
+    def get_user(self, uid: str) -> InMemoryUser:
+        with self._lock:
+            if uid not in self._users:
+                raise UserNotFoundError(f"No user record found for uid: {uid}")
+            return self._users[uid]
+
+    def get_user_by_email(self, email: str) -> InMemoryUser:
+        with self._lock:
+            for user in self._users.values():
+                if user.email == email:
+                    return user
+        raise UserNotFoundError(f"No user record found for email: {email}")
+
+    def update_user(self, uid: str, display_name: Optional[str] = None,
+                    photo_url: Optional[str] = None, **_) -> InMemoryUser:
+        user = self.get_user(uid)
+        if display_name is not None:
+            user.display_name = display_name
+        if photo_url is not None:
+            user.photo_url = photo_url
+        return user
@@ -0,0 +1,109 @@
+import time
+from contextlib import contextmanager
+from functools import wraps
+from prometheus_client import Counter, Histogram, Gauge, CONTENT_TYPE_LATEST, generate_latest
+
+# Buckets cover fast Firestore reads (ms) up to slow pose analysis batches (s)
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+REQUEST_LATENCY = Histogram(
+    'fitmotion_http_request_duration_seconds',
+    'HTTP request latency by route',
+    ['method', 'route', 'status'],
+    buckets=LATENCY_BUCKETS
+)
+
+STAGE_LATENCY = Histogram(
+    'fitmotion_stage_duration_seconds',
+    'Time spent in each request processing stage',
+    ['stage'],
+    buckets=LATENCY_BUCKETS
+)
+
+FIRESTORE_LATENCY = Histogram(
+    'fitmotion_firestore_operation_duration_seconds',
+    'Firestore round-trip latency by collection and operation',
+    ['collection', 'operation'],
+    buckets=LATENCY_BUCKETS
+)
+
+POSE_MODEL_COMPLEXITY = Gauge(
+    'fitmotion_pose_model_complexity',
+    'MediaPipe model complexity chosen by the adaptive controller'
+)
+
+POSE_INPUT_SCALE = Gauge(
+    'fitmotion_pose_input_scale',
+    'Input downscale factor chosen by the adaptive controller'
+)
+
+CACHE_REQUESTS = Counter(
+    'fitmotion_read_cache_requests_total',
+    'Read cache lookups by result (hit, miss, coalesced onto an in-flight load)',
+    ['cache', 'result']
+)
+
+@contextmanager
+def track_stage(stage: str):
+    """Record the duration of a processing stage (auth, pose_inference, form_analysis...)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage=stage).observe(time.perf_counter() - start)
+
+@contextmanager
+def track_firestore(collection: str, operation: str):
+    """Record one Firestore round trip, both per collection/operation and as the firestore stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        FIRESTORE_LATENCY.labels(collection=collection, operation=operation).observe(elapsed)
+        STAGE_LATENCY.labels(stage='firestore').observe(elapsed)
+
+# Code object of each stage function -> stage name, used to attribute profiler stack samples
+STAGE_FUNCTIONS = {}
+
+def register_stage_functions(stage: str, *functions) -> None:
+    """Attribute stack samples inside these functions to stage (e.g. sync work offloaded to a thread)"""
+    for func in functions:
+        STAGE_FUNCTIONS[func.__code__] = stage
+
+def timed_stage(stage: str):
+    """Decorator form of track_stage for async service methods"""
+    def decorator(func):
+        register_stage_functions(stage, func)
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with track_stage(stage):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_pose_settings(pose_metrics: dict) -> None:
+    POSE_MODEL_COMPLEXITY.set(pose_metrics['model_complexity'])
+    POSE_INPUT_SCALE.set(pose_metrics['input_scale'])
+
+def instrument_serialization() -> None:
+    """Time FastAPI response-model validation and serialization as the serialization stage"""
+    import fastapi.routing
+
+    original = fastapi.routing.serialize_response
+    if getattr(original, '_fitmotion_timed', False):
+        return
+
+    @wraps(original)
+    async def serialize_response(*args, **kwargs):
+        with track_stage('serialization'):
+            return await original(*args, **kwargs)
+
+    serialize_response._fitmotion_timed = True
+    fastapi.routing.serialize_response = serialize_response
+
+def render_metrics() -> tuple:
+    """Prometheus exposition payload and content type"""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,7 +1,8 @@
 from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
-from firebase_admin import auth
+from app.core.config.firebase import get_auth_client
+from app.core.metrics import track_stage
 
 class FirebaseAuth(HTTPBearer):
     def __init__(self, auto_error: bool = True):
@@ -17,7 +18,8 @@ class FirebaseAuth(HTTPBearer):
             )
 
         try:
-            decoded_token = auth.verify_id_token(credentials.credentials)
+            with track_stage('auth'):
+                decoded_token = get_auth_client().verify_id_token(credentials.credentials)
             request.state.user = decoded_token
             return decoded_token
         except Exception as e:
@@ -0,0 +1,60 @@
+import logging
+import time
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.metrics import REQUEST_LATENCY
+from app.core.tracing import trace_id_from_header, trace_id_var
+
+logger = logging.getLogger('fitmotion.access')
+
+class MetricsMiddleware:
+    """Assigns a trace ID to each request, records its latency per route and logs an access line"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get('headers') or [])
+        trace_id = trace_id_from_header(headers.get(b'x-request-id', b''))
+        token = trace_id_var.set(trace_id)
+        status_code = 500
+
+        async def send_with_trace(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                message['headers'] = list(message.get('headers', [])) + [
+                    (b'x-trace-id', trace_id.encode('latin-1'))
+                ]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = self._route_template(scope)
+            REQUEST_LATENCY.labels(
+                method=scope['method'],
+                route=route,
+                status=str(status_code)
+            ).observe(elapsed)
+            logger.info('%s %s %s %.1fms', scope['method'], scope['path'], status_code, elapsed * 1000)
+            trace_id_var.reset(token)
+
+    @staticmethod
+    def _route_template(scope: Scope) -> str:
+        """Route path template (e.g. /api/v1/workouts/{workout_id}) to keep label cardinality bounded"""
+        route = scope.get('route')
+        if route is not None:
+            return route.path
+        app = scope.get('app')
+        for candidate in getattr(app, 'routes', []):
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                return candidate.path
+        return 'unmatched'
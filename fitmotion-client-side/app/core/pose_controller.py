@@ -0,0 +1,127 @@
+import time
+from typing import Callable, Dict, Optional, Tuple
+import cv2
+
+# Quality levels from most to least expensive: (model_complexity, input scale)
+QUALITY_LEVELS: Tuple[Tuple[int, float], ...] = (
+    (2, 1.0),
+    (1, 1.0),
+    (1, 0.75),
+    (0, 0.75),
+    (0, 0.5),
+)
+
+def create_pose_detector(model_complexity: int):
+    """
+    MediaPipe Pose in static image mode. Detectors are shared by requests of different users
+    (in the API process and in every inference worker process), so they must not track a pose
+    from one frame to the next: in tracking mode a user's frame would be searched around the
+    pose of whoever was processed before it.
+    """
+    import mediapipe as mp
+    return mp.solutions.pose.Pose(
+        static_image_mode=True,
+        model_complexity=model_complexity,
+        min_detection_confidence=0.5
+    )
+
+class PoseQualityController:
+    """Steps MediaPipe model complexity and input scale to hold a per-frame latency budget"""
+
+    def __init__(
+        self,
+        detector_factory: Callable[[int], object],
+        target_latency_ms: float,
+        start_complexity: int = 2,
+        smoothing: float = 0.2,
+        headroom: float = 0.6,
+        min_visibility: float = 0.6,
+        cooldown_frames: int = 30,
+        levels: Tuple[Tuple[int, float], ...] = QUALITY_LEVELS
+    ):
+        self.detector_factory = detector_factory
+        self.budget = target_latency_ms / 1000
+        self.smoothing = smoothing
+        self.headroom = headroom
+        self.min_visibility = min_visibility
+        self.cooldown_frames = cooldown_frames
+        self.levels = levels
+        self.level = next(
+            (i for i, (complexity, _) in enumerate(levels) if complexity == start_complexity),
+            0
+        )
+        self._detectors: Dict[int, object] = {}
+        self._frames_since_change = 0
+        self.avg_latency: Optional[float] = None
+        self.avg_visibility: Optional[float] = None
+        self.level_changes = 0
+
+    @property
+    def model_complexity(self) -> int:
+        return self.levels[self.level][0]
+
+    @property
+    def scale(self) -> float:
+        return self.levels[self.level][1]
+
+    @property
+    def detector(self):
+        """Pose detector for the current complexity, cached so level changes do not reload models"""
+        complexity = self.model_complexity
+        if complexity not in self._detectors:
+            self._detectors[complexity] = self.detector_factory(complexity)
+        return self._detectors[complexity]
+
+    def process(self, image):
+        """Run inference at the current level and feed the measurement back into the controller"""
+        if self.scale < 1.0:
+            image = cv2.resize(image, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+
+        start = time.perf_counter()
+        results = self.detector.process(image)
+        self.record(time.perf_counter() - start, results.pose_landmarks)
+        return results
+
+    def record(self, latency: float, pose_landmarks=None) -> None:
+        """Update moving averages and step the quality level up or down"""
+        visibility = 0.0
+        if pose_landmarks is not None:
+            points = pose_landmarks.landmark
+            visibility = sum(point.visibility for point in points) / len(points)
+
+        if self.avg_latency is None:
+            self.avg_latency = latency
+            self.avg_visibility = visibility if self.avg_visibility is None else self.avg_visibility
+        else:
+            self.avg_latency += self.smoothing * (latency - self.avg_latency)
+            self.avg_visibility += self.smoothing * (visibility - self.avg_visibility)
+
+        self._frames_since_change += 1
+        if self._frames_since_change < self.cooldown_frames:
+            return
+
+        if self.avg_latency > self.budget and self.level < len(self.levels) - 1:
+            self._set_level(self.level + 1)
+        elif self.level > 0:
+            # Poor visibility justifies spending more of the budget on a better model
+            limit = self.budget * (0.9 if self.avg_visibility < self.min_visibility else self.headroom)
+            if self.avg_latency < limit:
+                self._set_level(self.level - 1)
+
+    def _set_level(self, level: int) -> None:
+        self.level = level
+        self.level_changes += 1
+        self._frames_since_change = 0
+        self.avg_latency = None
+
+    def metrics(self) -> dict:
+        """Currently selected settings and observed averages"""
+        return {
+            'model_complexity': self.model_complexity,
+            'input_scale': self.scale,
+            'level': self.level,
+            'level_changes': self.level_changes,
+            'target_latency_ms': self.budget * 1000,
+            'avg_latency_ms': (self.avg_latency or 0.0) * 1000,
+            'avg_visibility': self.avg_visibility or 0.0
+        }
@@ -0,0 +1,81 @@
+"""MediaPipe Pose landmark order, shared by every module that indexes (n, 33, 4) landmark arrays.
+
+Clients that run pose detection on the device send named keypoints instead of images;
+landmarks_from_keypoints() puts them in this order so the rest of the analysis does not
+depend on where the pose came from.
+
+Poses are compared in body units (torso_normalize): hips at the origin, one torso length = 1.
+The torso is measured in the image plane only. MediaPipe z is a noisy relative depth and
+keypoints sent by clients have none, so a 3D length would scale the same pose differently
+depending on its source.
+"""
+import re
+from typing import Iterable, List, Optional
+import numpy as np
+
+POSE_LANDMARK_NAMES = (
+    'nose',
+    'left_eye_inner', 'left_eye', 'left_eye_outer',
+    'right_eye_inner', 'right_eye', 'right_eye_outer',
+    'left_ear', 'right_ear',
+    'mouth_left', 'mouth_right',
+    'left_shoulder', 'right_shoulder',
+    'left_elbow', 'right_elbow',
+    'left_wrist', 'right_wrist',
+    'left_pinky', 'right_pinky',
+    'left_index', 'right_index',
+    'left_thumb', 'right_thumb',
+    'left_hip', 'right_hip',
+    'left_knee', 'right_knee',
+    'left_ankle', 'right_ankle',
+    'left_heel', 'right_heel',
+    'left_foot_index', 'right_foot_index',
+)
+POSE_LANDMARKS = len(POSE_LANDMARK_NAMES)
+LANDMARK_INDEX = {name: index for index, name in enumerate(POSE_LANDMARK_NAMES)}
+LEFT_SHOULDER, RIGHT_SHOULDER = LANDMARK_INDEX['left_shoulder'], LANDMARK_INDEX['right_shoulder']
+LEFT_HIP, RIGHT_HIP = LANDMARK_INDEX['left_hip'], LANDMARK_INDEX['right_hip']
+TORSO_LANDMARKS = (LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP)
+
+def landmark_index(name: str) -> Optional[int]:
+    """Index of a keypoint name ('left_shoulder', 'leftShoulder' or 'LEFT_SHOULDER'), None if unknown"""
+    return LANDMARK_INDEX.get(re.sub(r'([a-z])([A-Z])', r'\1_\2', name).lower())
+
+def landmarks_from_keypoints(keypoints: Iterable) -> Optional[List[dict]]:
+    """
+    33 landmarks {x, y, z, visibility} in MediaPipe order from schemas.movement_analysis.Keypoint;
+    the keypoint confidence becomes the visibility and missing keypoints get visibility 0.
+    None when no keypoint has a known name.
+    """
+    landmarks = [{'x': 0.0, 'y': 0.0, 'z': 0.0, 'visibility': 0.0} for _ in range(POSE_LANDMARKS)]
+    found = False
+    for keypoint in keypoints:
+        index = landmark_index(keypoint.name)
+        if index is None:
+            continue
+        landmarks[index] = {
+            'x': keypoint.point.x,
+            'y': keypoint.point.y,
+            'z': 0.0,
+            'visibility': keypoint.point.confidence
+        }
+        found = True
+    return landmarks if found else None
+
+def hip_center(points: np.ndarray) -> np.ndarray:
+    """(..., 33, d) points -> (..., d) midpoint of the hips"""
+    return (points[..., LEFT_HIP, :] + points[..., RIGHT_HIP, :]) / 2
+
+def torso_length(points: np.ndarray) -> np.ndarray:
+    """(..., 33, >=2) points -> (...) shoulder-center to hip-center distance in the image plane"""
+    shoulders = (points[..., LEFT_SHOULDER, :2] + points[..., RIGHT_SHOULDER, :2]) / 2
+    return np.linalg.norm(shoulders - hip_center(points[..., :2]), axis=-1)
+
+def torso_normalize(points: np.ndarray, torso=None) -> np.ndarray:
+    """
+    (..., 33, 3) points relative to the hip center, in torso lengths. `torso` overrides the
+    length measured on each pose (e.g. a user's calibrated torso).
+    """
+    points = np.asarray(points, dtype=np.float32)
+    torso = torso_length(points) if torso is None else np.asarray(torso, dtype=np.float32)
+    return (points - hip_center(points)[..., None, :]) / np.maximum(torso, 1e-6)[..., None, None]
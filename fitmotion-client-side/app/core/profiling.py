@@ -0,0 +1,150 @@
+import asyncio
+import cProfile
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from app.core.config.settings import settings
+from app.core.metrics import STAGE_FUNCTIONS
+
+logger = logging.getLogger('fitmotion.profiling')
+
+def stage_of(frame) -> str:
+    """Stage of the innermost registered stage function on the stack, or None"""
+    while frame is not None:
+        stage = STAGE_FUNCTIONS.get(frame.f_code)
+        if stage is not None:
+            return stage
+        frame = frame.f_back
+    return None
+
+class StackSampler(threading.Thread):
+    """
+    Samples the stacks of every thread and accumulates them in collapsed format (func;func;func count),
+    accepted by flamegraph.pl and speedscope. Each sample is attributed to the stage whose function
+    is on that stack, so concurrent requests and work offloaded to threads land in the right stage;
+    samples outside any stage (idle loop, other routes) are dropped.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = defaultdict(Counter)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+                stage = stage_of(frame)
+                if stage is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.samples[stage][';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+class AnalysisProfiler:
+    """
+    Opt-in profiling window for analyze_movement.
+    The first analysis after startup opens a window of window_seconds; while it is open cProfile runs on
+    the event loop thread and a StackSampler samples every thread. The window is closed by a timer
+    scheduled when it opens, so it ends even if no further analysis arrives. output_dir then holds:
+      - capture.prof: cProfile statistics (pstats, snakeviz)
+      - <stage>.collapsed: sampled stacks per stage, ready for flamegraph.pl
+    Only one window runs per process. Stage durations are recorded per request in
+    fitmotion_stage_duration_seconds (app/core/metrics.py).
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        window_seconds: float = 60.0,
+        output_dir: str = 'profiles',
+        sample_interval: float = 0.005
+    ):
+        self.enabled = enabled
+        self.window_seconds = window_seconds
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self._lock = threading.Lock()
+        self._profile = None
+        self._sampler = None
+        self._timer = None
+        self._started_at = None
+        self._finished = False
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+
+    def _start(self):
+        with self._lock:
+            if self._finished or self._profile is not None:
+                return
+            self._started_at = time.perf_counter()
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            self._sampler = StackSampler(self.sample_interval)
+            self._sampler.start()
+            # cProfile hooks the thread that enabled it, so the stop must run on the event loop too
+            try:
+                self._timer = asyncio.get_running_loop().call_later(self.window_seconds, self._stop)
+            except RuntimeError:
+                self._timer = None
+            logger.info('Profiling window opened for %.0fs', self.window_seconds)
+
+    def _stop(self):
+        with self._lock:
+            if self._profile is None:
+                return
+            self._profile.disable()
+            self._sampler.stop()
+            if self._timer is not None:
+                self._timer.cancel()
+            try:
+                self._dump()
+            finally:
+                self._profile = None
+                self._sampler = None
+                self._timer = None
+                self._finished = True
+
+    def _dump(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._profile.dump_stats(os.path.join(self.output_dir, 'capture.prof'))
+        for stage, stacks in self._sampler.samples.items():
+            with open(os.path.join(self.output_dir, f'{stage}.collapsed'), 'w') as collapsed:
+                for stack, count in stacks.most_common():
+                    collapsed.write(f'{stack} {count}\n')
+        logger.info('Profiling results written to %s', os.path.abspath(self.output_dir))
+
+    @contextmanager
+    def session(self):
+        """Wraps one analyze_movement call; opens the window on first use"""
+        if not self.enabled or self._finished:
+            yield
+            return
+        self._start()
+        try:
+            yield
+        finally:
+            # Without a running loop there is no timer, so the window closes on the next call after expiry
+            if self.active and time.perf_counter() - self._started_at >= self.window_seconds:
+                self._stop()
+
+analysis_profiler = AnalysisProfiler(
+    enabled=settings.PROFILING_ENABLED,
+    window_seconds=settings.PROFILING_WINDOW_SECONDS,
+    output_dir=settings.PROFILING_OUTPUT_DIR
+)
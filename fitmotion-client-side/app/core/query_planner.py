@@ -0,0 +1,296 @@
+"""Composite-index-aware planning for FirebaseService.query_collection.
+
+Every list query is matched against the composite indexes declared in INDEXES:
+  - filters + ordering covered by a declared index (or by Firestore's automatic
+    single-field indexes) run as a single Firestore query;
+  - otherwise the query runs on the largest declared index whose fields are a
+    subset of the filters, over a briefly cached superset read in pages, and the
+    remaining filters are applied in memory;
+  - an ('or', [conditions]) filter is expanded into one branch per condition; the
+    branches run in parallel and are merged by the sort key, without duplicates.
+
+firestore.indexes.json is generated from INDEXES:
+    python -m app.core.query_planner > firestore.indexes.json
+"""
+import asyncio
+import heapq
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('fitmotion.query_planner')
+
+ASCENDING = 'ASCENDING'
+DESCENDING = 'DESCENDING'
+CONTAINS = 'CONTAINS'
+
+ARRAY_OPS = ('array_contains', 'array-contains', 'array_contains_any', 'array-contains-any')
+RANGE_OPS = ('<', '<=', '>', '>=', '!=', 'not-in')
+
+@dataclass(frozen=True)
+class CompositeIndex:
+    """Composite index: (field, ASCENDING | DESCENDING | CONTAINS) in Firestore order"""
+    collection: str
+    fields: Tuple[Tuple[str, str], ...]
+
+    @property
+    def field_names(self) -> frozenset:
+        return frozenset(name for name, _ in self.fields)
+
+    def to_definition(self) -> dict:
+        return {
+            'collectionGroup': self.collection,
+            'queryScope': 'COLLECTION',
+            'fields': [
+                {'fieldPath': name, 'arrayConfig': CONTAINS} if mode == CONTAINS
+                else {'fieldPath': name, 'order': mode}
+                for name, mode in self.fields
+            ]
+        }
+
+INDEXES: Tuple[CompositeIndex, ...] = (
+    # WorkoutService.list_workouts / get_featured_workouts / get_workouts_by_body_area
+    CompositeIndex('workouts', (('isPublic', ASCENDING), ('createdAt', DESCENDING))),
+    CompositeIndex('workouts', (('userId', ASCENDING), ('createdAt', DESCENDING))),
+    CompositeIndex('workouts', (('featured', ASCENDING), ('isPublic', ASCENDING), ('createdAt', DESCENDING))),
+    CompositeIndex('workouts', (('bodyArea', ASCENDING), ('isPublic', ASCENDING), ('createdAt', DESCENDING))),
+    CompositeIndex('workouts', (
+        ('bodyArea', ASCENDING), ('difficulty', ASCENDING), ('isPublic', ASCENDING), ('createdAt', DESCENDING)
+    )),
+    CompositeIndex('workouts', (('difficulty', ASCENDING), ('isPublic', ASCENDING), ('createdAt', DESCENDING))),
+    # ExerciseService.list_exercises
+    CompositeIndex('exercises', (('muscleGroups', CONTAINS), ('name', ASCENDING))),
+    CompositeIndex('exercises', (('difficulty', ASCENDING), ('name', ASCENDING))),
+    CompositeIndex('exercises', (('muscleGroups', CONTAINS), ('difficulty', ASCENDING), ('name', ASCENDING))),
+    # ProgressAnalysisService: completed sessions of a user since a date
+    CompositeIndex('workout_sessions', (('status', ASCENDING), ('user_id', ASCENDING), ('created_at', ASCENDING))),
+)
+
+def index_definitions(indexes: Sequence[CompositeIndex] = INDEXES) -> dict:
+    """Contents of firestore.indexes.json for the declared indexes"""
+    return {
+        'indexes': [index.to_definition() for index in indexes],
+        'fieldOverrides': []
+    }
+
+def filter_matches(document: dict, condition: tuple) -> bool:
+    """In-memory evaluation of one (field, op, value) filter"""
+    name, op, expected = condition
+    value = document.get(name)
+    if op == '==':
+        return value == expected
+    if op == 'in':
+        return value in expected
+    if op in ('array_contains', 'array-contains'):
+        return isinstance(value, list) and expected in value
+    if op in ('array_contains_any', 'array-contains-any'):
+        return isinstance(value, list) and any(item in value for item in expected)
+    if value is None:
+        return False
+    if op == '!=':
+        return value != expected
+    if op == 'not-in':
+        return value not in expected
+    if op == '<':
+        return value < expected
+    if op == '<=':
+        return value <= expected
+    if op == '>':
+        return value > expected
+    if op == '>=':
+        return value >= expected
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+def freeze(value) -> Hashable:
+    """Hashable form of a filter value ('in' and array filters take lists), for cache keys"""
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    return value
+
+@dataclass
+class BranchPlan:
+    """One Firestore query plus the filters left for memory (empty when an index covers it)"""
+    server_filters: List[tuple]
+    memory_filters: List[tuple] = field(default_factory=list)
+    index: Optional[CompositeIndex] = None
+
+class QueryPlanner:
+    def __init__(
+        self,
+        indexes: Sequence[CompositeIndex] = INDEXES,
+        scan_page_size: int = 500,
+        superset_ttl_seconds: float = 5.0
+    ):
+        self.indexes = tuple(indexes)
+        self.scan_page_size = scan_page_size
+        self.superset_ttl_seconds = superset_ttl_seconds
+        # One cache per collection, so a write only drops the supersets of its own collection
+        self.supersets: Dict[str, 'CoalescingCache'] = {}
+
+    def _supersets(self, collection: str) -> 'CoalescingCache':
+        if collection not in self.supersets:
+            # Imported here so generating the index file does not require the API settings
+            from app.core.cache import CoalescingCache
+            self.supersets[collection] = CoalescingCache('query_superset', ttl_seconds=self.superset_ttl_seconds)
+        return self.supersets[collection]
+
+    @staticmethod
+    def _needs_composite(filters: Sequence[tuple], order_by: Optional[tuple]) -> bool:
+        """Equality-only filters without ordering are served by Firestore's single-field index merging"""
+        if not filters:
+            return False
+        names = {condition[0] for condition in filters}
+        has_range = any(condition[1] in RANGE_OPS for condition in filters)
+        has_array = any(condition[1] in ARRAY_OPS for condition in filters)
+        if order_by is None:
+            return (has_range or has_array) and len(names) > 1
+        return names != {order_by[0]}
+
+    def _covers(self, index: CompositeIndex, collection: str, names: frozenset, order_by: Optional[tuple]) -> bool:
+        if index.collection != collection:
+            return False
+        if order_by is None:
+            return index.field_names == names
+        last_name, last_mode = index.fields[-1]
+        return (
+            (last_name, last_mode) == tuple(order_by)
+            and index.field_names - {last_name} == names - {last_name}
+        )
+
+    def plan_branch(self, collection: str, filters: List[tuple], order_by: Optional[tuple]) -> BranchPlan:
+        if not self._needs_composite(filters, order_by):
+            return BranchPlan(server_filters=list(filters))
+
+        names = frozenset(condition[0] for condition in filters)
+        for index in self.indexes:
+            if self._covers(index, collection, names, order_by):
+                return BranchPlan(server_filters=list(filters), index=index)
+
+        # No exact index: query the largest declared index contained in the filters, filter the rest in memory
+        best = None
+        for index in self.indexes:
+            if index.collection != collection or order_by is None or index.fields[-1] != tuple(order_by):
+                continue
+            index_filters = index.field_names - {order_by[0]}
+            if index_filters <= names and (best is None or len(index.field_names) > len(best.field_names)):
+                best = index
+
+        server_names = best.field_names if best is not None else frozenset()
+        server_filters = [
+            condition for condition in filters
+            if condition[0] in server_names and condition[1] not in RANGE_OPS
+        ]
+        memory_filters = [condition for condition in filters if condition not in server_filters]
+        logger.debug('No composite index for %s %s; filtering %s in memory', collection, sorted(names), memory_filters)
+        return BranchPlan(server_filters=server_filters, memory_filters=memory_filters, index=best)
+
+    def plan(self, collection: str, filters: Sequence[tuple], order_by: Optional[tuple]) -> List[BranchPlan]:
+        """Expand OR filters into branches and plan each one"""
+        branches: List[List[tuple]] = [[]]
+        for condition in filters:
+            if condition[0] == 'or':
+                branches = [branch + [alternative] for branch in branches for alternative in condition[1]]
+            else:
+                branches = [branch + [condition] for branch in branches]
+        return [self.plan_branch(collection, branch, order_by) for branch in branches]
+
+    async def execute(
+        self,
+        run_query: Callable[..., List[dict]],
+        collection: str,
+        filters: Sequence[tuple],
+        order_by: Optional[tuple],
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[dict]:
+        """
+        run_query(collection, filters, order_by, limit, offset, start_after=None) is the blocking Firestore
+        query; start_after is the id of the document the page starts after.
+        Branches run in worker threads so OR queries hit Firestore concurrently.
+        """
+        branches = self.plan(collection, filters, order_by)
+        if len(branches) == 1 and not branches[0].memory_filters:
+            return run_query(collection, branches[0].server_filters, order_by, limit, offset)
+
+        wanted = limit + offset if limit else None
+        results = await asyncio.gather(*[
+            self._run_branch(run_query, collection, branch, order_by, wanted)
+            for branch in branches
+        ])
+        merged = self._merge(results, order_by)
+        return merged[offset:offset + limit] if limit else merged[offset:]
+
+    async def _run_branch(self, run_query, collection: str, branch: BranchPlan, order_by: Optional[tuple],
+                          wanted: Optional[int]) -> List[dict]:
+        if not branch.memory_filters:
+            return await asyncio.to_thread(run_query, collection, branch.server_filters, order_by, wanted, 0)
+
+        key = (
+            tuple((name, op, freeze(value)) for name, op, value in branch.server_filters),
+            tuple(order_by) if order_by else None
+        )
+        superset = await self._supersets(collection).get_or_load(
+            key,
+            lambda: asyncio.to_thread(self._scan, run_query, collection, branch.server_filters, order_by)
+        )
+        # Copies: the superset is shared through the cache and callers enrich the documents they get
+        matching = [
+            dict(document) for document in superset
+            if all(filter_matches(document, condition) for condition in branch.memory_filters)
+        ]
+        return matching[:wanted] if wanted else matching
+
+    def _scan(self, run_query, collection: str, filters: List[tuple], order_by: Optional[tuple]) -> List[dict]:
+        """
+        Every document matching the server filters, read in pages of scan_page_size (blocking).
+        Each page starts after the last document read, so no page re-reads the ones before it.
+        """
+        documents = []
+        while True:
+            cursor = documents[-1]['id'] if documents else None
+            page = run_query(collection, filters, order_by, self.scan_page_size, 0, start_after=cursor)
+            documents.extend(page)
+            if len(page) < self.scan_page_size:
+                break
+        if len(documents) > self.scan_page_size:
+            logger.info(
+                'Scanned %d documents of %s %s to filter in memory; consider declaring an index',
+                len(documents), collection, filters
+            )
+        return documents
+
+    @staticmethod
+    def _merge(results: List[List[dict]], order_by: Optional[tuple]) -> List[dict]:
+        if order_by is None:
+            ordered = (document for documents in results for document in documents)
+        else:
+            name, direction = order_by
+            # None sorts first in ascending order, like missing values in Firestore
+            ordered = heapq.merge(
+                *results,
+                key=lambda document: (document.get(name) is not None, document.get(name)),
+                reverse=direction == DESCENDING
+            )
+
+        seen = set()
+        merged = []
+        for document in ordered:
+            if document['id'] not in seen:
+                seen.add(document['id'])
+                merged.append(document)
+        return merged
+
+    def invalidate(self, collection: Optional[str] = None) -> None:
+        """Drop the cached supersets of a collection after a write to it (of every collection without one)"""
+        caches = self.supersets.values() if collection is None else [self.supersets.get(collection)]
+        for cache in caches:
+            if cache is not None:
+                cache.invalidate()
+
+if __name__ == '__main__':
+    print(json.dumps(index_definitions(), indent=2))
@@ -0,0 +1,191 @@
+"""
+Segmentação de repetições: janelas do sinal, em várias durações, são comparadas com o template de uma
+repetição (keyFrames) por DTW com banda de Sakoe-Chiba, podado por LB_Keogh, e escolhidas sem sobreposição.
+"""
+import bisect
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+@dataclass
+class Rep:
+    start: int  # primeiro frame
+    end: int  # um depois do último frame
+    cost: float  # custo normalizado do alinhamento DTW com o template
+
+@dataclass
+class RepSegmentation:
+    reps: List[Rep] = field(default_factory=list)
+    frame_count: int = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.reps)
+
+    def phase_at(self, index: int) -> str:
+        """preparation antes e entre repetições, execution dentro de uma, completion depois da última"""
+        position = bisect.bisect_right([rep.start for rep in self.reps], index) - 1
+        if position < 0:
+            return 'preparation'
+        if index < self.reps[position].end:
+            return 'execution'
+        return 'completion' if position == len(self.reps) - 1 else 'preparation'
+
+def resample(sequence: np.ndarray, length: int) -> np.ndarray:
+    """Interpolação linear de uma sequência (n, d) para (length, d)"""
+    positions = np.linspace(0, len(sequence) - 1, length)
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, len(sequence) - 1)
+    weight = (positions - lower)[:, None]
+    return sequence[lower] * (1 - weight) + sequence[upper] * weight
+
+def znormalize(values: np.ndarray, axis: int) -> np.ndarray:
+    mean = values.mean(axis=axis, keepdims=True)
+    std = values.std(axis=axis, keepdims=True)
+    return (values - mean) / np.where(std > 1e-9, std, 1.0)
+
+def keogh_envelope(template: np.ndarray, radius: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Envelopes superior e inferior de um template (m, d) dentro da banda"""
+    length = len(template)
+    upper = np.empty_like(template)
+    lower = np.empty_like(template)
+    for i in range(length):
+        window = template[max(0, i - radius):min(length, i + radius + 1)]
+        upper[i] = window.max(axis=0)
+        lower[i] = window.min(axis=0)
+    return upper, lower
+
+def lb_keogh(windows: np.ndarray, upper: np.ndarray, lower: np.ndarray) -> np.ndarray:
+    """LB_Keogh de janelas (k, m, d), normalizado como banded_dtw para usar o mesmo limite"""
+    above = np.clip(windows - upper, 0, None)
+    below = np.clip(lower - windows, 0, None)
+    return (above ** 2 + below ** 2).sum(axis=(1, 2)) / windows.shape[1]
+
+def banded_dtw(windows: np.ndarray, template: np.ndarray, radius: int) -> np.ndarray:
+    """Custo DTW de janelas (k, m, d) contra um template (m, d) na banda de Sakoe-Chiba, por passo do template"""
+    count, length, _ = windows.shape
+    # Só duas linhas da matriz de custo são mantidas, e só a banda de cada linha é calculada
+    previous = np.full((count, length + 1), np.inf)
+    previous[:, 0] = 0.0
+    for i in range(1, length + 1):
+        current = np.full((count, length + 1), np.inf)
+        low, high = max(1, i - radius), min(length, i + radius)
+        local = ((windows[:, i - 1, None, :] - template[None, low - 1:high, :]) ** 2).sum(axis=2)
+        # Passos diagonal e vertical dependem só da linha anterior
+        step = np.minimum(previous[:, low - 1:high], previous[:, low:high + 1]) + local
+        for offset, j in enumerate(range(low, high + 1)):
+            current[:, j] = np.minimum(step[:, offset], current[:, j - 1] + local[:, offset])
+        previous = current
+    return previous[:, length] / length
+
+class RepSegmenter:
+    def __init__(
+        self,
+        template: Sequence[Sequence[float]],
+        template_length: int = 32,
+        band: float = 0.15,
+        min_rep_frames: int = 20,
+        max_rep_frames: int = 240,
+        length_ratio: float = 1.25,
+        max_cost: float = 0.5,
+        min_range: float = 0.08,
+        max_overlap: float = 0.1,
+        chunk_size: int = 2048
+    ):
+        template = np.asarray(template, dtype=float)
+        if template.ndim == 1:
+            template = template[:, None]
+        # Dimensões paradas no template não carregam forma
+        spread = template.std(axis=0)
+        self.dims = spread > max(spread.max(), 1e-9) * 1e-3
+        self.template_length = template_length
+        self.template = znormalize(resample(template[:, self.dims], template_length), axis=0)
+        self.radius = max(1, int(round(band * template_length)))
+        self.upper, self.lower = keogh_envelope(self.template, self.radius)
+        self.max_cost = max_cost
+        self.min_range = min_range
+        self.max_overlap = max_overlap
+        self.chunk_size = chunk_size
+
+        lengths = []
+        length = float(min_rep_frames)
+        while length <= max_rep_frames:
+            lengths.append(int(round(length)))
+            length *= length_ratio
+        self.lengths = sorted(set(lengths))
+
+        self.windows_evaluated = 0
+        self.windows_pruned = 0
+
+    def _windows(self, signal: np.ndarray, starts: np.ndarray, length: int) -> np.ndarray:
+        """signal[start:start + length] reescalado para o tamanho do template em cada início, formato (k, m, d)"""
+        offsets = np.linspace(0, length - 1, self.template_length)
+        positions = starts[:, None] + offsets[None, :]
+        lower = np.floor(positions).astype(int)
+        upper = np.minimum(lower + 1, len(signal) - 1)
+        weight = (positions - lower)[:, :, None]
+        return signal[lower] * (1 - weight) + signal[upper] * weight
+
+    def _candidates(self, signal: np.ndarray) -> List[Rep]:
+        candidates = []
+        for length in self.lengths:
+            if length > len(signal):
+                break
+            stride = max(1, length // 16)
+            all_starts = np.arange(0, len(signal) - length + 1, stride)
+            for chunk in range(0, len(all_starts), self.chunk_size):
+                starts = all_starts[chunk:chunk + self.chunk_size]
+                windows = self._windows(signal, starts, length)
+                self.windows_evaluated += len(starts)
+
+                # Janelas paradas (ruído dos landmarks) seriam esticadas até variância 1 pela normalização
+                moving = np.ptp(windows, axis=1).max(axis=1) >= self.min_range
+                windows = znormalize(windows[moving], axis=1)
+                starts = starts[moving]
+
+                bound = lb_keogh(windows, self.upper, self.lower)
+                keep = bound <= self.max_cost
+                self.windows_pruned += int(len(starts) - keep.sum())
+                if not keep.any():
+                    continue
+
+                costs = banded_dtw(windows[keep], self.template, self.radius)
+                for start, cost in zip(starts[keep], costs):
+                    if cost <= self.max_cost:
+                        candidates.append(Rep(int(start), int(start) + length, float(cost)))
+        return candidates
+
+    def segment(self, signal: Sequence[Sequence[float]]) -> RepSegmentation:
+        """Limites (índices de frame) e custos das repetições de um sinal (n, d)"""
+        signal = np.asarray(signal, dtype=float)
+        if signal.ndim == 1:
+            signal = signal[:, None]
+        result = RepSegmentation(frame_count=len(signal))
+        if len(signal) < min(self.lengths, default=len(signal) + 1):
+            return result
+
+        signal = signal[:, self.dims]
+
+        # Melhores primeiro; um candidato só entra se não sobrepõe uma repetição aceita
+        occupied = np.zeros(len(signal), dtype=bool)
+        for candidate in sorted(self._candidates(signal), key=lambda rep: rep.cost):
+            margin = int((candidate.end - candidate.start) * self.max_overlap)
+            if occupied[candidate.start + margin:candidate.end - margin].any():
+                continue
+            occupied[candidate.start:candidate.end] = True
+            result.reps.append(candidate)
+
+        result.reps.sort(key=lambda rep: rep.start)
+        return result
+
+def primary_trajectory(landmarks: np.ndarray, landmark: Optional[int] = None, min_visibility: float = 0.5) -> np.ndarray:
+    """
+    Trajetória (n, 3) do landmark que conduz a repetição, a partir de landmarks (n, 33, 4);
+    sem landmark informado, usa o landmark visível que mais se move
+    """
+    if landmark is None:
+        visible = landmarks[:, :, 3].mean(axis=0) >= min_visibility
+        motion = landmarks[:, :, :2].std(axis=0).sum(axis=1)
+        motion[~visible] = -1
+        landmark = int(np.argmax(motion))
+    return landmarks[:, landmark, :3]
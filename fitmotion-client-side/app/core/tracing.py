@@ -0,0 +1,46 @@
+import logging
+import re
+import uuid
+from contextvars import ContextVar
+
+trace_id_var: ContextVar[str] = ContextVar('trace_id', default='-')
+
+# Client-supplied X-Request-ID values are echoed in headers and logs, so only plain tokens are kept
+_VALID_TRACE_ID = re.compile(r'[A-Za-z0-9-]{1,64}')
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+def trace_id_from_header(value: bytes) -> str:
+    """The X-Request-ID sent by the client when it is 1-64 letters, digits or dashes, else a new ID"""
+    trace_id = value.decode('latin-1')
+    return trace_id if _VALID_TRACE_ID.fullmatch(trace_id) else new_trace_id()
+
+def get_trace_id() -> str:
+    """Trace ID of the request being handled in the current context"""
+    return trace_id_var.get()
+
+class TraceIdFilter(logging.Filter):
+    """Adds the current request trace ID to every log record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = trace_id_var.get()
+        return True
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Log the fitmotion.* loggers with the trace ID in each line. Only the 'fitmotion' logger gets
+    a handler: the root logger and handlers configured by the host (uvicorn --log-config,
+    gunicorn, pytest) are left alone. Safe to call more than once.
+    """
+    logger = logging.getLogger('fitmotion')
+    if any(isinstance(item, TraceIdFilter) for handler in logger.handlers for item in handler.filters):
+        return
+    handler = logging.StreamHandler()
+    handler.addFilter(TraceIdFilter())
+    handler.setFormatter(logging.Formatter(
+        '%(asctime)s %(levelname)s [trace=%(trace_id)s] %(name)s: %(message)s'
+    ))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
@@ -1,7 +1,12 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config.settings import settings
 from app.core.config.firebase import initialize_firebase
+from app.core.container import ServiceContainer
+from app.core.metrics import instrument_serialization, render_metrics
+from app.core.middleware.metrics import MetricsMiddleware
+from app.core.tracing import configure_logging
 from app.api.v1 import (
     auth, 
     exercises, 
@@ -12,13 +17,28 @@ from app.api.v1 import (
     user_profile
 )
 
-def create_application() -> FastAPI:
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """Build the shared services once per worker and load the analysis models in the background"""
+    configure_logging()
     initialize_firebase()
+    services = ServiceContainer()
+    if settings.POSE_PRELOAD_MODELS:
+        services.warm_up()
+    application.state.services = services
+    try:
+        yield
+    finally:
+        await services.close()
+
+def create_application() -> FastAPI:
+    instrument_serialization()
     
     application = FastAPI(
         title=settings.PROJECT_NAME,
         version=settings.VERSION,
-        debug=settings.DEBUG
+        debug=settings.DEBUG,
+        lifespan=lifespan
     )
 
     # Configure CORS
@@ -30,6 +50,9 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Per-request trace IDs and latency histograms
+    application.add_middleware(MetricsMiddleware)
+
     # Include routers
     application.include_router(auth.router, prefix=settings.API_V1_STR)
     application.include_router(exercises.router, prefix=settings.API_V1_STR)
@@ -45,4 +68,9 @@ app = create_application()
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "version": settings.VERSION}
\ No newline at end of file
+    return {"status": "healthy", "version": settings.VERSION}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
\ No newline at end of file
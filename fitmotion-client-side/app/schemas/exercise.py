@@ -9,11 +9,14 @@ class Position(BaseModel):
     x: float
     y: float
     z: float
+    # Pose completa do keyframe (33 landmarks na ordem do MediaPipe), usada pelo índice de keyframes
+    landmarks: Optional[List["Position"]] = None
 
 class CorrectPositions(BaseModel):
     startPosition: Position
     endPosition: Position
     keyFrames: List[Position]
+    trackedLandmark: Optional[int] = None  # índice MediaPipe que os keyFrames descrevem; None = o que mais se move
 
 class ExerciseBase(BaseModel):
     name: str
@@ -12,7 +12,8 @@ class Keypoint(BaseModel):
     point: Point
 
 class Frame(BaseModel):
-    keypoints: List[Keypoint]
+    keypoints: List[Keypoint] = []  # pose detectada no dispositivo (nomes dos landmarks do MediaPipe)
+    image: Optional[str] = None  # JPEG/PNG em base64, para frames sem keypoints; a pose é detectada no servidor
     timestamp: float
 
 class MovementPhase(str, Enum):
@@ -34,10 +35,15 @@ class MovementFeedback(BaseModel):
     keypoints: Optional[List[str]] = None
 
 class AnalysisRequest(BaseModel):
-    exercise_id: str
+    exercise_id: Optional[str] = None  # sem exercise_id o exercício é reconhecido pelos movimentos
     frames: List[Frame]
     user_id: str
 
+class RepSegment(BaseModel):
+    start: float  # timestamp do primeiro frame
+    end: float  # timestamp do último frame
+    cost: float  # custo de alinhamento DTW com o template do exercício
+
 class MovementAnalysis(BaseModel):
     exercise_id: str
     accuracy: float
@@ -47,6 +53,8 @@ class MovementAnalysis(BaseModel):
     feedback: List[MovementFeedback]
     form_score: float
     recommendations: List[str]
+    reps: List[RepSegment] = []
+    recognition_confidence: Optional[float] = None  # preenchido quando o exercício foi reconhecido
 
 class ExerciseMetrics(BaseModel):
     total_reps: int
@@ -7,11 +7,11 @@ from app.schemas.achievement import (
 )
 from app.services.firebase_service import FirebaseService
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 class AchievementService:
-    def __init__(self):
-        self.firebase = FirebaseService()
+    def __init__(self, firebase: Optional[FirebaseService] = None):
+        self.firebase = firebase or FirebaseService()
         self.collection = 'achievements'
         self.user_achievements_collection = 'user_achievements'
 
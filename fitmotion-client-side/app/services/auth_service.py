@@ -1,19 +1,35 @@
-from firebase_admin import auth
 from fastapi import HTTPException, status
 from app.schemas.auth import UserCreate, UserLogin, FirebaseAuthResponse
 from app.services.firebase_service import FirebaseService
+from app.core.config.firebase import get_auth_client
 import httpx
+from contextlib import asynccontextmanager
+from typing import Optional
 from app.core.config.settings import settings
 
 class AuthService:
-    def __init__(self):
-        self.firebase = FirebaseService()
+    def __init__(
+        self,
+        firebase: Optional[FirebaseService] = None,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
+        self.firebase = firebase or FirebaseService()
+        self.http_client = http_client
         self.api_key = settings.FIREBASE_API_KEY
 
+    @asynccontextmanager
+    async def _client(self):
+        """Shared pooled client when injected, otherwise a client per call"""
+        if self.http_client is not None:
+            yield self.http_client
+            return
+        async with httpx.AsyncClient() as client:
+            yield client
+
     async def create_user(self, user_data: UserCreate) -> FirebaseAuthResponse:
         try:
             url = f"https://identitytoolkit.googleapis.com/v1/accounts:signUp?key={self.api_key}"
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 response = await client.post(url, json={
                     "email": user_data.email,
                     "password": user_data.password,
@@ -48,7 +64,7 @@ class AuthService:
     async def login_user(self, credentials: UserLogin) -> FirebaseAuthResponse:
         try:
             url = f"https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword?key={self.api_key}"
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 response = await client.post(url, json={
                     "email": credentials.email,
                     "password": credentials.password,
@@ -71,7 +87,7 @@ class AuthService:
 
     async def update_user_profile(self, user_id: str, display_name: str) -> None:
         try:
-            auth.update_user(
+            get_auth_client().update_user(
                 user_id,
                 display_name=display_name
             )
@@ -83,7 +99,7 @@ class AuthService:
 
     async def verify_id_token(self, id_token: str) -> dict:
         try:
-            return auth.verify_id_token(id_token)
+            return get_auth_client().verify_id_token(id_token)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -93,7 +109,7 @@ class AuthService:
     async def reset_password(self, email: str) -> dict:
         try:
             url = f"https://identitytoolkit.googleapis.com/v1/accounts:sendOobCode?key={self.api_key}"
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 response = await client.post(url, json={
                     "requestType": "PASSWORD_RESET",
                     "email": email
@@ -1,12 +1,22 @@
 from fastapi import HTTPException, status
 from app.schemas.exercise import ExerciseCreate, ExerciseUpdate
 from app.services.firebase_service import FirebaseService
+from app.core.cache import CoalescingCache, cache_key
+from app.core.keyframe_index import KeyframeIndex
+from app.core.exercise_recognition import ExerciseRecognizer
+from app.core.config.settings import settings
 from typing import List, Optional
 
 class ExerciseService:
-    def __init__(self):
-        self.firebase = FirebaseService()
+    def __init__(self, firebase: Optional[FirebaseService] = None):
+        self.firebase = firebase or FirebaseService()
         self.collection = 'exercises'
+        self.read_cache = CoalescingCache('exercises', ttl_seconds=settings.READ_CACHE_TTL_SECONDS)
+        self.keyframe_cache = CoalescingCache('keyframe_index', ttl_seconds=settings.KEYFRAME_INDEX_TTL_SECONDS)
+
+    def _invalidate(self) -> None:
+        self.read_cache.invalidate()
+        self.keyframe_cache.invalidate()
 
     async def create_exercise(self, exercise: ExerciseCreate) -> dict:
         try:
@@ -14,6 +24,7 @@ class ExerciseService:
             doc_ref = self.firebase.db.collection(self.collection).document()
             exercise_dict['id'] = doc_ref.id
             await self.firebase.set_document(self.collection, doc_ref.id, exercise_dict)
+            self._invalidate()
             return exercise_dict
         except Exception as e:
             raise HTTPException(
@@ -35,6 +46,7 @@ class ExerciseService:
             current_exercise = await self.get_exercise(exercise_id)
             update_data = exercise.model_dump(exclude_unset=True)
             await self.firebase.update_document(self.collection, exercise_id, update_data)
+            self._invalidate()
             return await self.get_exercise(exercise_id)
         except Exception as e:
             raise HTTPException(
@@ -45,6 +57,7 @@ class ExerciseService:
     async def delete_exercise(self, exercise_id: str):
         try:
             await self.firebase.delete_document(self.collection, exercise_id)
+            self._invalidate()
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -57,6 +70,24 @@ class ExerciseService:
         difficulty: Optional[str] = None,
         limit: int = 10,
         offset: int = 0
+    ) -> List[dict]:
+        key = cache_key(
+            'list',
+            muscle_group=muscle_group,
+            difficulty=difficulty,
+            limit=limit,
+            offset=offset
+        )
+        return await self.read_cache.get_or_load(
+            key,
+            lambda: self._query_exercises(muscle_group, difficulty, limit)
+        )
+
+    async def _query_exercises(
+        self,
+        muscle_group: Optional[str],
+        difficulty: Optional[str],
+        limit: int
     ) -> List[dict]:
         try:
             filters = []
@@ -76,4 +107,20 @@ class ExerciseService:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to list exercises: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    async def get_keyframe_index(self) -> KeyframeIndex:
+        """Índice dos keyframes de todo o catálogo, reconstruído quando o catálogo muda"""
+        return await self.keyframe_cache.get_or_load('all', self._build_keyframe_index)
+
+    async def _build_keyframe_index(self) -> KeyframeIndex:
+        exercises = await self.firebase.query_collection(self.collection)
+        return KeyframeIndex(exercises)
+
+    async def get_exercise_recognizer(self) -> ExerciseRecognizer:
+        """Centroides de reconhecimento de todo o catálogo, reconstruídos junto com o índice de keyframes"""
+        return await self.keyframe_cache.get_or_load('recognizer', self._build_exercise_recognizer)
+
+    async def _build_exercise_recognizer(self) -> ExerciseRecognizer:
+        exercises = await self.firebase.query_collection(self.collection)
+        return ExerciseRecognizer(exercises, max_distance=settings.RECOGNITION_MAX_DISTANCE)
@@ -1,15 +1,18 @@
-from firebase_admin import firestore, auth
+from firebase_admin import firestore
 from google.cloud.firestore import Client
 from google.cloud.firestore import SERVER_TIMESTAMP
 from fastapi import HTTPException
-from app.core.config.firebase import get_firebase_app, get_firestore_client
+from app.core.config.firebase import get_firebase_app, get_firestore_client, get_auth_client
+from app.core.metrics import track_firestore, track_stage
+from app.core.query_planner import QueryPlanner
 
 class FirebaseService:
     def __init__(self):
         try:
             get_firebase_app()
             self.db: Client = get_firestore_client()
-            self.auth = auth
+            self.auth = get_auth_client()
+            self.query_planner = QueryPlanner()
         except Exception as e:
             raise HTTPException(
                 status_code=500,
@@ -24,7 +27,8 @@ class FirebaseService:
         """Get a document from Firestore"""
         try:
             doc_ref = self.db.collection(collection).document(document_id)
-            doc = doc_ref.get()
+            with track_firestore(collection, 'get'):
+                doc = doc_ref.get()
             if doc.exists:
                 return doc.to_dict()
             return None
@@ -37,7 +41,9 @@ class FirebaseService:
     async def set_document(self, collection: str, document_id: str, data: dict) -> None:
         """Set a document in Firestore"""
         try:
-            self.db.collection(collection).document(document_id).set(data)
+            with track_firestore(collection, 'set'):
+                self.db.collection(collection).document(document_id).set(data)
+            self.query_planner.invalidate(collection)
         except Exception as e:
             raise HTTPException(
                 status_code=500,
@@ -47,7 +53,9 @@ class FirebaseService:
     async def update_document(self, collection: str, document_id: str, data: dict) -> None:
         """Update a document in Firestore"""
         try:
-            self.db.collection(collection).document(document_id).update(data)
+            with track_firestore(collection, 'update'):
+                self.db.collection(collection).document(document_id).update(data)
+            self.query_planner.invalidate(collection)
         except Exception as e:
             raise HTTPException(
                 status_code=500,
@@ -57,7 +65,9 @@ class FirebaseService:
     async def delete_document(self, collection: str, document_id: str) -> None:
         """Delete a document from Firestore"""
         try:
-            self.db.collection(collection).document(document_id).delete()
+            with track_firestore(collection, 'delete'):
+                self.db.collection(collection).document(document_id).delete()
+            self.query_planner.invalidate(collection)
         except Exception as e:
             raise HTTPException(
                 status_code=500,
@@ -72,43 +82,66 @@ class FirebaseService:
         limit: int = None,
         offset: int = 0 
     ):
-        """Query a collection with filters and pagination"""
+        """
+        Query a collection with filters and pagination.
+        Filters may include ('or', [conditions]); the query planner picks a declared composite index,
+        runs OR branches in parallel and filters in memory when no index covers the combination.
+        """
         try:
-            query = self.db.collection(collection)
-            
-            if filters:
-                for filter_item in filters:
-                    if filter_item[0] == 'or':
-                        or_conditions = filter_item[1]
-                        or_queries = []
-                        for condition in or_conditions:
-                            or_query = query.where(condition[0], condition[1], condition[2])
-                            or_queries.append(or_query)
-                    else:
-                        query = query.where(filter_item[0], filter_item[1], filter_item[2])
-            
-            if order_by:
-                field, direction = order_by
-                query = query.order_by(field, direction=direction)
-            
-            if offset > 0:
-                offset_query = query.limit(offset).get()
-                last_doc = list(offset_query)[-1] if offset_query else None
-                if last_doc:
-                    query = query.start_after(last_doc)
-            
-            if limit:
-                query = query.limit(limit)
-            
-            docs = query.stream()
-            return [{"id": doc.id, **doc.to_dict()} for doc in docs]
-
+            return await self.query_planner.execute(
+                self._run_query,
+                collection,
+                filters or [],
+                order_by,
+                limit,
+                offset
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to query collection: {str(e)}"
             )
 
+    def _run_query(
+        self,
+        collection: str,
+        filters: list,
+        order_by: tuple = None,
+        limit: int = None,
+        offset: int = 0,
+        start_after: str = None
+    ) -> list:
+        """
+        Run one Firestore query with AND-ed filters (blocking).
+        start_after (a document id) continues after that document with a cursor, without the
+        reads an offset costs.
+        """
+        query = self.db.collection(collection)
+        for field, op, value in filters:
+            query = query.where(field, op, value)
+
+        if order_by:
+            field, direction = order_by
+            query = query.order_by(field, direction=direction)
+
+        if start_after is not None:
+            with track_firestore(collection, 'query_cursor'):
+                cursor = self.db.collection(collection).document(start_after).get()
+            query = query.start_after(cursor)
+        elif offset > 0:
+            with track_firestore(collection, 'query_offset'):
+                offset_query = query.limit(offset).get()
+            last_doc = list(offset_query)[-1] if offset_query else None
+            if last_doc:
+                query = query.start_after(last_doc)
+
+        if limit:
+            query = query.limit(limit)
+
+        with track_firestore(collection, 'query'):
+            docs = query.stream()
+            return [{"id": doc.id, **doc.to_dict()} for doc in docs]
+
     async def batch_write(self, operations: list) -> None:
         """Perform batch write operations"""
         try:
@@ -125,7 +158,10 @@ class FirebaseService:
                     ref = self.db.collection(op['collection']).document(op['document_id'])
                     batch.delete(ref)
             
-            batch.commit()
+            with track_firestore('batch', 'commit'):
+                batch.commit()
+            for collection in {op['collection'] for op in operations}:
+                self.query_planner.invalidate(collection)
         except Exception as e:
             raise HTTPException(
                 status_code=500,
@@ -135,7 +171,8 @@ class FirebaseService:
     async def verify_id_token(self, id_token: str) -> dict:
         """Verify Firebase ID token"""
         try:
-            return self.auth.verify_id_token(id_token)
+            with track_stage('auth'):
+                return self.auth.verify_id_token(id_token)
         except Exception as e:
             raise HTTPException(
                 status_code=401,
@@ -1,33 +1,99 @@
+import asyncio
+import base64
+import binascii
+from collections import Counter
+from typing import Dict, List, Optional
+import cv2
 import numpy as np
 from fastapi import HTTPException, status
 from app.schemas.movement_analysis import (
     AnalysisRequest,
+    FeedbackType,
+    Frame,
     MovementAnalysis,
     MovementFeedback,
-    ExerciseMetrics
+    ExerciseMetrics,
+    RepSegment
 )
 from app.services.exercise_service import ExerciseService
-import tensorflow as tf
-import mediapipe as mp
+from app.services.user_profile_service import UserProfileService
+from app.core.config.settings import settings
+from app.core.pose_controller import PoseQualityController, create_pose_detector
+from app.core.inference_client import InferenceClient
+from app.core.exercise_recognition import ExerciseRecognizer
+from app.core.metrics import timed_stage, record_pose_settings, register_stage_functions
+from app.core.profiling import analysis_profiler
+from app.core.keyframe_index import KeyframeIndex, KeyframeMatches
+from app.core.body_calibration import BodyCalibration, TYPICAL_TORSO, calibrate, normalize_reference
+from app.core.rep_segmentation import RepSegmenter, RepSegmentation, primary_trajectory
+from app.core.pose_landmarks import LANDMARK_INDEX, landmarks_from_keypoints
+
+# TensorFlow e MediaPipe são importados sob demanda: a importação leva segundos e centenas de MB
+# por worker, e só é necessária quando o serviço de análise é criado
+
+MIN_VISIBILITY = 0.5
+# Precisão média abaixo da qual os pontos-chave de alta importância do exercício viram feedback
+LOW_ACCURACY = 0.6
+# Diferença de altura tolerada entre os dois lados, em comprimentos de tronco
+LEVEL_TOLERANCE = 0.15
+TORSO_KEYPOINTS = ('left_shoulder', 'right_shoulder', 'left_hip', 'right_hip')
+TORSO_NOT_VISIBLE = "Mantenha ombros e quadril visíveis para a câmera"
+# Recomendação -> par de landmarks que deve ficar na mesma altura
+FORM_CHECKS = {
+    "Mantenha os ombros nivelados": ('left_shoulder', 'right_shoulder'),
+    "Mantenha o quadril nivelado": ('left_hip', 'right_hip'),
+}
+
+# Trabalho NumPy executado fora do event loop (asyncio.to_thread), atribuído à etapa no profiling
+register_stage_functions('rep_segmentation', RepSegmenter.segment)
+register_stage_functions('form_analysis', KeyframeIndex.nearest)
+register_stage_functions('exercise_recognition', ExerciseRecognizer.recognize)
+register_stage_functions('body_calibration', calibrate)
 
 class MovementAnalysisService:
-    def __init__(self):
-        self.exercise_service = ExerciseService()
-        self.pose_detector = mp.solutions.pose.Pose(
-            static_image_mode=False,
-            model_complexity=2,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
+    def __init__(
+        self,
+        exercise_service: Optional[ExerciseService] = None,
+        inference_client: Optional[InferenceClient] = None,
+        user_profile_service: Optional[UserProfileService] = None
+    ):
+        self.exercise_service = exercise_service or ExerciseService()
+        self.user_profile_service = user_profile_service or UserProfileService(firebase=self.exercise_service.firebase)
+        # Com um inference_client a inferência roda no worker dedicado e o MediaPipe não é carregado aqui
+        self.inference_client = inference_client
+        if inference_client is not None:
+            self.pose_controller = None
+            return
+
+        self.pose_controller = PoseQualityController(
+            create_pose_detector,
+            target_latency_ms=settings.POSE_TARGET_LATENCY_MS,
+            start_complexity=settings.POSE_MODEL_COMPLEXITY
         )
         
         # Inicializar MediaPipe
+        import mediapipe as mp
         self.mp_pose = mp.solutions.pose
         self.mp_drawing = mp.solutions.drawing_utils
 
+    @property
+    def pose_detector(self):
+        """Detector escolhido pelo controlador de qualidade (None com o worker de inferência)"""
+        if self.pose_controller is None:
+            return None
+        return self.pose_controller.detector
+
+    def get_pose_metrics(self) -> dict:
+        """Configuração de inferência atualmente escolhida"""
+        if self.pose_controller is None:
+            return self.inference_client.last_pose_metrics
+        return self.pose_controller.metrics()
+
     async def initialize_models(self):
         """Inicializa ou carrega modelos necessários"""
         try:
             # Aqui você carregaria seus modelos treinados
+            # import tensorflow as tf
             # self.form_analysis_model = tf.keras.models.load_model('path_to_model')
             pass
         except Exception as e:
@@ -37,21 +103,35 @@ class MovementAnalysisService:
             )
 
     async def analyze_movement(self, request: AnalysisRequest) -> MovementAnalysis:
+        with analysis_profiler.session():
+            return await self._analyze_movement(request)
+
+    async def _analyze_movement(self, request: AnalysisRequest) -> MovementAnalysis:
         try:
-            # Obter dados do exercício
-            exercise = await self.exercise_service.get_exercise(request.exercise_id)
-            
             # Processar frames
             processed_frames = await self._process_frames(request.frames)
+
+            # Obter dados do exercício, reconhecendo-o quando o cliente não informou
+            exercise_id, recognition_confidence = await self._resolve_exercise(request, processed_frames)
+            exercise = await self.exercise_service.get_exercise(exercise_id)
             
+            # Proporções corporais do usuário (salvas ou medidas no início desta sessão)
+            calibration = await self._body_calibration(request.user_id, processed_frames)
+
+            # Segmentar repetições contra o template do exercício
+            segmentation = await self._segment_reps(processed_frames, exercise['correctPositions'], calibration)
+
             # Analisar forma
             form_analysis = await self._analyze_form(
                 processed_frames,
-                exercise['correctPositions']
+                exercise['correctPositions'],
+                segmentation,
+                exercise_id,
+                calibration
             )
             
             # Contar repetições
-            rep_count = await self._count_reps(processed_frames)
+            rep_count = await self._count_reps(segmentation)
             
             # Gerar feedback
             feedback = await self._generate_feedback(
@@ -61,82 +141,162 @@ class MovementAnalysisService:
             )
 
             return MovementAnalysis(
-                exercise_id=request.exercise_id,
+                exercise_id=exercise_id,
                 accuracy=form_analysis['accuracy'],
                 current_phase=form_analysis['current_phase'],
                 rep_count=rep_count,
                 duration=len(request.frames) / 30,  # assumindo 30 fps
                 feedback=feedback,
                 form_score=form_analysis['form_score'],
-                recommendations=form_analysis['recommendations']
+                recommendations=form_analysis['recommendations'],
+                reps=[
+                    RepSegment(
+                        start=processed_frames[rep.start]['timestamp'],
+                        end=processed_frames[rep.end - 1]['timestamp'],
+                        cost=rep.cost
+                    )
+                    for rep in segmentation.reps
+                ],
+                recognition_confidence=recognition_confidence
             )
 
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to analyze movement: {str(e)}"
             )
 
-    async def _process_frames(self, frames: list[dict]) -> list[dict]:
-        """Processa os frames usando MediaPipe Pose"""
-        processed_frames = []
-        
-        for frame in frames:
-            results = self.pose_detector.process(frame['image'])
+    @timed_stage('pose_inference')
+    async def _process_frames(self, frames: List[Frame]) -> list[dict]:
+        """
+        Landmarks de cada frame: os keypoints detectados no dispositivo ou, nos frames que trazem
+        só a imagem, a pose detectada no servidor. Frames sem pose são descartados.
+        """
+        landmarks = {}
+        images = {}
+        for index, frame in enumerate(frames):
+            if frame.keypoints:
+                frame_landmarks = landmarks_from_keypoints(frame.keypoints)
+                if frame_landmarks is not None:
+                    landmarks[index] = frame_landmarks
+            elif frame.image:
+                images[index] = self._decode_image(frame.image)
+
+        if images:
+            if self.inference_client is not None:
+                landmarks.update(await self._infer_images_remote(images))
+            else:
+                landmarks.update(self._infer_images(images))
+
+        return [
+            {'landmarks': landmarks[index], 'timestamp': frames[index].timestamp}
+            for index in sorted(landmarks)
+        ]
+
+    @staticmethod
+    def _decode_image(data: str) -> np.ndarray:
+        """Imagem RGB de um JPEG/PNG em base64"""
+        try:
+            encoded = np.frombuffer(base64.b64decode(data, validate=True), dtype=np.uint8)
+        except (binascii.Error, ValueError):
+            encoded = np.empty(0, dtype=np.uint8)
+        image = cv2.imdecode(encoded, cv2.IMREAD_COLOR) if encoded.size else None
+        if image is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Frame image is not a valid base64-encoded JPEG or PNG"
+            )
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    def _infer_images(self, images: Dict[int, np.ndarray]) -> Dict[int, list[dict]]:
+        """Pose de cada imagem com o MediaPipe local, indexada pela posição do frame na requisição"""
+        landmarks = {}
+        for index, image in images.items():
+            results = self.pose_controller.process(image)
             if results.pose_landmarks:
-                landmarks = []
-                for landmark in results.pose_landmarks.landmark:
-                    landmarks.append({
-                        'x': landmark.x,
-                        'y': landmark.y,
-                        'z': landmark.z,
-                        'visibility': landmark.visibility
-                    })
-                processed_frames.append({
-                    'landmarks': landmarks,
-                    'timestamp': frame['timestamp']
-                })
-
-        return processed_frames
-
-    async def _analyze_form(self, processed_frames: list[dict], correct_positions: dict) -> dict:
+                landmarks[index] = [
+                    {'x': point.x, 'y': point.y, 'z': point.z, 'visibility': point.visibility}
+                    for point in results.pose_landmarks.landmark
+                ]
+
+        record_pose_settings(self.pose_controller.metrics())
+        return landmarks
+
+    async def _infer_images_remote(self, images: Dict[int, np.ndarray]) -> Dict[int, list[dict]]:
+        """Envia as imagens ao worker de inferência e converte os landmarks para o formato local"""
+        indices = list(images)
+        detected, landmarks = await self.inference_client.infer([images[index] for index in indices])
+        converted = {
+            indices[position]: [
+                {'x': float(x), 'y': float(y), 'z': float(z), 'visibility': float(visibility)}
+                for x, y, z, visibility in frame_landmarks
+            ]
+            for position, frame_landmarks in zip(detected, landmarks)
+        }
+
+        if self.inference_client.last_pose_metrics:
+            record_pose_settings(self.inference_client.last_pose_metrics)
+        return converted
+
+    @timed_stage('form_analysis')
+    async def _analyze_form(
+        self,
+        processed_frames: list[dict],
+        correct_positions: dict,
+        segmentation: RepSegmentation,
+        exercise_id: Optional[str] = None,
+        calibration: Optional[BodyCalibration] = None
+    ) -> dict:
         """Analisa a forma do exercício"""
         try:
             # Comparar com posições corretas
             form_scores = []
             current_phase = "preparation"
-            recommendations = []
+            recommendations = Counter()
 
-            for frame in processed_frames:
-                # Calcular similaridade com posições corretas
-                similarity_scores = await self._calculate_pose_similarity(
-                    frame['landmarks'],
-                    correct_positions
-                )
-                form_scores.append(max(similarity_scores))
+            # Com poses completas nos keyframes, um único produto matricial compara todos os frames
+            keyframe_matches = await self._match_keyframes(processed_frames, exercise_id, calibration)
+            poses = None
+            if keyframe_matches is None and processed_frames:
+                # Um único transform vetorizado leva todos os frames para unidades do corpo do usuário
+                calibration = calibration or BodyCalibration(torso=TYPICAL_TORSO)
+                poses = calibration.normalize(self._landmark_array(processed_frames))
 
-                # Determinar fase do movimento
-                current_phase = await self._determine_movement_phase(
-                    frame['landmarks'],
-                    correct_positions
-                )
+            for index, frame in enumerate(processed_frames):
+                # Calcular similaridade com posições corretas
+                if keyframe_matches is not None:
+                    form_scores.append(float(keyframe_matches.similarities[index]))
+                else:
+                    similarity_scores = await self._calculate_pose_similarity(
+                        poses[index],
+                        correct_positions,
+                        calibration
+                    )
+                    form_scores.append(max(similarity_scores))
 
                 # Gerar recomendações específicas
-                frame_recommendations = await self._generate_recommendations(
-                    frame['landmarks'],
-                    correct_positions
-                )
-                recommendations.extend(frame_recommendations)
+                recommendations.update(await self._generate_recommendations(frame['landmarks']))
+
+            # Fase do movimento no último frame
+            current_phase = await self._determine_movement_phase(
+                len(processed_frames) - 1,
+                segmentation,
+                keyframe_matches
+            )
 
             # Calcular métricas finais
-            average_accuracy = np.mean(form_scores)
+            average_accuracy = np.mean(form_scores) if form_scores else 0.0
             form_score = await self._calculate_form_score(form_scores)
 
             return {
                 'accuracy': float(average_accuracy),
                 'form_score': float(form_score),
                 'current_phase': current_phase,
-                'recommendations': list(set(recommendations))  # remove duplicatas
+                # Sem duplicatas, das mais frequentes para as menos frequentes
+                'recommendations': [message for message, _ in recommendations.most_common()],
+                'recommendation_frames': dict(recommendations)
             }
 
         except Exception as e:
@@ -145,41 +305,251 @@ class MovementAnalysisService:
                 detail=f"Failed to analyze form: {str(e)}"
             )
 
-    async def _calculate_pose_similarity(self, landmarks: list[dict], correct_positions: dict) -> list[float]:
-        """Calcula a similaridade entre a pose atual e as posições corretas"""
+    async def _generate_recommendations(self, landmarks: list[dict]) -> list[str]:
+        """Recomendações de FORM_CHECKS que valem para os landmarks de um frame"""
+        visible = {
+            name: landmarks[index] for name, index in LANDMARK_INDEX.items()
+            if landmarks[index]['visibility'] >= MIN_VISIBILITY
+        }
+        if not all(name in visible for name in TORSO_KEYPOINTS):
+            return [TORSO_NOT_VISIBLE]
+
+        shoulders = [(visible[name]['x'], visible[name]['y']) for name in ('left_shoulder', 'right_shoulder')]
+        hips = [(visible[name]['x'], visible[name]['y']) for name in ('left_hip', 'right_hip')]
+        torso = float(np.linalg.norm(np.mean(shoulders, axis=0) - np.mean(hips, axis=0)))
+        if torso <= 1e-6:
+            return [TORSO_NOT_VISIBLE]
+
+        # Inclinação de cada par em comprimentos de tronco, para não depender da distância da câmera
+        return [
+            message for message, (first, second) in FORM_CHECKS.items()
+            if first in visible and second in visible
+            and abs(visible[first]['y'] - visible[second]['y']) / torso > LEVEL_TOLERANCE
+        ]
+
+    async def _calculate_form_score(self, form_scores: list[float]) -> float:
+        """
+        Nota da forma em [0, 1]: a média das similaridades puxada para baixo pelos piores 10% dos
+        frames, para que poucos frames ruins não se diluam numa série longa
+        """
+        if not form_scores:
+            return 0.0
+        scores = np.sort(np.asarray(form_scores, dtype=np.float64))
+        worst = scores[:max(1, len(scores) // 10)].mean()
+        return float(0.8 * scores.mean() + 0.2 * worst)
+
+    async def _generate_feedback(
+        self,
+        processed_frames: list[dict],
+        form_analysis: dict,
+        exercise: dict
+    ) -> List[MovementFeedback]:
+        """
+        Feedback da sessão: uma mensagem por recomendação, com a fração de frames em que apareceu
+        como confiança, e os pontos-chave de alta importância do exercício quando a precisão é baixa
+        """
+        if not processed_frames:
+            return [MovementFeedback(
+                type=FeedbackType.STABILITY,
+                message=TORSO_NOT_VISIBLE,
+                confidence=1.0,
+                timestamp=0.0
+            )]
+
+        timestamp = processed_frames[-1]['timestamp']
+        frame_counts = form_analysis.get('recommendation_frames', {})
+        feedback = [
+            MovementFeedback(
+                type=FeedbackType.STABILITY if message == TORSO_NOT_VISIBLE else FeedbackType.FORM,
+                message=message,
+                confidence=frame_counts.get(message, 0) / len(processed_frames),
+                timestamp=timestamp,
+                keypoints=list(FORM_CHECKS.get(message, TORSO_KEYPOINTS))
+            )
+            for message in form_analysis['recommendations']
+        ]
+
+        if form_analysis['accuracy'] < LOW_ACCURACY:
+            feedback.extend(
+                MovementFeedback(
+                    type=FeedbackType.FORM,
+                    message=key_point['description'],
+                    confidence=1.0 - form_analysis['accuracy'],
+                    timestamp=timestamp
+                )
+                for key_point in exercise.get('keyPoints') or []
+                if key_point.get('importance') == 'high'
+            )
+        return feedback
+
+    @staticmethod
+    def _estimate_fps(processed_frames: list[dict]) -> float:
+        """Taxa de quadros a partir dos timestamps (30 fps quando não há intervalos válidos)"""
+        timestamps = np.array([frame['timestamp'] for frame in processed_frames])
+        steps = np.diff(timestamps)
+        steps = steps[steps > 0]
+        return 1 / float(np.median(steps)) if len(steps) else 30.0
+
+    @timed_stage('exercise_recognition')
+    async def _resolve_exercise(
+        self,
+        request: AnalysisRequest,
+        processed_frames: list[dict]
+    ) -> tuple[str, Optional[float]]:
+        """Exercício informado pelo cliente ou, sem ele, o reconhecido nas janelas de movimento"""
+        if request.exercise_id:
+            return request.exercise_id, None
+
+        recognizer = await self.exercise_service.get_exercise_recognizer()
+        fps = self._estimate_fps(processed_frames)
+        recognition = await asyncio.to_thread(
+            recognizer.recognize,
+            self._landmark_array(processed_frames),
+            window=max(2, int(settings.RECOGNITION_WINDOW_SECONDS * fps)),
+            stride=max(1, int(settings.RECOGNITION_STRIDE_SECONDS * fps))
+        ) if processed_frames else None
+        if recognition is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Could not recognize the exercise; send exercise_id"
+            )
+        return recognition.exercise_id, recognition.confidence
+
+    @staticmethod
+    def _landmark_array(processed_frames: list[dict]) -> np.ndarray:
+        """Landmarks dos frames como array (n, 33, 4): x, y, z, visibility"""
+        return np.array([
+            [[point['x'], point['y'], point['z'], point['visibility']] for point in frame['landmarks']]
+            for frame in processed_frames
+        ])
+
+    async def _match_keyframes(
+        self,
+        processed_frames: list[dict],
+        exercise_id: Optional[str],
+        calibration: Optional[BodyCalibration] = None
+    ) -> Optional[KeyframeMatches]:
+        """
+        Keyframe mais próximo de cada frame, com os membros dos keyframes nas proporções do usuário;
+        None quando o exercício não tem keyframes com pose completa
+        """
+        if not processed_frames or exercise_id is None:
+            return None
+        index = await self.exercise_service.get_keyframe_index()
+        if exercise_id not in index:
+            return None
+        return await asyncio.to_thread(index.nearest, self._landmark_array(processed_frames), exercise_id, calibration)
+
+    @timed_stage('rep_segmentation')
+    async def _segment_reps(
+        self,
+        processed_frames: list[dict],
+        correct_positions: dict,
+        calibration: Optional[BodyCalibration] = None
+    ) -> RepSegmentation:
+        """Alinha a trajetória do landmark principal com os keyFrames do exercício (DTW com banda)"""
+        key_frames = correct_positions.get('keyFrames') or []
+        if len(key_frames) < 2 or not processed_frames:
+            return RepSegmentation(frame_count=len(processed_frames))
+
+        signal = primary_trajectory(self._landmark_array(processed_frames), correct_positions.get('trackedLandmark'))
+
+        # Duração de uma repetição entre REP_MIN_SECONDS e REP_MAX_SECONDS, convertida em frames
+        fps = self._estimate_fps(processed_frames)
+
+        segmenter = RepSegmenter(
+            [[point['x'], point['y'], point['z']] for point in key_frames],
+            min_rep_frames=max(4, int(settings.REP_MIN_SECONDS * fps)),
+            max_rep_frames=max(8, int(settings.REP_MAX_SECONDS * fps)),
+            max_cost=settings.REP_MAX_ALIGNMENT_COST,
+            # REP_MIN_RANGE é medido em comprimentos de tronco do usuário
+            min_range=settings.REP_MIN_RANGE * (calibration.torso if calibration else TYPICAL_TORSO)
+        )
+        # DTW em NumPy: fora do event loop não bloqueia as demais requisições
+        return await asyncio.to_thread(segmenter.segment, signal)
+
+    async def _count_reps(self, segmentation: RepSegmentation) -> int:
+        """Número de repetições encontradas pela segmentação"""
+        return segmentation.count
+
+    async def _determine_movement_phase(
+        self,
+        frame_index: int,
+        segmentation: RepSegmentation,
+        keyframe_matches: Optional[KeyframeMatches] = None
+    ) -> str:
+        """
+        Fase do movimento no frame: antes/entre repetições, dentro de uma, ou após a última.
+        Antes de uma repetição completa ser reconhecida, usa a fase do keyframe mais próximo.
+        """
+        if frame_index < 0:
+            return 'preparation'
+        if segmentation.count == 0 and keyframe_matches is not None:
+            return keyframe_matches.phases[frame_index]
+        return segmentation.phase_at(frame_index)
+
+    async def _calculate_pose_similarity(
+        self,
+        pose: np.ndarray,
+        correct_positions: dict,
+        calibration: BodyCalibration
+    ) -> list[float]:
+        """
+        Calcula a similaridade entre a pose atual (em unidades do corpo) e as posições corretas,
+        ajustadas às proporções dos membros do usuário
+        """
         similarities = []
         
         for correct_position in [correct_positions['startPosition'], correct_positions['endPosition']]:
-            similarity = await self._calculate_landmarks_similarity(landmarks, correct_position)
+            reference = correct_position.get('landmarks')
+            if not reference or len(reference) != len(pose):
+                # Posições sem pose completa não têm com o que comparar
+                similarities.append(0.0)
+                continue
+            reference = calibration.retarget(
+                normalize_reference([[point['x'], point['y'], point['z']] for point in reference])
+            )
+            similarity = await self._calculate_landmarks_similarity(pose, reference)
             similarities.append(similarity)
             
         return similarities
 
-    async def _calculate_landmarks_similarity(self, landmarks1: list[dict], landmarks2: list[dict]) -> float:
-        """Calcula a similaridade entre dois conjuntos de landmarks"""
-        if len(landmarks1) != len(landmarks2):
+    async def _calculate_landmarks_similarity(self, pose: np.ndarray, reference: np.ndarray) -> float:
+        """
+        Calcula a similaridade entre uma pose (33, 4) e uma referência (33, 3), ambas centradas
+        nos quadris e em comprimentos de tronco, de modo que não dependam da distância da câmera
+        """
+        visible = pose[:, 3] > 0.5
+        if not visible.any():
             return 0.0
 
-        total_distance = 0
-        valid_points = 0
-
-        for l1, l2 in zip(landmarks1, landmarks2):
-            if l1['visibility'] > 0.5 and l2['visibility'] > 0.5:
-                distance = np.sqrt(
-                    (l1['x'] - l2['x'])**2 +
-                    (l1['y'] - l2['y'])**2 +
-                    (l1['z'] - l2['z'])**2
-                )
-                total_distance += distance
-                valid_points += 1
-
-        if valid_points == 0:
-            return 0.0
-
-        average_distance = total_distance / valid_points
+        average_distance = np.linalg.norm(pose[visible, :3] - reference[visible], axis=1).mean()
         similarity = 1 / (1 + average_distance)
         return float(similarity)
 
+    @timed_stage('body_calibration')
+    async def _body_calibration(
+        self,
+        user_id: Optional[str],
+        processed_frames: list[dict]
+    ) -> Optional[BodyCalibration]:
+        """
+        Proporções corporais do usuário: a calibração salva (válida enquanto o physical_info não muda)
+        ou uma nova, medida nos primeiros BODY_CALIBRATION_SECONDS desta sessão e salva para as próximas
+        """
+        if not user_id or not processed_frames:
+            return None
+        calibration = await self.user_profile_service.get_body_calibration(user_id)
+        if calibration is not None:
+            return calibration
+
+        frames = max(1, int(settings.BODY_CALIBRATION_SECONDS * self._estimate_fps(processed_frames)))
+        physical_info = await self.user_profile_service.get_physical_info(user_id)
+        calibration = await asyncio.to_thread(calibrate, self._landmark_array(processed_frames[:frames]), physical_info)
+        if calibration is not None:
+            await self.user_profile_service.save_body_calibration(user_id, calibration)
+        return calibration
+
     async def calculate_exercise_metrics(
         self,
         user_id: str,
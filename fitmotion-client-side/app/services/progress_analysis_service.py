@@ -2,10 +2,11 @@ from fastapi import HTTPException, status
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import numpy as np
+from app.services.firebase_service import FirebaseService
 
 class ProgressAnalysisService:
-    def __init__(self):
-        self.firebase = FirebaseService()
+    def __init__(self, firebase: Optional[FirebaseService] = None):
+        self.firebase = firebase or FirebaseService()
 
     async def get_performance_trends(
         self,
@@ -6,19 +6,27 @@ from app.schemas.user_profile import (
     UserPhysicalInfo
 )
 from app.services.firebase_service import FirebaseService
+from app.core.config.firebase import get_auth_client
+from app.core.config.settings import settings
+from app.core.cache import CoalescingCache
+from app.core.body_calibration import BodyCalibration, physical_info_key
 from datetime import datetime
 from typing import Optional
-import firebase_admin.auth as auth
 
 class UserProfileService:
-    def __init__(self):
-        self.firebase = FirebaseService()
+    def __init__(self, firebase: Optional[FirebaseService] = None):
+        self.firebase = firebase or FirebaseService()
         self.collection = 'user_profiles'
+        self.calibration_collection = 'body_calibrations'
+        self.calibration_cache = CoalescingCache(
+            'body_calibration',
+            ttl_seconds=settings.BODY_CALIBRATION_TTL_SECONDS
+        )
 
     async def get_profile(self, user_id: str) -> UserProfileResponse:
         try:
             # Buscar dados do Auth
-            auth_user = auth.get_user(user_id)
+            auth_user = get_auth_client().get_user(user_id)
             
             # Buscar perfil do Firestore
             profile = await self.firebase.get_document(self.collection, user_id)
@@ -55,7 +63,7 @@ class UserProfileService:
                 auth_update['photo_url'] = str(profile_data.photo_url)
             
             if auth_update:
-                auth.update_user(user_id, **auth_update)
+                get_auth_client().update_user(user_id, **auth_update)
 
             # Atualizar dados no Firestore
             update_data = profile_data.dict(exclude_unset=True)
@@ -66,6 +74,8 @@ class UserProfileService:
                 user_id,
                 update_data
             )
+            if 'physical_info' in update_data:
+                self.calibration_cache.discard(user_id)
 
             return await self.get_profile(user_id)
 
@@ -114,6 +124,7 @@ class UserProfileService:
                 user_id,
                 history_update
             )
+            self.calibration_cache.discard(user_id)
 
             return await self.get_profile(user_id)
 
@@ -123,6 +134,26 @@ class UserProfileService:
                 detail=f"Failed to update physical info: {str(e)}"
             )
 
+    async def get_physical_info(self, user_id: str) -> Optional[dict]:
+        profile = await self.firebase.get_document(self.collection, user_id)
+        return (profile or {}).get('physical_info')
+
+    async def get_body_calibration(self, user_id: str) -> Optional[BodyCalibration]:
+        """Calibração corporal salva, se ainda corresponder ao physical_info atual do perfil"""
+        return await self.calibration_cache.get_or_load(user_id, lambda: self._load_body_calibration(user_id))
+
+    async def _load_body_calibration(self, user_id: str) -> Optional[BodyCalibration]:
+        stored = await self.firebase.get_document(self.calibration_collection, user_id)
+        if not stored:
+            return None
+        if stored.get('physical_info_key') != physical_info_key(await self.get_physical_info(user_id)):
+            return None
+        return BodyCalibration.from_dict(stored)
+
+    async def save_body_calibration(self, user_id: str, calibration: BodyCalibration) -> None:
+        await self.firebase.set_document(self.calibration_collection, user_id, calibration.to_dict())
+        self.calibration_cache.set(user_id, calibration)
+
     async def _create_default_profile(self, auth_user) -> dict:
         """Cria um perfil padrão para novo usuário"""
         default_profile = {
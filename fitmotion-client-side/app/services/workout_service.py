@@ -2,14 +2,22 @@ from fastapi import HTTPException, status
 from app.schemas.workout import WorkoutCreate, WorkoutUpdate
 from app.services.firebase_service import FirebaseService
 from app.services.exercise_service import ExerciseService
+from app.core.cache import CoalescingCache, cache_key
+from app.core.config.settings import settings
 from typing import List, Optional
 from datetime import datetime
 
 class WorkoutService:
-    def __init__(self):
-        self.firebase = FirebaseService()
+    def __init__(
+        self,
+        firebase: Optional[FirebaseService] = None,
+        exercise_service: Optional[ExerciseService] = None
+    ):
+        self.firebase = firebase or FirebaseService()
         self.collection = 'workouts'
-        self.exercise_service = ExerciseService()
+        self.exercise_service = exercise_service or ExerciseService(firebase=self.firebase)
+        # Featured and body-area lists are the same for every user
+        self.read_cache = CoalescingCache('workouts', ttl_seconds=settings.READ_CACHE_TTL_SECONDS)
 
     async def create_workout(self, workout: WorkoutCreate, user_id: str) -> dict:
         try:
@@ -27,6 +35,7 @@ class WorkoutService:
             doc_ref = self.firebase.db.collection(self.collection).document()
             workout_dict['id'] = doc_ref.id
             await self.firebase.set_document(self.collection, doc_ref.id, workout_dict)
+            self.read_cache.invalidate()
             return workout_dict
 
         except HTTPException as e:
@@ -71,6 +80,7 @@ class WorkoutService:
             update_data['updatedAt'] = datetime.utcnow()
             
             await self.firebase.update_document(self.collection, workout_id, update_data)
+            self.read_cache.invalidate()
             return await self.get_workout(workout_id, user_id)
 
         except HTTPException as e:
@@ -92,6 +102,7 @@ class WorkoutService:
                 )
 
             await self.firebase.delete_document(self.collection, workout_id)
+            self.read_cache.invalidate()
             return {"message": "Workout deleted successfully"}
 
         except HTTPException as e:
@@ -163,6 +174,12 @@ class WorkoutService:
             )
 
     async def get_featured_workouts(self, limit: int = 5) -> List[dict]:
+        return await self.read_cache.get_or_load(
+            cache_key('featured', limit=limit),
+            lambda: self._query_featured_workouts(limit)
+        )
+
+    async def _query_featured_workouts(self, limit: int) -> List[dict]:
         try:
             filters = [
                 ('featured', '==', True),
@@ -201,6 +218,17 @@ class WorkoutService:
         body_area: str,
         difficulty: Optional[str] = None,
         limit: int = 10
+    ) -> List[dict]:
+        return await self.read_cache.get_or_load(
+            cache_key('body_area', body_area=body_area, difficulty=difficulty, limit=limit),
+            lambda: self._query_workouts_by_body_area(body_area, difficulty, limit)
+        )
+
+    async def _query_workouts_by_body_area(
+        self,
+        body_area: str,
+        difficulty: Optional[str],
+        limit: int
     ) -> List[dict]:
         try:
             filters = [
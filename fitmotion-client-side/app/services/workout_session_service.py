@@ -11,9 +11,13 @@ from datetime import datetime, timezone
 from typing import List, Optional
 
 class WorkoutSessionService:
-    def __init__(self):
-        self.firebase = FirebaseService()
-        self.workout_service = WorkoutService()
+    def __init__(
+        self,
+        firebase: Optional[FirebaseService] = None,
+        workout_service: Optional[WorkoutService] = None
+    ):
+        self.firebase = firebase or FirebaseService()
+        self.workout_service = workout_service or WorkoutService(firebase=self.firebase)
         self.collection = 'workout_sessions'
 
     async def create_session(
@@ -0,0 +1,236 @@
+"""Pose inference worker for the FitMotion API.
+
+Runs MediaPipe Pose in its own process pool, outside the uvicorn workers that serve
+auth and CRUD endpoints, and listens on a local Unix socket (app/core/inference_protocol.py).
+Requests that arrive while every pool process is busy are batched together; when the
+pending queue is full the worker answers "busy" right away and the API returns 503.
+
+Usage (from fitmotion-client-side):
+    python -m inference.worker --socket /tmp/fitmotion-inference.sock --processes 4
+and start the API with INFERENCE_SOCKET_PATH=/tmp/fitmotion-inference.sock
+"""
+import argparse
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from app.core.inference_protocol import read_message, write_message
+from app.core.pose_controller import PoseQualityController, create_pose_detector
+
+logger = logging.getLogger("fitmotion.inference")
+
+LANDMARK_COUNT = 33
+
+# One controller per pool process, created by _init_process
+_controller: Optional[PoseQualityController] = None
+
+
+def _init_process(
+    target_latency_ms: float,
+    start_complexity: int,
+    detector_factory: Callable[[int], object] = create_pose_detector
+) -> None:
+    global _controller
+    # Batches mix frames of unrelated sessions, so the detectors work in static image mode
+    _controller = PoseQualityController(
+        detector_factory,
+        target_latency_ms=target_latency_ms,
+        start_complexity=start_complexity
+    )
+    # Load the starting model before the first batch arrives
+    _controller.detector
+
+
+def _infer_batch(jobs: List[List[np.ndarray]]):
+    """
+    Run pose inference for every job of a batch, in order.
+    Returns one (detected frame indices, float32 landmarks of shape (detected, 33, 4)) per job,
+    plus the controller settings used.
+    """
+    results = []
+    for images in jobs:
+        detected = []
+        landmarks = []
+        for index, image in enumerate(images):
+            pose_landmarks = _controller.process(image).pose_landmarks
+            if pose_landmarks:
+                detected.append(index)
+                landmarks.append([
+                    (point.x, point.y, point.z, point.visibility)
+                    for point in pose_landmarks.landmark
+                ])
+        results.append((
+            detected,
+            np.asarray(landmarks, dtype=np.float32).reshape(len(detected), LANDMARK_COUNT, 4)
+        ))
+    return results, _controller.metrics()
+
+
+@dataclass
+class InferenceJob:
+    images: List[np.ndarray]
+    future: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
+class InferenceServer:
+    """Unix socket front end that batches jobs onto the process pool with a bounded queue"""
+
+    def __init__(
+        self,
+        socket_path: str,
+        processes: int = 2,
+        max_batch_frames: int = 64,
+        batch_window_ms: float = 5.0,
+        max_pending: int = 32,
+        target_latency_ms: float = 50.0,
+        model_complexity: int = 2,
+        detector_factory: Callable[[int], object] = create_pose_detector
+    ):
+        self.socket_path = socket_path
+        self.processes = processes
+        self.max_batch_frames = max_batch_frames
+        self.batch_window = batch_window_ms / 1000
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.pool = ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_init_process,
+            initargs=(target_latency_ms, model_complexity, detector_factory)
+        )
+        self._slots = asyncio.Semaphore(processes)
+        self.rejected = 0
+        self.batches = 0
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    header, arrays = await read_message(reader)
+                except asyncio.IncompleteReadError:
+                    break
+
+                if header.get("type") != "infer":
+                    await write_message(writer, {"status": "error", "error": f"unknown message {header.get('type')}"})
+                    continue
+
+                job = InferenceJob(images=arrays)
+                try:
+                    self.queue.put_nowait(job)
+                except asyncio.QueueFull:
+                    self.rejected += 1
+                    await write_message(writer, {"status": "busy"})
+                    continue
+
+                try:
+                    detected, landmarks, pose_metrics = await job.future
+                except Exception as e:
+                    await write_message(writer, {"status": "error", "error": str(e)})
+                    continue
+                await write_message(
+                    writer,
+                    {"status": "ok", "detected": detected, "pose_metrics": pose_metrics},
+                    [landmarks]
+                )
+        except (ConnectionError, ValueError) as e:
+            logger.warning("Dropping connection: %s", e)
+        finally:
+            writer.close()
+
+    async def _collect_batch(self) -> List[InferenceJob]:
+        """Wait for one job, then take whatever else arrives within the batch window"""
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        frames = len(batch[0].images)
+        deadline = loop.time() + self.batch_window
+        while frames < self.max_batch_frames:
+            if self.queue.empty():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    job = await asyncio.wait_for(self.queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                job = self.queue.get_nowait()
+            batch.append(job)
+            frames += len(job.images)
+        return batch
+
+    async def _run_batch(self, batch: List[InferenceJob]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            results, pose_metrics = await loop.run_in_executor(
+                self.pool, _infer_batch, [job.images for job in batch]
+            )
+            for job, (detected, landmarks) in zip(batch, results):
+                if not job.future.done():
+                    job.future.set_result((detected, landmarks, pose_metrics))
+        except Exception as e:
+            logger.exception("Inference batch failed")
+            for job in batch:
+                if not job.future.done():
+                    job.future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    async def dispatch(self) -> None:
+        """
+        Start a batch whenever a pool process is free. While all processes are busy jobs
+        accumulate in the queue, so batches grow with load.
+        """
+        while True:
+            await self._slots.acquire()
+            batch = await self._collect_batch()
+            self.batches += 1
+            asyncio.create_task(self._run_batch(batch))
+
+    async def serve(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self.handle_connection, path=self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        logger.info("Inference worker listening on %s with %d processes", self.socket_path, self.processes)
+        dispatcher = asyncio.create_task(self.dispatch())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            dispatcher.cancel()
+            self.pool.shutdown(cancel_futures=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="FitMotion pose inference worker")
+    parser.add_argument("--socket", default=os.environ.get("INFERENCE_SOCKET_PATH", "/tmp/fitmotion-inference.sock"))
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 2, help="pose inference processes")
+    parser.add_argument("--max-batch-frames", type=int, default=64, help="frames per batch sent to one process")
+    parser.add_argument("--batch-window-ms", type=float, default=5.0, help="time to wait for more jobs to batch")
+    parser.add_argument("--max-pending", type=int, default=32, help="queued jobs before answering busy")
+    parser.add_argument("--target-latency-ms", type=float, default=50.0, help="per-frame budget for the quality controller")
+    parser.add_argument("--model-complexity", type=int, default=2, help="starting MediaPipe model complexity")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    async def run():
+        server = InferenceServer(
+            args.socket,
+            processes=args.processes,
+            max_batch_frames=args.max_batch_frames,
+            batch_window_ms=args.batch_window_ms,
+            max_pending=args.max_pending,
+            target_latency_ms=args.target_latency_ms,
+            model_complexity=args.model_complexity
+        )
+        await server.serve()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
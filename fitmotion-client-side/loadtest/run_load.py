@@ -0,0 +1,249 @@
+"""Load generator for the FitMotion API.
+
+By default the app runs in-process on the in-memory Firestore/Auth backend
+(FIRESTORE_BACKEND=memory), seeded with a synthetic catalog, so no Google
+endpoints are called. Pass --base-url to drive a running server instead
+(it must also use FIRESTORE_BACKEND=memory to accept "test:<uid>" tokens).
+
+Usage (from fitmotion-client-side):
+    python -m loadtest.run_load --duration 30 --concurrency 32
+    python -m loadtest.run_load --latency-ms 8 --json results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+BODY_AREAS = ["upper_body", "lower_body", "core", "full_body"]
+DIFFICULTIES = ["beginner", "intermediate", "advanced"]
+MUSCLE_GROUPS = ["shoulders", "chest", "back", "legs", "arms", "core"]
+
+
+def configure_memory_backend(latency_ms: float) -> None:
+    """Select the in-memory backend before the app and its settings are imported"""
+    os.environ.setdefault("FIRESTORE_BACKEND", "memory")
+    os.environ.setdefault("MEMORY_BACKEND_LATENCY_MS", str(latency_ms))
+    os.environ.setdefault("FIREBASE_CREDENTIALS_PATH", "unused")
+    os.environ.setdefault("FIREBASE_API_KEY", "unused")
+    os.environ.setdefault("FIREBASE_AUTH_DOMAIN", "localhost")
+    os.environ.setdefault("FIREBASE_PROJECT_ID", "fitmotion-loadtest")
+
+
+def _position(seed: float) -> dict:
+    return {"x": 0.5 + seed * 0.1, "y": 0.5 - seed * 0.1, "z": 0.0}
+
+
+def seed_catalog(db, exercises: int = 50, workouts: int = 200, achievements: int = 20) -> dict:
+    """Populate the in-memory store with a synthetic catalog and return the generated ids"""
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    batch = db.batch()
+
+    exercise_ids = []
+    for index in range(exercises):
+        exercise_id = f"exercise-{index}"
+        exercise_ids.append(exercise_id)
+        batch.set(db.collection("exercises").document(exercise_id), {
+            "id": exercise_id,
+            "name": f"Exercise {index:03d}",
+            "description": "Synthetic exercise",
+            "difficulty": rng.choice(DIFFICULTIES),
+            "muscleGroups": rng.sample(MUSCLE_GROUPS, 2),
+            "keyPoints": [{"description": "Keep the core tight", "importance": "high"}],
+            "correctPositions": {
+                "startPosition": _position(0.0),
+                "endPosition": _position(1.0),
+                "keyFrames": [_position(step / 4) for step in range(5)]
+            },
+            "mediaUrls": []
+        })
+
+    workout_ids = []
+    for index in range(workouts):
+        workout_id = f"workout-{index}"
+        workout_ids.append(workout_id)
+        batch.set(db.collection("workouts").document(workout_id), {
+            "id": workout_id,
+            "name": f"Workout {index:03d}",
+            "description": "Synthetic workout",
+            "difficulty": rng.choice(DIFFICULTIES),
+            "bodyArea": rng.choice(BODY_AREAS),
+            "estimatedTime": rng.randint(10, 60),
+            "calories": rng.randint(100, 600),
+            "featured": index % 10 == 0,
+            "isPublic": index % 4 != 0,
+            "userId": f"user-{index % 20}",
+            "status": "active",
+            "exercises": [
+                {"exerciseId": exercise_id, "sets": 3, "reps": 10, "restTime": 60, "order": order}
+                for order, exercise_id in enumerate(rng.sample(exercise_ids, 4))
+            ],
+            "createdAt": now - timedelta(minutes=index),
+            "updatedAt": now - timedelta(minutes=index)
+        })
+
+    for index in range(achievements):
+        achievement_id = f"achievement-{index}"
+        batch.set(db.collection("achievements").document(achievement_id), {
+            "id": achievement_id,
+            "name": f"Achievement {index}",
+            "description": "Synthetic achievement",
+            "type": "workout_count",
+            "tier": "bronze",
+            "icon_url": "https://example.com/icon.png",
+            "points": 10,
+            "criteria": {"type": "workout_count", "value": index, "comparison": "gte"}
+        })
+
+    batch.commit()
+    return {"exercises": exercise_ids, "workouts": workout_ids}
+
+
+def _analysis_payload(exercise_id: str, frames: int = 30) -> dict:
+    keypoints = [
+        {"name": f"landmark_{index}", "point": {"x": 0.5, "y": 0.5, "confidence": 0.9}}
+        for index in range(33)
+    ]
+    return {
+        "exercise_id": exercise_id,
+        "user_id": "",
+        "frames": [{"keypoints": keypoints, "timestamp": index / 30} for index in range(frames)]
+    }
+
+
+def build_scenarios(catalog: dict) -> list:
+    """(name, weight, request factory) tuples describing the traffic mix"""
+    workouts = catalog["workouts"]
+    exercises = catalog["exercises"]
+    return [
+        ("GET /workouts", 25, lambda rng: ("GET", "/api/v1/workouts/", {
+            "params": {"body_area": rng.choice(BODY_AREAS), "limit": 10}})),
+        ("GET /workouts/featured", 20, lambda rng: ("GET", "/api/v1/workouts/featured", {})),
+        ("GET /workouts/body-area", 15, lambda rng: ("GET", f"/api/v1/workouts/body-area/{rng.choice(BODY_AREAS)}", {
+            "params": {"difficulty": rng.choice(DIFFICULTIES)}})),
+        ("GET /workouts/{id}", 10, lambda rng: ("GET", f"/api/v1/workouts/{rng.choice(workouts)}", {})),
+        ("GET /exercises", 10, lambda rng: ("GET", "/api/v1/exercises/", {
+            "params": {"muscle_group": rng.choice(MUSCLE_GROUPS)}})),
+        ("POST /workout-sessions", 8, lambda rng: ("POST", "/api/v1/workout-sessions/", {
+            "json": {"workout_id": rng.choice(workouts)}})),
+        ("POST /movement-analysis/analyze", 4, lambda rng: ("POST", "/api/v1/movement-analysis/analyze", {
+            "json": _analysis_payload(rng.choice(exercises))})),
+        ("GET /achievements/check", 5, lambda rng: ("GET", "/api/v1/achievements/check", {})),
+        ("GET /achievements/leaderboard", 3, lambda rng: ("GET", "/api/v1/achievements/leaderboard", {})),
+    ]
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def _worker(client, scenarios, deadline, users, results, seed):
+    rng = random.Random(seed)
+    names = [scenario[0] for scenario in scenarios]
+    weights = [scenario[1] for scenario in scenarios]
+    factories = {scenario[0]: scenario[2] for scenario in scenarios}
+
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        method, url, kwargs = factories[name](rng)
+        headers = {"Authorization": f"Bearer test:user-{rng.randrange(users)}"}
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, headers=headers, **kwargs)
+            status_code = response.status_code
+        except httpx.HTTPError:
+            status_code = 0
+        results[name].append((time.perf_counter() - start, status_code))
+
+
+async def run_load(client, scenarios, duration: float, concurrency: int, users: int) -> dict:
+    results = defaultdict(list)
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        _worker(client, scenarios, deadline, users, results, seed)
+        for seed in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+
+    report = {}
+    for name, samples in sorted(results.items()):
+        latencies = sorted(latency * 1000 for latency, _ in samples)
+        statuses = defaultdict(int)
+        for _, status_code in samples:
+            statuses[str(status_code)] += 1
+        report[name] = {
+            "requests": len(samples),
+            "throughput_rps": len(samples) / elapsed,
+            "p50_ms": percentile(latencies, 0.50),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "errors": sum(count for code, count in statuses.items() if not code.startswith("2")),
+            "status_codes": dict(statuses)
+        }
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(f"{'endpoint':<36}{'reqs':>8}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for name, row in report.items():
+        print(
+            f"{name:<36}{row['requests']:>8}{row['throughput_rps']:>9.1f}"
+            f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['errors']:>8}"
+        )
+
+
+async def main_async(args) -> dict:
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+        catalog = {
+            "workouts": [f"workout-{index}" for index in range(200)],
+            "exercises": [f"exercise-{index}" for index in range(50)]
+        }
+    else:
+        configure_memory_backend(args.latency_ms)
+        from app.core.config.firebase import get_firestore_client
+        from app.main import app
+
+        catalog = seed_catalog(get_firestore_client())
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://loadtest",
+            timeout=30
+        )
+        # ASGITransport does not send lifespan events; run startup/shutdown around the load
+        async with app.router.lifespan_context(app), client:
+            return await run_load(client, build_scenarios(catalog), args.duration, args.concurrency, args.users)
+
+    async with client:
+        return await run_load(client, build_scenarios(catalog), args.duration, args.concurrency, args.users)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="FitMotion API load generator")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds to run")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent virtual users")
+    parser.add_argument("--users", type=int, default=100, help="distinct user ids in tokens")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated Firestore round-trip latency")
+    parser.add_argument("--base-url", help="target a running server instead of the in-process app")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
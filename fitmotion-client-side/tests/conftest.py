@@ -0,0 +1,11 @@
+import os
+
+# Settings require the Firebase variables; unit tests run against the in-memory backend
+for name, value in {
+    'FIRESTORE_BACKEND': 'memory',
+    'FIREBASE_CREDENTIALS_PATH': 'unused',
+    'FIREBASE_API_KEY': 'unused',
+    'FIREBASE_AUTH_DOMAIN': 'localhost',
+    'FIREBASE_PROJECT_ID': 'fitmotion-test',
+}.items():
+    os.environ.setdefault(name, value)
@@ -1,10 +1,59 @@
+import json
+import httpx
 import pytest
 from fastapi.testclient import TestClient
+from app.core.config.firebase import get_auth_client
+from app.core.config.settings import settings
+from app import main
 from app.main import app
 
-client = TestClient(app)
+class _IdentityToolkit:
+    """Firebase Identity Toolkit REST stand-in backed by the in-memory auth client"""
 
-def test_register():
+    def __init__(self):
+        self.passwords = {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        action = request.url.path.rsplit(':', 1)[-1]
+        auth = get_auth_client()
+
+        if action == 'signUp':
+            user = auth.create_user(email=payload['email'])
+            self.passwords[payload['email']] = payload['password']
+            return self._tokens(user.uid, payload['email'])
+        if action == 'signInWithPassword':
+            if self.passwords.get(payload['email']) != payload['password']:
+                return httpx.Response(400, json={'error': {'message': 'INVALID_PASSWORD'}})
+            return self._tokens(auth.get_user_by_email(payload['email']).uid, payload['email'], registered=True)
+        if action == 'sendOobCode':
+            return httpx.Response(200, json={'email': payload['email']})
+        return httpx.Response(404, json={'error': {'message': 'UNKNOWN_ACTION'}})
+
+    @staticmethod
+    def _tokens(uid: str, email: str, **extra) -> httpx.Response:
+        return httpx.Response(200, json={
+            'idToken': f'test:{uid}',
+            'email': email,
+            'refreshToken': f'refresh-{uid}',
+            'expiresIn': '3600',
+            'localId': uid,
+            **extra
+        })
+
+@pytest.fixture(scope='module')
+def client():
+    # The lifespan builds app.state.services; the analysis models are not needed for auth and the
+    # process-wide logging setup (covered in test_tracing) is left alone
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(settings, 'POSE_PRELOAD_MODELS', False)
+        patch.setattr(main, 'configure_logging', lambda: None)
+        with TestClient(app) as test_client:
+            auth_service = app.state.services.auth_service
+            patch.setattr(auth_service, 'http_client', httpx.AsyncClient(transport=httpx.MockTransport(_IdentityToolkit())))
+            yield test_client
+
+def test_register(client):
     response = client.post(
         "/api/v1/auth/register",
         json={
@@ -14,9 +63,10 @@ def test_register():
         }
     )
     assert response.status_code == 200
-    assert "access_token" in response.json()
+    assert "idToken" in response.json()
+    assert get_auth_client().get_user(response.json()["localId"]).display_name == "Test User"
 
-def test_login():
+def test_login(client):
     response = client.post(
         "/api/v1/auth/login",
         json={
@@ -25,13 +75,13 @@ def test_login():
         }
     )
     assert response.status_code == 200
-    assert "access_token" in response.json()
+    assert "idToken" in response.json()
 
-def test_reset_password():
+def test_reset_password(client):
     response = client.post(
         "/api/v1/auth/reset-password",
         json={
             "email": "test@example.com"
         }
     )
-    assert response.status_code == 200
\ No newline at end of file
+    assert response.status_code == 200
@@ -0,0 +1,36 @@
+import asyncio
+import httpx
+from app.services import auth_service
+from app.services.auth_service import AuthService
+
+def test_reset_password_without_injected_client_opens_its_own(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={'email': 'test@example.com'})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        auth_service.httpx, 'AsyncClient',
+        lambda: real_client(transport=httpx.MockTransport(handler))
+    )
+    service = AuthService(firebase=object())
+
+    result = asyncio.run(service.reset_password('test@example.com'))
+
+    assert result == {"message": "Password reset email sent successfully"}
+    assert len(requests) == 1
+    assert requests[0].url.path == '/v1/accounts:sendOobCode'
+
+def test_injected_client_is_reused_and_left_open():
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+    service = AuthService(firebase=object(), http_client=client)
+
+    async def run():
+        await service.reset_password('a@example.com')
+        await service.reset_password('b@example.com')
+        assert not client.is_closed
+        await client.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,47 @@
+import numpy as np
+from app.core.body_calibration import calibrate, normalize_reference, physical_info_key
+
+RNG = np.random.default_rng(5)
+POSE = RNG.uniform(0.3, 0.7, (33, 3))
+
+def _frames(scale, shift, count=30):
+    points = POSE * scale + shift + RNG.normal(0, 0.001 * scale, (count, 33, 3))
+    visibility = np.ones((count, 33, 1))
+    return np.concatenate([points, visibility], axis=2)
+
+def test_normalized_landmarks_do_not_depend_on_camera_distance():
+    near, far = _frames(1.5, 0.1), _frames(0.6, -0.05)
+    near_calibration = calibrate(near, {'height': 180})
+    far_calibration = calibrate(far, {'height': 180})
+
+    assert np.isclose(near_calibration.torso / far_calibration.torso, 2.5, rtol=0.02)
+    for name, length in near_calibration.segments.items():
+        assert np.isclose(length, far_calibration.segments[name], rtol=0.05)
+    assert np.allclose(near_calibration.normalize(near)[0, :, :3], far_calibration.normalize(far)[0, :, :3], atol=0.1)
+    assert np.allclose(near_calibration.normalize(near[:1])[0, :, :3], normalize_reference(POSE), atol=0.1)
+
+def test_calibration_requires_visible_torso_and_tracks_physical_info():
+    hidden = _frames(1.0, 0.0)
+    hidden[:, 23, 3] = 0.1
+    assert calibrate(hidden) is None
+
+    calibration = calibrate(_frames(1.0, 0.0), {'height': 180, 'weight': 80})
+    assert calibration.physical_info_key == physical_info_key({'weight': 80, 'height': 180})
+    assert calibration.physical_info_key != physical_info_key({'height': 180, 'weight': 75})
+
+def test_retarget_resizes_reference_limbs_to_the_user():
+    # User with 30% longer forearms than the reference model
+    user = POSE.copy()
+    for elbow, wrist, hand in ((13, 15, [15, 17, 19, 21]), (14, 16, [16, 18, 20, 22])):
+        user[hand] += (POSE[wrist] - POSE[elbow]) * 0.3
+    frames = np.concatenate([np.repeat(user[None], 30, axis=0), np.ones((30, 33, 1))], axis=2)
+    calibration = calibrate(frames)
+
+    pose = calibration.normalize(frames[:1])[0, :, :3]
+    reference = normalize_reference(POSE)
+    retargeted = calibration.retarget(reference)
+
+    assert np.allclose(retargeted, pose, atol=1e-4)
+    assert not np.allclose(reference, pose, atol=1e-2)
+    # Batched references give the same result
+    assert np.allclose(calibration.retarget(np.stack([reference, reference]))[1], retargeted)
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from app.core.cache import CoalescingCache, cache_key
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_cache_key_ignores_order_and_none():
+    assert cache_key('list', a=1, b=None, c='x') == cache_key('list', c='x', a=1)
+
+def test_concurrent_misses_share_one_load():
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ['workout']
+
+    async def run():
+        cache = CoalescingCache('test', ttl_seconds=5)
+        results = await asyncio.gather(*[cache.get_or_load('featured', loader) for _ in range(20)])
+        assert all(result == ['workout'] for result in results)
+        await cache.get_or_load('featured', loader)
+
+    asyncio.run(run())
+    assert calls == 1
+
+def test_entries_expire_and_failures_are_not_cached():
+    clock = FakeClock()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError('firestore unavailable')
+        return calls
+
+    async def run():
+        cache = CoalescingCache('test', ttl_seconds=5, clock=clock)
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load('key', loader)
+        assert await cache.get_or_load('key', loader) == 2
+        assert await cache.get_or_load('key', loader) == 2
+        clock.now = 6
+        assert await cache.get_or_load('key', loader) == 3
+        cache.invalidate()
+        assert await cache.get_or_load('key', loader) == 4
+
+    asyncio.run(run())
+
+def test_set_and_discard_replace_one_key():
+    async def slow_loader():
+        await asyncio.sleep(0.01)
+        return 'stale'
+
+    async def run():
+        cache = CoalescingCache('test', ttl_seconds=5)
+        pending = asyncio.ensure_future(cache.get_or_load('user', slow_loader))
+        await asyncio.sleep(0)
+        # A write during the load wins over the load's result
+        cache.set('user', 'fresh')
+        assert await pending == 'stale'
+        assert await cache.get_or_load('user', slow_loader) == 'fresh'
+        cache.discard('user')
+        assert await cache.get_or_load('user', slow_loader) == 'stale'
+
+    asyncio.run(run())
@@ -0,0 +1,66 @@
+import numpy as np
+from app.core.exercise_recognition import ExerciseRecognizer
+
+def _skeleton(elbow=0.0, knee=0.0, scale=1.0, shift=0.0):
+    """2D pose: elbow in [0, 1] curls both arms, knee in [0, 1] bends both legs"""
+    points = np.zeros((33, 3))
+    for side, x in ((0, 0.45), (1, 0.55)):
+        shoulder, elbow_point, wrist, hip, knee_point, ankle = (
+            np.array([11, 13, 15, 23, 25, 27]) + side
+        )
+        points[shoulder] = (x, 0.3, 0)
+        points[elbow_point] = (x, 0.45, 0)
+        curl = np.pi * (1 - 0.8 * elbow)
+        points[wrist] = points[elbow_point] + 0.15 * np.array([np.sin(curl) * 0.3, np.cos(np.pi - curl), 0])
+        points[hip] = (x, 0.55, 0)
+        bend = 0.6 * knee
+        points[knee_point] = points[hip] + 0.2 * np.array([np.sin(bend), np.cos(bend), 0])
+        points[ankle] = points[knee_point] + 0.2 * np.array([-np.sin(bend), np.cos(bend), 0])
+    return points * scale + shift
+
+def _position(pose):
+    return {'x': 0, 'y': 0, 'z': 0, 'landmarks': [{'x': x, 'y': y, 'z': z} for x, y, z in pose]}
+
+def _exercise(exercise_id, poses):
+    return {'id': exercise_id, 'correctPositions': {
+        'startPosition': _position(poses[0]),
+        'endPosition': _position(poses[-1]),
+        'keyFrames': [_position(pose) for pose in poses[1:-1]]
+    }}
+
+CYCLE = np.sin(np.linspace(0, np.pi, 5)) ** 2
+CATALOG = [
+    _exercise('curl', [_skeleton(elbow=value) for value in CYCLE]),
+    _exercise('squat', [_skeleton(knee=value) for value in CYCLE]),
+]
+
+def _stream(movement, frames=240, period=60, **placement):
+    phases = np.sin(np.pi * np.arange(frames) / period) ** 2
+    return np.stack([_skeleton(**{movement: value}, **placement) for value in phases])
+
+def test_recognizes_exercise_regardless_of_camera_distance():
+    recognizer = ExerciseRecognizer(CATALOG)
+    curl = recognizer.recognize(_stream('elbow', scale=1.4, shift=0.1), window=60, stride=15)
+    squat = recognizer.recognize(_stream('knee', scale=0.7), window=60, stride=15)
+    assert curl.exercise_id == 'curl' and curl.confidence > 0.8
+    assert squat.exercise_id == 'squat' and squat.confidence > 0.8
+
+def test_rejects_movement_far_from_every_exercise():
+    recognizer = ExerciseRecognizer(CATALOG, max_distance=0.05)
+    poses = np.random.default_rng(0).uniform(0, 1, (120, 33, 3))
+    assert recognizer.recognize(poses, window=60, stride=15) is None
+    assert ExerciseRecognizer([]).recognize(poses) is None
+
+def test_low_visibility_joints_are_ignored():
+    recognizer = ExerciseRecognizer(CATALOG)
+    poses = _stream('elbow')
+    # Legs out of frame: MediaPipe still places them, anywhere, with low visibility
+    legs = [25, 26, 27, 28]
+    poses[:, legs] = np.random.default_rng(1).uniform(0, 1, (len(poses), len(legs), 3))
+    visibility = np.ones((len(poses), 33, 1))
+    visibility[:, legs] = 0.1
+
+    curl = recognizer.recognize(np.concatenate([poses, visibility], axis=2), window=60, stride=15)
+
+    assert curl.exercise_id == 'curl' and curl.confidence > 0.8
+    assert recognizer.recognize(np.concatenate([poses, np.zeros_like(visibility)], axis=2)) is None
@@ -0,0 +1,31 @@
+from typing import List
+from pydantic import BaseModel, TypeAdapter
+from starlette.requests import Request
+from app.core.http_cache import conditional_response, etag_matches
+
+class Item(BaseModel):
+    id: str
+
+adapter = TypeAdapter(List[Item])
+
+def _request(if_none_match=None):
+    headers = [(b'if-none-match', if_none_match.encode())] if if_none_match else []
+    return Request({'type': 'http', 'method': 'GET', 'path': '/', 'headers': headers})
+
+def test_etag_matches_weak_tags_and_lists():
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('W/"x", W/"abc"', 'W/"abc"')
+    assert etag_matches('*', 'W/"abc"')
+    assert not etag_matches('W/"x"', 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
+
+def test_conditional_response_returns_304_for_current_etag():
+    items = [{'id': 'a', 'extra': 'dropped by the response model'}]
+    first = conditional_response(_request(), items, adapter)
+    assert first.status_code == 200
+    assert first.body == b'[{"id":"a"}]'
+
+    second = conditional_response(_request(first.headers['etag']), items, adapter)
+    assert second.status_code == 304
+    assert second.body == b''
+    assert second.headers['etag'] == first.headers['etag']
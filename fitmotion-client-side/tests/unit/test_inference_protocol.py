@@ -0,0 +1,36 @@
+import asyncio
+import numpy as np
+import pytest
+from app.core.inference_protocol import read_message, write_message
+
+class _BufferWriter:
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer.extend(data)
+
+    async def drain(self):
+        pass
+
+def _roundtrip(header, arrays):
+    async def run():
+        writer = _BufferWriter()
+        await write_message(writer, header, arrays)
+        reader = asyncio.StreamReader()
+        reader.feed_data(bytes(writer.buffer))
+        reader.feed_eof()
+        return await read_message(reader)
+    return asyncio.run(run())
+
+def test_roundtrip_keeps_header_and_arrays():
+    image = np.arange(2 * 3 * 3, dtype=np.uint8).reshape(2, 3, 3)
+    landmarks = np.zeros((0, 33, 4), dtype=np.float32)
+    header, arrays = _roundtrip({'type': 'infer'}, [image, landmarks])
+    assert header == {'type': 'infer'}
+    assert np.array_equal(arrays[0], image)
+    assert arrays[1].shape == (0, 33, 4) and arrays[1].dtype == np.float32
+
+def test_rejects_unsupported_dtype():
+    with pytest.raises(ValueError):
+        _roundtrip({'type': 'infer'}, [np.zeros(3, dtype=np.float64)])
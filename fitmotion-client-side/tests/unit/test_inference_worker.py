@@ -0,0 +1,80 @@
+import asyncio
+import os
+import tempfile
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from app.core.inference_client import InferenceClient
+from app.core.inference_protocol import read_message, write_message
+from inference.worker import InferenceServer
+
+class _FakePose:
+    """Detects a pose in every non-black image, with x/y set to the mean brightness"""
+
+    def process(self, image):
+        level = float(image.mean()) / 255
+        if level == 0:
+            return SimpleNamespace(pose_landmarks=None)
+        points = [SimpleNamespace(x=level, y=level, z=0.0, visibility=1.0) for _ in range(33)]
+        return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=points))
+
+def _fake_detector_factory(model_complexity):
+    return _FakePose()
+
+def _image(value):
+    return np.full((8, 8, 3), value, dtype=np.uint8)
+
+def _socket_path():
+    # Unix socket paths are limited to ~100 bytes, so no pytest tmp_path here
+    return os.path.join(tempfile.mkdtemp(prefix='fm-'), 'inference.sock')
+
+def test_worker_answers_every_session_with_its_own_frames():
+    async def run():
+        server = InferenceServer(_socket_path(), processes=1, detector_factory=_fake_detector_factory)
+        serving = asyncio.create_task(server.serve())
+        while not os.path.exists(server.socket_path):
+            await asyncio.sleep(0.01)
+        client = InferenceClient(server.socket_path, timeout=10)
+        try:
+            sessions = [[_image(51), _image(0), _image(102)], [_image(204)], [_image(0)]]
+            return await asyncio.gather(*[client.infer(images) for images in sessions]), client, server
+        finally:
+            serving.cancel()
+
+    results, client, server = asyncio.run(run())
+
+    (first_detected, first), (second_detected, second), (third_detected, third) = results
+    assert first_detected == [0, 2]
+    assert np.allclose(first[:, 0, 0], [0.2, 0.4])
+    assert second_detected == [0] and np.allclose(second[0, :, :2], 0.8)
+    assert third_detected == [] and third.shape == (0, 33, 4)
+    assert client.last_pose_metrics['model_complexity'] == 2
+    assert server.batches >= 1
+
+async def _serve_once(path, header, arrays=()):
+    async def handle(reader, writer):
+        await read_message(reader)
+        await write_message(writer, header, arrays)
+        writer.close()
+    return await asyncio.start_unix_server(handle, path=path)
+
+@pytest.mark.parametrize('header, status_code', [
+    ({'status': 'busy'}, 503),
+    ({'status': 'error', 'error': 'boom'}, 500),
+])
+def test_client_maps_worker_failures_to_http_errors(header, status_code):
+    async def run():
+        path = _socket_path()
+        server = await _serve_once(path, header)
+        async with server:
+            await InferenceClient(path, timeout=5).infer([_image(10)])
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(run())
+    assert error.value.status_code == status_code
+
+def test_client_reports_missing_worker_as_unavailable():
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(InferenceClient(_socket_path(), timeout=1).infer([_image(10)]))
+    assert error.value.status_code == 503
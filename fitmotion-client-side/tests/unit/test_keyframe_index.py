@@ -0,0 +1,75 @@
+import numpy as np
+from app.core.keyframe_index import KeyframeIndex
+
+RNG = np.random.default_rng(3)
+BASE = RNG.normal(0.5, 0.15, (33, 3))
+
+def _position(points):
+    return {'x': 0.0, 'y': 0.0, 'z': 0.0, 'landmarks': [{'x': x, 'y': y, 'z': z} for x, y, z in points]}
+
+def _exercise(exercise_id, poses):
+    return {
+        'id': exercise_id,
+        'correctPositions': {
+            'startPosition': _position(poses[0]),
+            'endPosition': _position(poses[-1]),
+            'keyFrames': [_position(pose) for pose in poses[1:-1]]
+        }
+    }
+
+POSES = {name: [BASE + RNG.normal(0, 0.08, (33, 3)) for _ in range(4)] for name in ('squat', 'press')}
+CATALOG = [
+    _exercise('squat', POSES['squat']),
+    _exercise('press', POSES['press']),
+    # Point-only keyframes are not indexed
+    {'id': 'legacy', 'correctPositions': {
+        'startPosition': {'x': 0, 'y': 0, 'z': 0},
+        'endPosition': {'x': 1, 'y': 1, 'z': 0},
+        'keyFrames': [{'x': 0.5, 'y': 0.5, 'z': 0}]
+    }}
+]
+
+def test_nearest_keyframe_is_invariant_to_position_and_scale():
+    index = KeyframeIndex(CATALOG)
+    assert len(index) == 8 and 'legacy' not in index
+
+    # Same pose, closer to the camera and shifted in the image
+    frame = POSES['press'][2] * 1.6 + np.array([0.2, -0.1, 0.0])
+    matches = index.nearest(frame[None])
+    assert matches.exercise_ids == ['press']
+    assert matches.keyframes.tolist() == [2]
+    assert matches.phases == ['execution']
+    assert np.isclose(matches.similarities[0], 1.0, atol=1e-5)
+
+def test_search_restricted_to_one_exercise():
+    index = KeyframeIndex(CATALOG)
+    frames = np.stack([POSES['squat'][0], POSES['squat'][3], POSES['press'][1]])
+    matches = index.nearest(frames, exercise_id='squat')
+    assert set(matches.exercise_ids) == {'squat'}
+    assert matches.keyframes[:2].tolist() == [0, 3]
+    assert matches.phases[:2] == ['preparation', 'completion']
+    assert matches.similarities[2] < 1.0
+
+def test_similarity_separates_correct_from_incorrect_poses():
+    index = KeyframeIndex(CATALOG)
+    correct = POSES['press'][2] + RNG.normal(0, 0.01, (33, 3))
+    # Same body, arms raised well above the keyframe position
+    incorrect = POSES['press'][2].copy()
+    incorrect[13:23, 1] -= 0.4
+
+    scores = index.nearest(np.stack([correct, incorrect]), exercise_id='press').similarities
+    assert scores[0] > 0.9
+    assert scores[1] < 0.7
+
+def test_hidden_landmarks_do_not_count():
+    index = KeyframeIndex(CATALOG)
+    frame = np.concatenate([POSES['squat'][1], np.ones((33, 1))], axis=1)
+    frame[25:, :3] = 0.0  # legs out of frame: coordinates are garbage, visibility 0
+    frame[25:, 3] = 0.0
+
+    matches = index.nearest(frame[None], exercise_id='squat')
+    assert matches.keyframes.tolist() == [1]
+    assert np.isclose(matches.similarities[0], 1.0, atol=1e-5)
+
+    frame[:, 3] = 0.0
+    assert index.similarities(frame[None], 'squat').max() == 0.0
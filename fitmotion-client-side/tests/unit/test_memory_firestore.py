@@ -0,0 +1,51 @@
+import pytest
+from app.core.memory_firestore import InMemoryFirestore, InMemoryAuth
+
+@pytest.fixture
+def db():
+    client = InMemoryFirestore()
+    workouts = client.collection('workouts')
+    for index in range(6):
+        workouts.document(f"w{index}").set({
+            'isPublic': index % 2 == 0,
+            'bodyArea': 'core' if index < 3 else 'legs',
+            'createdAt': index,
+            'tags': ['a'] if index == 0 else []
+        })
+    return client
+
+def test_query_filters_order_and_limit(db):
+    docs = list(
+        db.collection('workouts')
+        .where('isPublic', '==', True)
+        .order_by('createdAt', direction='DESCENDING')
+        .limit(2)
+        .stream()
+    )
+    assert [doc.id for doc in docs] == ['w4', 'w2']
+
+def test_start_after_and_array_contains(db):
+    query = db.collection('workouts').order_by('createdAt')
+    first = query.limit(2).get()
+    rest = query.start_after(first[-1]).get()
+    assert [doc.id for doc in rest] == ['w2', 'w3', 'w4', 'w5']
+    assert [doc.id for doc in db.collection('workouts').where('tags', 'array_contains', 'a').get()] == ['w0']
+
+def test_update_merge_and_batch(db):
+    ref = db.collection('workouts').document('w1')
+    ref.update({'stats.views': 3})
+    ref.set({'name': 'Core'}, merge=True)
+    batch = db.batch()
+    batch.delete(db.collection('workouts').document('w0'))
+    batch.commit()
+
+    assert ref.get().to_dict()['stats'] == {'views': 3}
+    assert ref.get().to_dict()['name'] == 'Core'
+    assert not db.collection('workouts').document('w0').get().exists
+
+def test_auth_tokens():
+    auth = InMemoryAuth()
+    assert auth.verify_id_token('test:user-1:admin') == {'uid': 'user-1', 'admin': True}
+    assert auth.get_user('user-1').email == 'user-1@example.com'
+    with pytest.raises(ValueError):
+        auth.verify_id_token('garbage')
@@ -0,0 +1,186 @@
+import asyncio
+import threading
+import numpy as np
+from app.core.exercise_recognition import Recognition
+from app.core.keyframe_index import KeyframeIndex
+from app.core.pose_landmarks import POSE_LANDMARK_NAMES
+from app.core.rep_segmentation import RepSegmenter
+from app.schemas.movement_analysis import AnalysisRequest
+from app.services import movement_analysis_service
+from app.services.movement_analysis_service import MovementAnalysisService
+
+FPS = 30
+# Standing person facing the camera, image-normalized (x, y)
+STAND = np.array(
+    [[0.50, 0.15]]
+    + [[0.50 + dx, 0.13] for dx in (-0.01, -0.02, -0.03, 0.01, 0.02, 0.03)]
+    + [[0.46, 0.14], [0.54, 0.14], [0.48, 0.18], [0.52, 0.18]]
+    + [[0.40, 0.30], [0.60, 0.30], [0.38, 0.42], [0.62, 0.42], [0.37, 0.54], [0.63, 0.54]]
+    + [[0.36, 0.57], [0.64, 0.57], [0.37, 0.57], [0.63, 0.57], [0.38, 0.56], [0.62, 0.56]]
+    + [[0.44, 0.58], [0.56, 0.58], [0.44, 0.75], [0.56, 0.75], [0.44, 0.92], [0.56, 0.92]]
+    + [[0.44, 0.94], [0.56, 0.94], [0.46, 0.95], [0.54, 0.95]]
+)
+# Squat bottom: torso and hips go down, knees forward, feet stay put
+SQUAT = STAND.copy()
+SQUAT[:25, 1] += 0.2
+SQUAT[25:27] += [0.0, 0.1]
+
+def _pose(progress):
+    return STAND + (SQUAT - STAND) * progress
+
+def _position(progress):
+    points = _pose(progress)
+    return {
+        'x': float(points[23, 0]), 'y': float(points[23, 1]), 'z': 0.0,
+        'landmarks': [{'x': float(x), 'y': float(y), 'z': 0.0} for x, y in points]
+    }
+
+EXERCISE = {
+    'id': 'squat',
+    'name': 'Agachamento',
+    'keyPoints': [{'description': 'Joelhos alinhados com os pés', 'importance': 'high'}],
+    'correctPositions': {
+        'startPosition': _position(0.0),
+        'keyFrames': [_position(0.5), _position(1.0), _position(0.5)],
+        'endPosition': _position(0.0),
+        'trackedLandmark': 23
+    }
+}
+
+class _ExerciseService:
+    firebase = None
+
+    async def get_exercise(self, exercise_id):
+        assert exercise_id == 'squat'
+        return EXERCISE
+
+    async def get_keyframe_index(self):
+        return KeyframeIndex([EXERCISE])
+
+class _UserProfileService:
+    def __init__(self):
+        self.saved = None
+
+    async def get_body_calibration(self, user_id):
+        return None
+
+    async def get_physical_info(self, user_id):
+        return {'height': 175}
+
+    async def save_body_calibration(self, user_id, calibration):
+        self.saved = calibration
+
+class _InferenceClient:
+    last_pose_metrics = {}
+
+    async def infer(self, images):
+        raise AssertionError('frames with keypoints must not be sent to the inference worker')
+
+def _frames(reps=3, rep_seconds=1.5, shoulder_tilt=0.0):
+    frames = []
+    rep_frames = int(rep_seconds * FPS)
+    for index in range(FPS // 2 + reps * rep_frames + FPS // 2):
+        position = index - FPS // 2
+        progress = (1 - np.cos(2 * np.pi * position / rep_frames)) / 2 if 0 <= position < reps * rep_frames else 0.0
+        points = _pose(progress)
+        points[12, 1] += shoulder_tilt
+        frames.append({
+            'keypoints': [
+                {'name': name, 'point': {'x': float(x), 'y': float(y), 'confidence': 0.95}}
+                for name, (x, y) in zip(POSE_LANDMARK_NAMES, points)
+            ],
+            'timestamp': index / FPS
+        })
+    return frames
+
+def _analyze(frames):
+    user_profiles = _UserProfileService()
+    service = MovementAnalysisService(
+        exercise_service=_ExerciseService(),
+        inference_client=_InferenceClient(),
+        user_profile_service=user_profiles
+    )
+    request = AnalysisRequest(exercise_id='squat', frames=frames, user_id='user-1')
+    return asyncio.run(service.analyze_movement(request)), user_profiles
+
+def test_analyze_movement_from_keypoints_counts_reps_without_form_feedback():
+    analysis, user_profiles = _analyze(_frames())
+
+    assert analysis.exercise_id == 'squat'
+    assert analysis.rep_count == 3
+    assert [rep.start < rep.end for rep in analysis.reps] == [True] * 3
+    assert analysis.accuracy > 0.9
+    assert 0.9 < analysis.form_score <= analysis.accuracy + 1e-9
+    assert analysis.recommendations == []
+    assert analysis.feedback == []
+    assert user_profiles.saved is not None
+
+def test_analyze_movement_reports_tilted_shoulders():
+    analysis, _ = _analyze(_frames(shoulder_tilt=0.08))
+
+    assert analysis.recommendations == ['Mantenha os ombros nivelados']
+    assert len(analysis.feedback) == 1
+    feedback = analysis.feedback[0]
+    assert feedback.type == 'form'
+    assert feedback.confidence == 1.0
+    assert feedback.keypoints == ['left_shoulder', 'right_shoulder']
+    assert feedback.timestamp > analysis.reps[-1].end
+
+def test_frames_without_a_known_keypoint_are_dropped():
+    frames = _frames(reps=0)
+    frames[0]['keypoints'] = [{'name': 'tail', 'point': {'x': 0.5, 'y': 0.5, 'confidence': 1.0}}]
+    service = MovementAnalysisService(
+        exercise_service=_ExerciseService(),
+        inference_client=_InferenceClient(),
+        user_profile_service=_UserProfileService()
+    )
+    request = AnalysisRequest(exercise_id='squat', frames=frames, user_id='user-1')
+
+    processed = asyncio.run(service._process_frames(request.frames))
+
+    assert len(processed) == len(frames) - 1
+    assert processed[0]['timestamp'] == frames[1]['timestamp']
+    assert processed[0]['landmarks'][11]['visibility'] == 0.95
+
+def test_numpy_stages_run_off_the_event_loop(monkeypatch):
+    threads = {}
+
+    def record(name, func):
+        def wrapper(*args, **kwargs):
+            threads[name] = threading.get_ident()
+            return func(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(RepSegmenter, 'segment', record('segment', RepSegmenter.segment))
+    monkeypatch.setattr(KeyframeIndex, 'nearest', record('nearest', KeyframeIndex.nearest))
+    monkeypatch.setattr(movement_analysis_service, 'calibrate', record('calibrate', movement_analysis_service.calibrate))
+
+    analysis, _ = _analyze(_frames())
+
+    assert analysis.rep_count == 3
+    assert threads['segment'] != threading.get_ident()
+    assert threads['nearest'] != threading.get_ident()
+    assert threads['calibrate'] != threading.get_ident()
+
+def test_exercise_recognition_runs_off_the_event_loop():
+    threads = []
+
+    class _Recognizer:
+        def recognize(self, poses, window, stride):
+            threads.append(threading.get_ident())
+            return Recognition('squat', 0.9, 0.1)
+
+    class _RecognizingExerciseService(_ExerciseService):
+        async def get_exercise_recognizer(self):
+            return _Recognizer()
+
+    service = MovementAnalysisService(
+        exercise_service=_RecognizingExerciseService(),
+        inference_client=_InferenceClient(),
+        user_profile_service=_UserProfileService()
+    )
+    request = AnalysisRequest(frames=_frames(reps=1), user_id='user-1')
+    processed = asyncio.run(service._process_frames(request.frames))
+
+    assert asyncio.run(service._resolve_exercise(request, processed)) == ('squat', 0.9)
+    assert threads and threads[0] != threading.get_ident()
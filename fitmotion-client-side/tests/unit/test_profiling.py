@@ -0,0 +1,50 @@
+import asyncio
+import os
+import time
+from app.core.metrics import register_stage_functions, timed_stage
+from app.core.profiling import AnalysisProfiler
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+@timed_stage('profiling_test')
+async def _stage_work():
+    _busy(0.1)
+
+def _offloaded_work():
+    _busy(0.1)
+
+register_stage_functions('profiling_offloaded', _offloaded_work)
+
+def test_window_closes_on_timer_and_writes_collapsed_stacks(tmp_path):
+    profiler = AnalysisProfiler(enabled=True, window_seconds=0.3, output_dir=str(tmp_path), sample_interval=0.001)
+
+    async def run():
+        with profiler.session():
+            await _stage_work()
+            await asyncio.to_thread(_offloaded_work)
+        assert profiler.active
+        # No further analyses arrive, the window must still close
+        await asyncio.sleep(0.5)
+
+    asyncio.run(run())
+
+    assert not profiler.active
+    assert os.path.exists(tmp_path / 'capture.prof')
+    assert '_stage_work' in (tmp_path / 'profiling_test.collapsed').read_text()
+    assert '_offloaded_work' in (tmp_path / 'profiling_offloaded.collapsed').read_text()
+
+    # Only one window per process
+    asyncio.run(_stage_work())
+    with profiler.session():
+        pass
+    assert not profiler.active
+
+def test_disabled_profiler_writes_nothing(tmp_path):
+    profiler = AnalysisProfiler(enabled=False, window_seconds=0.0, output_dir=str(tmp_path))
+    with profiler.session():
+        pass
+    assert not profiler.active
+    assert os.listdir(tmp_path) == []
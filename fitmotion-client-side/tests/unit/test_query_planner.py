@@ -0,0 +1,123 @@
+import asyncio
+from app.core.memory_firestore import InMemoryFirestore
+from app.core.query_planner import QueryPlanner, index_definitions
+
+def _run_query_factory(db, calls):
+    def run_query(collection, filters, order_by=None, limit=None, offset=0, start_after=None):
+        calls.append(list(filters))
+        query = db.collection(collection)
+        for condition in filters:
+            query = query.where(*condition)
+        if order_by:
+            query = query.order_by(order_by[0], direction=order_by[1])
+        if start_after is not None:
+            query = query.start_after(db.collection(collection).document(start_after).get())
+        documents = [{'id': doc.id, **doc.to_dict()} for doc in query.stream()][offset:]
+        return documents[:limit] if limit else documents
+    return run_query
+
+def _seed():
+    db = InMemoryFirestore()
+    for index in range(12):
+        db.collection('workouts').document(f'w{index}').set({
+            'isPublic': index % 2 == 0,
+            'userId': 'u1' if index % 3 == 0 else 'u2',
+            'bodyArea': 'core' if index % 4 == 0 else 'legs',
+            'difficulty': 'beginner' if index < 6 else 'advanced',
+            'createdAt': index
+        })
+    return db
+
+def test_declared_index_runs_directly():
+    planner = QueryPlanner()
+    [branch] = planner.plan('workouts', [('bodyArea', '==', 'core'), ('isPublic', '==', True)], ('createdAt', 'DESCENDING'))
+    assert branch.index is not None and not branch.memory_filters
+
+def test_uncovered_filters_fall_back_to_memory_and_match_direct_results():
+    db = _seed()
+    calls = []
+    planner = QueryPlanner()
+    filters = [('userId', '==', 'u1'), ('bodyArea', '==', 'legs'), ('difficulty', '==', 'advanced')]
+    order_by = ('createdAt', 'DESCENDING')
+
+    [branch] = planner.plan('workouts', filters, order_by)
+    assert branch.server_filters == [('userId', '==', 'u1')]
+
+    result = asyncio.run(planner.execute(_run_query_factory(db, calls), 'workouts', filters, order_by, limit=5))
+    expected = _run_query_factory(db, [])('workouts', filters, order_by, 5)
+    assert [doc['id'] for doc in result] == [doc['id'] for doc in expected] == ['w9', 'w6']
+
+def test_or_branches_are_merged_by_sort_key_without_duplicates():
+    db = _seed()
+    calls = []
+    planner = QueryPlanner()
+    filters = [('isPublic', '==', True), ('or', [('bodyArea', '==', 'core'), ('difficulty', '==', 'advanced')])]
+    result = asyncio.run(planner.execute(
+        _run_query_factory(db, calls), 'workouts', filters, ('createdAt', 'DESCENDING'), limit=4
+    ))
+    assert len(calls) == 2
+    assert [doc['id'] for doc in result] == ['w10', 'w8', 'w6', 'w4']
+
+def test_index_definitions_use_firestore_format():
+    definitions = index_definitions()
+    assert definitions['fieldOverrides'] == []
+    fields = definitions['indexes'][0]['fields']
+    assert fields[-1] == {'fieldPath': 'createdAt', 'order': 'DESCENDING'}
+
+def test_fallback_pages_through_the_whole_superset():
+    db = _seed()
+    calls = []
+    planner = QueryPlanner(scan_page_size=2)
+    # userId == 'u2' has 8 documents: the matching ones are beyond the first pages
+    filters = [('userId', '==', 'u2'), ('bodyArea', '==', 'legs'), ('difficulty', '==', 'beginner')]
+    order_by = ('createdAt', 'DESCENDING')
+
+    run_query = _run_query_factory(db, calls)
+    pages = []
+
+    def paged_query(collection, filters, order_by=None, limit=None, offset=0, start_after=None):
+        pages.append((offset, start_after))
+        return run_query(collection, filters, order_by, limit, offset, start_after)
+
+    result = asyncio.run(planner.execute(paged_query, 'workouts', filters, order_by))
+    expected = _run_query_factory(db, [])('workouts', filters, order_by)
+    assert [doc['id'] for doc in result] == [doc['id'] for doc in expected] == ['w5', 'w2', 'w1']
+    assert len(calls) == 5
+    # Pages continue from a cursor on the last document read, never from an offset
+    assert pages == [(0, None), (0, 'w10'), (0, 'w7'), (0, 'w4'), (0, 'w1')]
+
+def test_list_filter_values_are_cached_and_invalidated_per_collection():
+    db = _seed()
+    calls = []
+    planner = QueryPlanner()
+    run_query = _run_query_factory(db, calls)
+    filters = [('userId', 'in', ['u1', 'u2']), ('bodyArea', '==', 'core'), ('difficulty', '==', 'advanced')]
+    order_by = ('createdAt', 'DESCENDING')
+
+    async def run():
+        first = await planner.execute(run_query, 'workouts', filters, order_by)
+        await planner.execute(run_query, 'workouts', filters, order_by)
+        assert len(calls) == 1
+        planner.invalidate('exercises')
+        await planner.execute(run_query, 'workouts', filters, order_by)
+        assert len(calls) == 1
+        planner.invalidate('workouts')
+        await planner.execute(run_query, 'workouts', filters, order_by)
+        assert len(calls) == 2
+        return first
+
+    assert [doc['id'] for doc in asyncio.run(run())] == ['w8']
+
+def test_fallback_results_do_not_share_the_cached_documents():
+    db = _seed()
+    planner = QueryPlanner()
+    run_query = _run_query_factory(db, [])
+    filters = [('userId', '==', 'u1'), ('bodyArea', '==', 'legs'), ('difficulty', '==', 'advanced')]
+    order_by = ('createdAt', 'DESCENDING')
+
+    async def run():
+        first = await planner.execute(run_query, 'workouts', filters, order_by)
+        first[0]['exercises'] = ['enriquecido']
+        return await planner.execute(run_query, 'workouts', filters, order_by)
+
+    assert all('exercises' not in doc for doc in asyncio.run(run()))
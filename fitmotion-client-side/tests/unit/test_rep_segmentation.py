@@ -0,0 +1,56 @@
+import numpy as np
+from app.core.rep_segmentation import RepSegmenter, banded_dtw, keogh_envelope, lb_keogh
+
+TEMPLATE = [(0.5, 0.3 + 0.4 * np.sin(np.pi * step / 4) ** 2, 0.0) for step in range(5)]
+
+def _session(durations, rest=20, seed=0):
+    rng = np.random.default_rng(seed)
+    parts = [np.full(40, 0.3)]
+    for duration in durations:
+        parts.append(0.3 + 0.4 * np.sin(np.pi * np.linspace(0, 1, duration)) ** 2)
+        parts.append(np.full(rest, 0.3))
+    y = np.concatenate(parts) + rng.normal(0, 0.01, sum(len(part) for part in parts))
+    return np.stack([np.full(len(y), 0.5), y, np.zeros(len(y))], axis=1)
+
+def _naive_dtw(window, template, radius):
+    length = len(template)
+    cost = np.full((length + 1, length + 1), np.inf)
+    cost[0, 0] = 0
+    for i in range(1, length + 1):
+        for j in range(max(1, i - radius), min(length, i + radius) + 1):
+            local = ((window[i - 1] - template[j - 1]) ** 2).sum()
+            cost[i, j] = local + min(cost[i - 1, j], cost[i, j - 1], cost[i - 1, j - 1])
+    return cost[length, length] / length
+
+def test_banded_dtw_matches_reference_and_lower_bound():
+    rng = np.random.default_rng(1)
+    template = rng.normal(size=(16, 2))
+    windows = rng.normal(size=(6, 16, 2))
+    costs = banded_dtw(windows, template, radius=3)
+    upper, lower = keogh_envelope(template, 3)
+    bounds = lb_keogh(windows, upper, lower)
+    for window, cost, bound in zip(windows, costs, bounds):
+        assert np.isclose(cost, _naive_dtw(window, template, 3))
+        assert bound <= cost + 1e-9
+
+def test_counts_reps_of_different_speeds():
+    durations = [45, 90, 60, 120, 50]
+    result = RepSegmenter(TEMPLATE, min_rep_frames=24, max_rep_frames=180).segment(_session(durations))
+    assert result.count == len(durations)
+    assert all(rep.cost < 0.1 for rep in result.reps)
+
+    starts = np.cumsum([40] + [duration + 20 for duration in durations[:-1]])
+    for rep, start, duration in zip(result.reps, starts, durations):
+        assert abs(rep.start - start) <= duration // 8
+        assert abs(rep.end - (start + duration)) <= duration // 8
+
+def test_phases_and_still_signal():
+    segmenter = RepSegmenter(TEMPLATE, min_rep_frames=24, max_rep_frames=180)
+    result = segmenter.segment(_session([60, 60]))
+    first, second = result.reps
+    assert result.phase_at(0) == 'preparation'
+    assert result.phase_at(first.start + 5) == 'execution'
+    assert result.phase_at(second.end + 5) == 'completion'
+
+    still = _session([])
+    assert segmenter.segment(still).count == 0
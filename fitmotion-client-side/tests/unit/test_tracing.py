@@ -0,0 +1,52 @@
+import asyncio
+import logging
+import pytest
+from app.core.middleware.metrics import MetricsMiddleware
+from app.core.tracing import configure_logging, get_trace_id
+
+def _trace_id(request_id=None):
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen['inside'] = get_trace_id()
+        await send({'type': 'http.response.start', 'status': 204, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    headers = [(b'x-request-id', request_id)] if request_id is not None else []
+    scope = {'type': 'http', 'method': 'GET', 'path': '/health', 'headers': headers}
+    asyncio.run(MetricsMiddleware(app)(scope, receive, send))
+    returned = dict(messages[0]['headers'])[b'x-trace-id'].decode()
+    assert returned == seen['inside']
+    return returned
+
+def test_valid_request_id_is_kept():
+    assert _trace_id(b'req-42-ABC') == 'req-42-ABC'
+
+@pytest.mark.parametrize('request_id', [
+    b'',
+    b'a' * 65,
+    b'abc\r\nSet-Cookie: x=1',
+    b'id with spaces',
+    b'\xc3\xa9t\xc3\xa9',
+])
+def test_invalid_request_id_is_replaced(request_id):
+    trace_id = _trace_id(request_id)
+    assert trace_id != request_id.decode('latin-1')
+    assert len(trace_id) == 16 and trace_id.isalnum()
+
+def test_configure_logging_leaves_root_handlers_alone():
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    configure_logging()
+    configure_logging()
+
+    assert root.handlers == handlers
+    assert len(logging.getLogger('fitmotion').handlers) == 1